@@ -11,6 +11,8 @@ import (
 	"github.com/EgehanKilicarslan/constructor-rag-assistant/backend-go/internal/rag"
 	pb "github.com/EgehanKilicarslan/constructor-rag-assistant/backend-go/pb"
 	"github.com/gin-gonic/gin"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/status"
 )
 
 // Handler handles HTTP requests and forwards them to the RAG service
@@ -27,8 +29,11 @@ func NewHandler(ragClient *rag.Client, cfg *config.Config) *Handler {
 // ChatHandler: POST /api/chat
 func (h *Handler) ChatHandler(c *gin.Context) {
 	var reqBody struct {
-		Query     string `json:"query"`
-		SessionID string `json:"session_id"`
+		Query          string           `json:"query"`
+		SessionID      string           `json:"session_id"`
+		CollectionName string           `json:"collection_name"`
+		MaxResults     int32            `json:"max_results"`
+		Filter         *pb.SearchFilter `json:"filter"` // filenames, page_from/to, uploaded_after/before
 	}
 
 	if err := c.BindJSON(&reqBody); err != nil {
@@ -40,6 +45,11 @@ func (h *Handler) ChatHandler(c *gin.Context) {
 	grpcReq := &pb.ChatRequest{
 		Query:     reqBody.Query,
 		SessionId: reqBody.SessionID,
+		Config: &pb.QueryConfig{
+			CollectionName: reqBody.CollectionName,
+			MaxResults:     reqBody.MaxResults,
+			Filter:         reqBody.Filter,
+		},
 	}
 
 	ctx, cancel := context.WithTimeout(context.Background(), time.Duration(h.Config.ChatTimeout)*time.Second)
@@ -71,6 +81,7 @@ func (h *Handler) ChatHandler(c *gin.Context) {
 			"answer":  resp.Answer,
 			"sources": resp.SourceDocuments,
 			"time":    resp.ProcessingTimeMs,
+			"timings": resp.Timings,
 		})
 
 		return true // Continue streaming
@@ -112,8 +123,10 @@ func (h *Handler) UploadHandler(c *gin.Context) {
 	reqMeta := &pb.UploadRequest{
 		Data: &pb.UploadRequest_Metadata{
 			Metadata: &pb.UploadMetadata{
-				Filename:    header.Filename,
-				ContentType: header.Header.Get("Content-Type"),
+				Filename:       header.Filename,
+				ContentType:    header.Header.Get("Content-Type"),
+				CollectionName: c.PostForm("collection_name"),      // Optional, empty = server default
+				Background:     c.PostForm("background") == "true", // Respond with a job ID once sent
 			},
 		},
 	}
@@ -165,5 +178,48 @@ func (h *Handler) UploadHandler(c *gin.Context) {
 		"status":  resp.Status,
 		"message": resp.Message,
 		"chunks":  resp.ChunksCount,
+		"job_id":  resp.JobId, // Background uploads: follow it on /api/jobs/:id
+	})
+}
+
+// JobHandler: GET /api/jobs/:id streams a background upload's ingestion progress
+func (h *Handler) JobHandler(c *gin.Context) {
+	// No timeout: the stream ends with the job, or when the client disconnects
+	stream, err := h.ragClient.Service.WatchIngestionJob(
+		c.Request.Context(), &pb.IngestionJobRequest{JobId: c.Param("id")},
+	)
+	if err != nil {
+		c.JSON(500, gin.H{"error": "Failed to call RAG service"})
+		return
+	}
+
+	// The first message tells an unknown job apart from a running one
+	first, err := stream.Recv()
+	if err != nil {
+		switch status.Code(err) {
+		case codes.NotFound:
+			c.JSON(http.StatusNotFound, gin.H{"error": "Job not found"})
+		case codes.InvalidArgument:
+			c.JSON(http.StatusBadRequest, gin.H{"error": "Invalid job ID"})
+		default:
+			c.JSON(500, gin.H{"error": "Failed to get job status"})
+		}
+		return
+	}
+
+	c.Writer.Header().Set("Content-Type", "text/event-stream")
+	c.Writer.Header().Set("Cache-Control", "no-cache")
+	c.Writer.Header().Set("Connection", "keep-alive")
+
+	next := first
+	c.Stream(func(w io.Writer) bool {
+		if next == nil {
+			if next, err = stream.Recv(); err != nil {
+				return false // io.EOF once the job has finished
+			}
+		}
+		c.SSEvent("status", next)
+		next = nil
+		return true
 	})
 }
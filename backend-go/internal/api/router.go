@@ -14,6 +14,7 @@ func SetupRouter(h *Handler) *gin.Engine {
 	// Bind handler function
 	r.POST("/api/chat", h.ChatHandler)
 	r.POST("/api/upload", h.UploadHandler)
+	r.GET("/api/jobs/:id", h.JobHandler)
 
 	return r
 }
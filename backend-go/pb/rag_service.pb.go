@@ -86,8 +86,9 @@ func (x *ChatRequest) GetConfig() *QueryConfig {
 
 type QueryConfig struct {
 	state          protoimpl.MessageState `protogen:"open.v1"`
-	CollectionName string                 `protobuf:"bytes,1,opt,name=collection_name,json=collectionName,proto3" json:"collection_name,omitempty"` // Name of the document collection
-	MaxResults     int32                  `protobuf:"varint,2,opt,name=max_results,json=maxResults,proto3" json:"max_results,omitempty"`            // Maximum number of source documents to retrieve
+	CollectionName string                 `protobuf:"bytes,1,opt,name=collection_name,json=collectionName,proto3" json:"collection_name,omitempty"` // Name of the document collection (empty = server default)
+	MaxResults     int32                  `protobuf:"varint,2,opt,name=max_results,json=maxResults,proto3" json:"max_results,omitempty"`            // Maximum number of source documents to retrieve (0 = server default)
+	Filter         *SearchFilter          `protobuf:"bytes,3,opt,name=filter,proto3" json:"filter,omitempty"`                                       // Restrict retrieval to matching chunks (unset = whole collection)
 	unknownFields  protoimpl.UnknownFields
 	sizeCache      protoimpl.SizeCache
 }
@@ -136,21 +137,106 @@ func (x *QueryConfig) GetMaxResults() int32 {
 	return 0
 }
 
+func (x *QueryConfig) GetFilter() *SearchFilter {
+	if x != nil {
+		return x.Filter
+	}
+	return nil
+}
+
+// All set criteria must match; zero / empty fields are ignored
+type SearchFilter struct {
+	state          protoimpl.MessageState `protogen:"open.v1"`
+	Filenames      []string               `protobuf:"bytes,1,rep,name=filenames,proto3" json:"filenames,omitempty"`                                  // Any of these documents
+	PageFrom       int32                  `protobuf:"varint,2,opt,name=page_from,json=pageFrom,proto3" json:"page_from,omitempty"`                   // First page, inclusive
+	PageTo         int32                  `protobuf:"varint,3,opt,name=page_to,json=pageTo,proto3" json:"page_to,omitempty"`                         // Last page, inclusive
+	UploadedAfter  int64                  `protobuf:"varint,4,opt,name=uploaded_after,json=uploadedAfter,proto3" json:"uploaded_after,omitempty"`    // Unix seconds, inclusive
+	UploadedBefore int64                  `protobuf:"varint,5,opt,name=uploaded_before,json=uploadedBefore,proto3" json:"uploaded_before,omitempty"` // Unix seconds, exclusive
+	unknownFields  protoimpl.UnknownFields
+	sizeCache      protoimpl.SizeCache
+}
+
+func (x *SearchFilter) Reset() {
+	*x = SearchFilter{}
+	mi := &file_rag_service_proto_msgTypes[2]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *SearchFilter) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*SearchFilter) ProtoMessage() {}
+
+func (x *SearchFilter) ProtoReflect() protoreflect.Message {
+	mi := &file_rag_service_proto_msgTypes[2]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use SearchFilter.ProtoReflect.Descriptor instead.
+func (*SearchFilter) Descriptor() ([]byte, []int) {
+	return file_rag_service_proto_rawDescGZIP(), []int{2}
+}
+
+func (x *SearchFilter) GetFilenames() []string {
+	if x != nil {
+		return x.Filenames
+	}
+	return nil
+}
+
+func (x *SearchFilter) GetPageFrom() int32 {
+	if x != nil {
+		return x.PageFrom
+	}
+	return 0
+}
+
+func (x *SearchFilter) GetPageTo() int32 {
+	if x != nil {
+		return x.PageTo
+	}
+	return 0
+}
+
+func (x *SearchFilter) GetUploadedAfter() int64 {
+	if x != nil {
+		return x.UploadedAfter
+	}
+	return 0
+}
+
+func (x *SearchFilter) GetUploadedBefore() int64 {
+	if x != nil {
+		return x.UploadedBefore
+	}
+	return 0
+}
+
 // --------------------------------------------------------
 // Response Message Definitions
 // --------------------------------------------------------
 type ChatResponse struct {
 	state            protoimpl.MessageState `protogen:"open.v1"`
 	Answer           string                 `protobuf:"bytes,1,opt,name=answer,proto3" json:"answer,omitempty"`                                                 // Generated answer
-	SourceDocuments  []*Source              `protobuf:"bytes,2,rep,name=source_documents,json=sourceDocuments,proto3" json:"source_documents,omitempty"`        // Retrieved source documents
-	ProcessingTimeMs float64                `protobuf:"fixed64,3,opt,name=processing_time_ms,json=processingTimeMs,proto3" json:"processing_time_ms,omitempty"` // Processing time in milliseconds
+	SourceDocuments  []*Source              `protobuf:"bytes,2,rep,name=source_documents,json=sourceDocuments,proto3" json:"source_documents,omitempty"`        // Retrieved source documents (first message, right after retrieval)
+	ProcessingTimeMs float64                `protobuf:"fixed64,3,opt,name=processing_time_ms,json=processingTimeMs,proto3" json:"processing_time_ms,omitempty"` // Total processing time in milliseconds (final message)
+	Timings          *StageTimings          `protobuf:"bytes,4,opt,name=timings,proto3" json:"timings,omitempty"`                                               // Per-stage latency breakdown (final message)
 	unknownFields    protoimpl.UnknownFields
 	sizeCache        protoimpl.SizeCache
 }
 
 func (x *ChatResponse) Reset() {
 	*x = ChatResponse{}
-	mi := &file_rag_service_proto_msgTypes[2]
+	mi := &file_rag_service_proto_msgTypes[3]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -162,7 +248,7 @@ func (x *ChatResponse) String() string {
 func (*ChatResponse) ProtoMessage() {}
 
 func (x *ChatResponse) ProtoReflect() protoreflect.Message {
-	mi := &file_rag_service_proto_msgTypes[2]
+	mi := &file_rag_service_proto_msgTypes[3]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -175,7 +261,7 @@ func (x *ChatResponse) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use ChatResponse.ProtoReflect.Descriptor instead.
 func (*ChatResponse) Descriptor() ([]byte, []int) {
-	return file_rag_service_proto_rawDescGZIP(), []int{2}
+	return file_rag_service_proto_rawDescGZIP(), []int{3}
 }
 
 func (x *ChatResponse) GetAnswer() string {
@@ -199,6 +285,89 @@ func (x *ChatResponse) GetProcessingTimeMs() float64 {
 	return 0
 }
 
+func (x *ChatResponse) GetTimings() *StageTimings {
+	if x != nil {
+		return x.Timings
+	}
+	return nil
+}
+
+type StageTimings struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	EmbedMs       float64                `protobuf:"fixed64,1,opt,name=embed_ms,json=embedMs,proto3" json:"embed_ms,omitempty"`         // Query embedding (0 when cached)
+	SearchMs      float64                `protobuf:"fixed64,2,opt,name=search_ms,json=searchMs,proto3" json:"search_ms,omitempty"`      // Vector search
+	RerankMs      float64                `protobuf:"fixed64,3,opt,name=rerank_ms,json=rerankMs,proto3" json:"rerank_ms,omitempty"`      // Cross-encoder reranking (0 when disabled)
+	LlmTtftMs     float64                `protobuf:"fixed64,4,opt,name=llm_ttft_ms,json=llmTtftMs,proto3" json:"llm_ttft_ms,omitempty"` // LLM time to first token
+	TotalMs       float64                `protobuf:"fixed64,5,opt,name=total_ms,json=totalMs,proto3" json:"total_ms,omitempty"`         // End-to-end processing time
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *StageTimings) Reset() {
+	*x = StageTimings{}
+	mi := &file_rag_service_proto_msgTypes[4]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *StageTimings) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*StageTimings) ProtoMessage() {}
+
+func (x *StageTimings) ProtoReflect() protoreflect.Message {
+	mi := &file_rag_service_proto_msgTypes[4]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use StageTimings.ProtoReflect.Descriptor instead.
+func (*StageTimings) Descriptor() ([]byte, []int) {
+	return file_rag_service_proto_rawDescGZIP(), []int{4}
+}
+
+func (x *StageTimings) GetEmbedMs() float64 {
+	if x != nil {
+		return x.EmbedMs
+	}
+	return 0
+}
+
+func (x *StageTimings) GetSearchMs() float64 {
+	if x != nil {
+		return x.SearchMs
+	}
+	return 0
+}
+
+func (x *StageTimings) GetRerankMs() float64 {
+	if x != nil {
+		return x.RerankMs
+	}
+	return 0
+}
+
+func (x *StageTimings) GetLlmTtftMs() float64 {
+	if x != nil {
+		return x.LlmTtftMs
+	}
+	return 0
+}
+
+func (x *StageTimings) GetTotalMs() float64 {
+	if x != nil {
+		return x.TotalMs
+	}
+	return 0
+}
+
 type Source struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Filename      string                 `protobuf:"bytes,1,opt,name=filename,proto3" json:"filename,omitempty"`                        // Name of the source document
@@ -211,7 +380,7 @@ type Source struct {
 
 func (x *Source) Reset() {
 	*x = Source{}
-	mi := &file_rag_service_proto_msgTypes[3]
+	mi := &file_rag_service_proto_msgTypes[5]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -223,7 +392,7 @@ func (x *Source) String() string {
 func (*Source) ProtoMessage() {}
 
 func (x *Source) ProtoReflect() protoreflect.Message {
-	mi := &file_rag_service_proto_msgTypes[3]
+	mi := &file_rag_service_proto_msgTypes[5]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -236,7 +405,7 @@ func (x *Source) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use Source.ProtoReflect.Descriptor instead.
 func (*Source) Descriptor() ([]byte, []int) {
-	return file_rag_service_proto_rawDescGZIP(), []int{3}
+	return file_rag_service_proto_rawDescGZIP(), []int{5}
 }
 
 func (x *Source) GetFilename() string {
@@ -283,7 +452,7 @@ type UploadRequest struct {
 
 func (x *UploadRequest) Reset() {
 	*x = UploadRequest{}
-	mi := &file_rag_service_proto_msgTypes[4]
+	mi := &file_rag_service_proto_msgTypes[6]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -295,7 +464,7 @@ func (x *UploadRequest) String() string {
 func (*UploadRequest) ProtoMessage() {}
 
 func (x *UploadRequest) ProtoReflect() protoreflect.Message {
-	mi := &file_rag_service_proto_msgTypes[4]
+	mi := &file_rag_service_proto_msgTypes[6]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -308,7 +477,7 @@ func (x *UploadRequest) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use UploadRequest.ProtoReflect.Descriptor instead.
 func (*UploadRequest) Descriptor() ([]byte, []int) {
-	return file_rag_service_proto_rawDescGZIP(), []int{4}
+	return file_rag_service_proto_rawDescGZIP(), []int{6}
 }
 
 func (x *UploadRequest) GetData() isUploadRequest_Data {
@@ -353,16 +522,18 @@ func (*UploadRequest_Metadata) isUploadRequest_Data() {}
 func (*UploadRequest_Chunk) isUploadRequest_Data() {}
 
 type UploadMetadata struct {
-	state         protoimpl.MessageState `protogen:"open.v1"`
-	Filename      string                 `protobuf:"bytes,1,opt,name=filename,proto3" json:"filename,omitempty"`                          // Name of the file
-	ContentType   string                 `protobuf:"bytes,2,opt,name=content_type,json=contentType,proto3" json:"content_type,omitempty"` // MIME type of the file (e.g., application/pdf)
-	unknownFields protoimpl.UnknownFields
-	sizeCache     protoimpl.SizeCache
+	state          protoimpl.MessageState `protogen:"open.v1"`
+	Filename       string                 `protobuf:"bytes,1,opt,name=filename,proto3" json:"filename,omitempty"`                                   // Name of the file
+	ContentType    string                 `protobuf:"bytes,2,opt,name=content_type,json=contentType,proto3" json:"content_type,omitempty"`          // MIME type of the file (e.g., application/pdf)
+	CollectionName string                 `protobuf:"bytes,3,opt,name=collection_name,json=collectionName,proto3" json:"collection_name,omitempty"` // Target document collection (empty = server default)
+	Background     bool                   `protobuf:"varint,4,opt,name=background,proto3" json:"background,omitempty"`                              // Respond once the file is received, ingest it in a background job
+	unknownFields  protoimpl.UnknownFields
+	sizeCache      protoimpl.SizeCache
 }
 
 func (x *UploadMetadata) Reset() {
 	*x = UploadMetadata{}
-	mi := &file_rag_service_proto_msgTypes[5]
+	mi := &file_rag_service_proto_msgTypes[7]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -374,7 +545,7 @@ func (x *UploadMetadata) String() string {
 func (*UploadMetadata) ProtoMessage() {}
 
 func (x *UploadMetadata) ProtoReflect() protoreflect.Message {
-	mi := &file_rag_service_proto_msgTypes[5]
+	mi := &file_rag_service_proto_msgTypes[7]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -387,7 +558,7 @@ func (x *UploadMetadata) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use UploadMetadata.ProtoReflect.Descriptor instead.
 func (*UploadMetadata) Descriptor() ([]byte, []int) {
-	return file_rag_service_proto_rawDescGZIP(), []int{5}
+	return file_rag_service_proto_rawDescGZIP(), []int{7}
 }
 
 func (x *UploadMetadata) GetFilename() string {
@@ -404,18 +575,33 @@ func (x *UploadMetadata) GetContentType() string {
 	return ""
 }
 
+func (x *UploadMetadata) GetCollectionName() string {
+	if x != nil {
+		return x.CollectionName
+	}
+	return ""
+}
+
+func (x *UploadMetadata) GetBackground() bool {
+	if x != nil {
+		return x.Background
+	}
+	return false
+}
+
 type UploadResponse struct {
 	state         protoimpl.MessageState `protogen:"open.v1"`
 	Status        string                 `protobuf:"bytes,1,opt,name=status,proto3" json:"status,omitempty"`                               // Status message
 	ChunksCount   int32                  `protobuf:"varint,2,opt,name=chunks_count,json=chunksCount,proto3" json:"chunks_count,omitempty"` // Number of chunks created from the file
 	Message       string                 `protobuf:"bytes,3,opt,name=message,proto3" json:"message,omitempty"`                             // Additional information or error message
+	JobId         string                 `protobuf:"bytes,4,opt,name=job_id,json=jobId,proto3" json:"job_id,omitempty"`                    // Background job ingesting the file (status "queued")
 	unknownFields protoimpl.UnknownFields
 	sizeCache     protoimpl.SizeCache
 }
 
 func (x *UploadResponse) Reset() {
 	*x = UploadResponse{}
-	mi := &file_rag_service_proto_msgTypes[6]
+	mi := &file_rag_service_proto_msgTypes[8]
 	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 	ms.StoreMessageInfo(mi)
 }
@@ -427,7 +613,7 @@ func (x *UploadResponse) String() string {
 func (*UploadResponse) ProtoMessage() {}
 
 func (x *UploadResponse) ProtoReflect() protoreflect.Message {
-	mi := &file_rag_service_proto_msgTypes[6]
+	mi := &file_rag_service_proto_msgTypes[8]
 	if x != nil {
 		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
 		if ms.LoadMessageInfo() == nil {
@@ -440,7 +626,7 @@ func (x *UploadResponse) ProtoReflect() protoreflect.Message {
 
 // Deprecated: Use UploadResponse.ProtoReflect.Descriptor instead.
 func (*UploadResponse) Descriptor() ([]byte, []int) {
-	return file_rag_service_proto_rawDescGZIP(), []int{6}
+	return file_rag_service_proto_rawDescGZIP(), []int{8}
 }
 
 func (x *UploadResponse) GetStatus() string {
@@ -464,6 +650,368 @@ func (x *UploadResponse) GetMessage() string {
 	return ""
 }
 
+func (x *UploadResponse) GetJobId() string {
+	if x != nil {
+		return x.JobId
+	}
+	return ""
+}
+
+type BulkUploadResponse struct {
+	state           protoimpl.MessageState `protogen:"open.v1"`
+	Status          string                 `protobuf:"bytes,1,opt,name=status,proto3" json:"status,omitempty"`                                           // success, partial (some files failed) or error
+	FilesCount      int32                  `protobuf:"varint,2,opt,name=files_count,json=filesCount,proto3" json:"files_count,omitempty"`                // Files ingested
+	PagesCount      int32                  `protobuf:"varint,3,opt,name=pages_count,json=pagesCount,proto3" json:"pages_count,omitempty"`                // Pages that produced chunks
+	ChunksCount     int32                  `protobuf:"varint,4,opt,name=chunks_count,json=chunksCount,proto3" json:"chunks_count,omitempty"`             // Chunks created from all files
+	PointsUpserted  int32                  `protobuf:"varint,5,opt,name=points_upserted,json=pointsUpserted,proto3" json:"points_upserted,omitempty"`    // New or changed chunks stored
+	ChunksSkipped   int32                  `protobuf:"varint,6,opt,name=chunks_skipped,json=chunksSkipped,proto3" json:"chunks_skipped,omitempty"`       // Unchanged chunks already stored
+	PointsDeleted   int32                  `protobuf:"varint,7,opt,name=points_deleted,json=pointsDeleted,proto3" json:"points_deleted,omitempty"`       // Stale chunks of previous versions removed
+	PagesPerSecond  float64                `protobuf:"fixed64,8,opt,name=pages_per_second,json=pagesPerSecond,proto3" json:"pages_per_second,omitempty"` // From the first byte received to the last chunk stored
+	ChunksPerSecond float64                `protobuf:"fixed64,9,opt,name=chunks_per_second,json=chunksPerSecond,proto3" json:"chunks_per_second,omitempty"`
+	Errors          []*FileError           `protobuf:"bytes,10,rep,name=errors,proto3" json:"errors,omitempty"`   // Files that were rejected or could not be parsed
+	Message         string                 `protobuf:"bytes,11,opt,name=message,proto3" json:"message,omitempty"` // Summary or error message
+	unknownFields   protoimpl.UnknownFields
+	sizeCache       protoimpl.SizeCache
+}
+
+func (x *BulkUploadResponse) Reset() {
+	*x = BulkUploadResponse{}
+	mi := &file_rag_service_proto_msgTypes[9]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *BulkUploadResponse) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*BulkUploadResponse) ProtoMessage() {}
+
+func (x *BulkUploadResponse) ProtoReflect() protoreflect.Message {
+	mi := &file_rag_service_proto_msgTypes[9]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use BulkUploadResponse.ProtoReflect.Descriptor instead.
+func (*BulkUploadResponse) Descriptor() ([]byte, []int) {
+	return file_rag_service_proto_rawDescGZIP(), []int{9}
+}
+
+func (x *BulkUploadResponse) GetStatus() string {
+	if x != nil {
+		return x.Status
+	}
+	return ""
+}
+
+func (x *BulkUploadResponse) GetFilesCount() int32 {
+	if x != nil {
+		return x.FilesCount
+	}
+	return 0
+}
+
+func (x *BulkUploadResponse) GetPagesCount() int32 {
+	if x != nil {
+		return x.PagesCount
+	}
+	return 0
+}
+
+func (x *BulkUploadResponse) GetChunksCount() int32 {
+	if x != nil {
+		return x.ChunksCount
+	}
+	return 0
+}
+
+func (x *BulkUploadResponse) GetPointsUpserted() int32 {
+	if x != nil {
+		return x.PointsUpserted
+	}
+	return 0
+}
+
+func (x *BulkUploadResponse) GetChunksSkipped() int32 {
+	if x != nil {
+		return x.ChunksSkipped
+	}
+	return 0
+}
+
+func (x *BulkUploadResponse) GetPointsDeleted() int32 {
+	if x != nil {
+		return x.PointsDeleted
+	}
+	return 0
+}
+
+func (x *BulkUploadResponse) GetPagesPerSecond() float64 {
+	if x != nil {
+		return x.PagesPerSecond
+	}
+	return 0
+}
+
+func (x *BulkUploadResponse) GetChunksPerSecond() float64 {
+	if x != nil {
+		return x.ChunksPerSecond
+	}
+	return 0
+}
+
+func (x *BulkUploadResponse) GetErrors() []*FileError {
+	if x != nil {
+		return x.Errors
+	}
+	return nil
+}
+
+func (x *BulkUploadResponse) GetMessage() string {
+	if x != nil {
+		return x.Message
+	}
+	return ""
+}
+
+type FileError struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	Filename      string                 `protobuf:"bytes,1,opt,name=filename,proto3" json:"filename,omitempty"`
+	Message       string                 `protobuf:"bytes,2,opt,name=message,proto3" json:"message,omitempty"`
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *FileError) Reset() {
+	*x = FileError{}
+	mi := &file_rag_service_proto_msgTypes[10]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *FileError) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*FileError) ProtoMessage() {}
+
+func (x *FileError) ProtoReflect() protoreflect.Message {
+	mi := &file_rag_service_proto_msgTypes[10]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use FileError.ProtoReflect.Descriptor instead.
+func (*FileError) Descriptor() ([]byte, []int) {
+	return file_rag_service_proto_rawDescGZIP(), []int{10}
+}
+
+func (x *FileError) GetFilename() string {
+	if x != nil {
+		return x.Filename
+	}
+	return ""
+}
+
+func (x *FileError) GetMessage() string {
+	if x != nil {
+		return x.Message
+	}
+	return ""
+}
+
+// --------------------------------------------------------
+// Ingestion Job Message Definitions
+// --------------------------------------------------------
+type IngestionJobRequest struct {
+	state         protoimpl.MessageState `protogen:"open.v1"`
+	JobId         string                 `protobuf:"bytes,1,opt,name=job_id,json=jobId,proto3" json:"job_id,omitempty"` // ID returned by UploadDocument
+	unknownFields protoimpl.UnknownFields
+	sizeCache     protoimpl.SizeCache
+}
+
+func (x *IngestionJobRequest) Reset() {
+	*x = IngestionJobRequest{}
+	mi := &file_rag_service_proto_msgTypes[11]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *IngestionJobRequest) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*IngestionJobRequest) ProtoMessage() {}
+
+func (x *IngestionJobRequest) ProtoReflect() protoreflect.Message {
+	mi := &file_rag_service_proto_msgTypes[11]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use IngestionJobRequest.ProtoReflect.Descriptor instead.
+func (*IngestionJobRequest) Descriptor() ([]byte, []int) {
+	return file_rag_service_proto_rawDescGZIP(), []int{11}
+}
+
+func (x *IngestionJobRequest) GetJobId() string {
+	if x != nil {
+		return x.JobId
+	}
+	return ""
+}
+
+type IngestionJobStatus struct {
+	state          protoimpl.MessageState `protogen:"open.v1"`
+	JobId          string                 `protobuf:"bytes,1,opt,name=job_id,json=jobId,proto3" json:"job_id,omitempty"`
+	State          string                 `protobuf:"bytes,2,opt,name=state,proto3" json:"state,omitempty"` // queued, running, succeeded or failed
+	Filename       string                 `protobuf:"bytes,3,opt,name=filename,proto3" json:"filename,omitempty"`
+	CollectionName string                 `protobuf:"bytes,4,opt,name=collection_name,json=collectionName,proto3" json:"collection_name,omitempty"`
+	PagesParsed    int32                  `protobuf:"varint,5,opt,name=pages_parsed,json=pagesParsed,proto3" json:"pages_parsed,omitempty"`          // Pages that produced chunks
+	ChunksCount    int32                  `protobuf:"varint,6,opt,name=chunks_count,json=chunksCount,proto3" json:"chunks_count,omitempty"`          // Chunks produced by the parser
+	ChunksEmbedded int32                  `protobuf:"varint,7,opt,name=chunks_embedded,json=chunksEmbedded,proto3" json:"chunks_embedded,omitempty"` // New or changed chunks embedded
+	PointsUpserted int32                  `protobuf:"varint,8,opt,name=points_upserted,json=pointsUpserted,proto3" json:"points_upserted,omitempty"` // Chunks stored in the collection
+	ChunksSkipped  int32                  `protobuf:"varint,9,opt,name=chunks_skipped,json=chunksSkipped,proto3" json:"chunks_skipped,omitempty"`    // Unchanged chunks already stored (e.g. before a restart)
+	PointsDeleted  int32                  `protobuf:"varint,10,opt,name=points_deleted,json=pointsDeleted,proto3" json:"points_deleted,omitempty"`   // Stale chunks of a previous version removed
+	Attempts       int32                  `protobuf:"varint,11,opt,name=attempts,proto3" json:"attempts,omitempty"`                                  // Runs started, > 1 once a restart has resumed the job
+	Message        string                 `protobuf:"bytes,12,opt,name=message,proto3" json:"message,omitempty"`                                     // Result or error message (final status)
+	unknownFields  protoimpl.UnknownFields
+	sizeCache      protoimpl.SizeCache
+}
+
+func (x *IngestionJobStatus) Reset() {
+	*x = IngestionJobStatus{}
+	mi := &file_rag_service_proto_msgTypes[12]
+	ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+	ms.StoreMessageInfo(mi)
+}
+
+func (x *IngestionJobStatus) String() string {
+	return protoimpl.X.MessageStringOf(x)
+}
+
+func (*IngestionJobStatus) ProtoMessage() {}
+
+func (x *IngestionJobStatus) ProtoReflect() protoreflect.Message {
+	mi := &file_rag_service_proto_msgTypes[12]
+	if x != nil {
+		ms := protoimpl.X.MessageStateOf(protoimpl.Pointer(x))
+		if ms.LoadMessageInfo() == nil {
+			ms.StoreMessageInfo(mi)
+		}
+		return ms
+	}
+	return mi.MessageOf(x)
+}
+
+// Deprecated: Use IngestionJobStatus.ProtoReflect.Descriptor instead.
+func (*IngestionJobStatus) Descriptor() ([]byte, []int) {
+	return file_rag_service_proto_rawDescGZIP(), []int{12}
+}
+
+func (x *IngestionJobStatus) GetJobId() string {
+	if x != nil {
+		return x.JobId
+	}
+	return ""
+}
+
+func (x *IngestionJobStatus) GetState() string {
+	if x != nil {
+		return x.State
+	}
+	return ""
+}
+
+func (x *IngestionJobStatus) GetFilename() string {
+	if x != nil {
+		return x.Filename
+	}
+	return ""
+}
+
+func (x *IngestionJobStatus) GetCollectionName() string {
+	if x != nil {
+		return x.CollectionName
+	}
+	return ""
+}
+
+func (x *IngestionJobStatus) GetPagesParsed() int32 {
+	if x != nil {
+		return x.PagesParsed
+	}
+	return 0
+}
+
+func (x *IngestionJobStatus) GetChunksCount() int32 {
+	if x != nil {
+		return x.ChunksCount
+	}
+	return 0
+}
+
+func (x *IngestionJobStatus) GetChunksEmbedded() int32 {
+	if x != nil {
+		return x.ChunksEmbedded
+	}
+	return 0
+}
+
+func (x *IngestionJobStatus) GetPointsUpserted() int32 {
+	if x != nil {
+		return x.PointsUpserted
+	}
+	return 0
+}
+
+func (x *IngestionJobStatus) GetChunksSkipped() int32 {
+	if x != nil {
+		return x.ChunksSkipped
+	}
+	return 0
+}
+
+func (x *IngestionJobStatus) GetPointsDeleted() int32 {
+	if x != nil {
+		return x.PointsDeleted
+	}
+	return 0
+}
+
+func (x *IngestionJobStatus) GetAttempts() int32 {
+	if x != nil {
+		return x.Attempts
+	}
+	return 0
+}
+
+func (x *IngestionJobStatus) GetMessage() string {
+	if x != nil {
+		return x.Message
+	}
+	return ""
+}
+
 var File_rag_service_proto protoreflect.FileDescriptor
 
 const file_rag_service_proto_rawDesc = "" +
@@ -473,15 +1021,29 @@ const file_rag_service_proto_rawDesc = "" +
 	"\x05query\x18\x01 \x01(\tR\x05query\x12\x1d\n" +
 	"\n" +
 	"session_id\x18\x02 \x01(\tR\tsessionId\x12(\n" +
-	"\x06config\x18\x03 \x01(\v2\x10.rag.QueryConfigR\x06config\"W\n" +
+	"\x06config\x18\x03 \x01(\v2\x10.rag.QueryConfigR\x06config\"\x82\x01\n" +
 	"\vQueryConfig\x12'\n" +
 	"\x0fcollection_name\x18\x01 \x01(\tR\x0ecollectionName\x12\x1f\n" +
 	"\vmax_results\x18\x02 \x01(\x05R\n" +
-	"maxResults\"\x8c\x01\n" +
+	"maxResults\x12)\n" +
+	"\x06filter\x18\x03 \x01(\v2\x11.rag.SearchFilterR\x06filter\"\xb2\x01\n" +
+	"\fSearchFilter\x12\x1c\n" +
+	"\tfilenames\x18\x01 \x03(\tR\tfilenames\x12\x1b\n" +
+	"\tpage_from\x18\x02 \x01(\x05R\bpageFrom\x12\x17\n" +
+	"\apage_to\x18\x03 \x01(\x05R\x06pageTo\x12%\n" +
+	"\x0euploaded_after\x18\x04 \x01(\x03R\ruploadedAfter\x12'\n" +
+	"\x0fuploaded_before\x18\x05 \x01(\x03R\x0euploadedBefore\"\xb9\x01\n" +
 	"\fChatResponse\x12\x16\n" +
 	"\x06answer\x18\x01 \x01(\tR\x06answer\x126\n" +
 	"\x10source_documents\x18\x02 \x03(\v2\v.rag.SourceR\x0fsourceDocuments\x12,\n" +
-	"\x12processing_time_ms\x18\x03 \x01(\x01R\x10processingTimeMs\"u\n" +
+	"\x12processing_time_ms\x18\x03 \x01(\x01R\x10processingTimeMs\x12+\n" +
+	"\atimings\x18\x04 \x01(\v2\x11.rag.StageTimingsR\atimings\"\x9e\x01\n" +
+	"\fStageTimings\x12\x19\n" +
+	"\bembed_ms\x18\x01 \x01(\x01R\aembedMs\x12\x1b\n" +
+	"\tsearch_ms\x18\x02 \x01(\x01R\bsearchMs\x12\x1b\n" +
+	"\trerank_ms\x18\x03 \x01(\x01R\brerankMs\x12\x1e\n" +
+	"\vllm_ttft_ms\x18\x04 \x01(\x01R\tllmTtftMs\x12\x19\n" +
+	"\btotal_ms\x18\x05 \x01(\x01R\atotalMs\"u\n" +
 	"\x06Source\x12\x1a\n" +
 	"\bfilename\x18\x01 \x01(\tR\bfilename\x12\x1f\n" +
 	"\vpage_number\x18\x02 \x01(\x05R\n" +
@@ -491,18 +1053,59 @@ const file_rag_service_proto_rawDesc = "" +
 	"\rUploadRequest\x121\n" +
 	"\bmetadata\x18\x01 \x01(\v2\x13.rag.UploadMetadataH\x00R\bmetadata\x12\x16\n" +
 	"\x05chunk\x18\x02 \x01(\fH\x00R\x05chunkB\x06\n" +
-	"\x04data\"O\n" +
+	"\x04data\"\x98\x01\n" +
 	"\x0eUploadMetadata\x12\x1a\n" +
 	"\bfilename\x18\x01 \x01(\tR\bfilename\x12!\n" +
-	"\fcontent_type\x18\x02 \x01(\tR\vcontentType\"e\n" +
+	"\fcontent_type\x18\x02 \x01(\tR\vcontentType\x12'\n" +
+	"\x0fcollection_name\x18\x03 \x01(\tR\x0ecollectionName\x12\x1e\n" +
+	"\n" +
+	"background\x18\x04 \x01(\bR\n" +
+	"background\"|\n" +
 	"\x0eUploadResponse\x12\x16\n" +
 	"\x06status\x18\x01 \x01(\tR\x06status\x12!\n" +
 	"\fchunks_count\x18\x02 \x01(\x05R\vchunksCount\x12\x18\n" +
-	"\amessage\x18\x03 \x01(\tR\amessage2x\n" +
+	"\amessage\x18\x03 \x01(\tR\amessage\x12\x15\n" +
+	"\x06job_id\x18\x04 \x01(\tR\x05jobId\"\xa0\x03\n" +
+	"\x12BulkUploadResponse\x12\x16\n" +
+	"\x06status\x18\x01 \x01(\tR\x06status\x12\x1f\n" +
+	"\vfiles_count\x18\x02 \x01(\x05R\n" +
+	"filesCount\x12\x1f\n" +
+	"\vpages_count\x18\x03 \x01(\x05R\n" +
+	"pagesCount\x12!\n" +
+	"\fchunks_count\x18\x04 \x01(\x05R\vchunksCount\x12'\n" +
+	"\x0fpoints_upserted\x18\x05 \x01(\x05R\x0epointsUpserted\x12%\n" +
+	"\x0echunks_skipped\x18\x06 \x01(\x05R\rchunksSkipped\x12%\n" +
+	"\x0epoints_deleted\x18\a \x01(\x05R\rpointsDeleted\x12(\n" +
+	"\x10pages_per_second\x18\b \x01(\x01R\x0epagesPerSecond\x12*\n" +
+	"\x11chunks_per_second\x18\t \x01(\x01R\x0fchunksPerSecond\x12&\n" +
+	"\x06errors\x18\n" +
+	" \x03(\v2\x0e.rag.FileErrorR\x06errors\x12\x18\n" +
+	"\amessage\x18\v \x01(\tR\amessage\"A\n" +
+	"\tFileError\x12\x1a\n" +
+	"\bfilename\x18\x01 \x01(\tR\bfilename\x12\x18\n" +
+	"\amessage\x18\x02 \x01(\tR\amessage\",\n" +
+	"\x13IngestionJobRequest\x12\x15\n" +
+	"\x06job_id\x18\x01 \x01(\tR\x05jobId\"\xa2\x03\n" +
+	"\x12IngestionJobStatus\x12\x15\n" +
+	"\x06job_id\x18\x01 \x01(\tR\x05jobId\x12\x14\n" +
+	"\x05state\x18\x02 \x01(\tR\x05state\x12\x1a\n" +
+	"\bfilename\x18\x03 \x01(\tR\bfilename\x12'\n" +
+	"\x0fcollection_name\x18\x04 \x01(\tR\x0ecollectionName\x12!\n" +
+	"\fpages_parsed\x18\x05 \x01(\x05R\vpagesParsed\x12!\n" +
+	"\fchunks_count\x18\x06 \x01(\x05R\vchunksCount\x12'\n" +
+	"\x0fchunks_embedded\x18\a \x01(\x05R\x0echunksEmbedded\x12'\n" +
+	"\x0fpoints_upserted\x18\b \x01(\x05R\x0epointsUpserted\x12%\n" +
+	"\x0echunks_skipped\x18\t \x01(\x05R\rchunksSkipped\x12%\n" +
+	"\x0epoints_deleted\x18\n" +
+	" \x01(\x05R\rpointsDeleted\x12\x1a\n" +
+	"\battempts\x18\v \x01(\x05R\battempts\x12\x18\n" +
+	"\amessage\x18\f \x01(\tR\amessage2\x88\x02\n" +
 	"\n" +
 	"RagService\x12-\n" +
 	"\x04Chat\x12\x10.rag.ChatRequest\x1a\x11.rag.ChatResponse0\x01\x12;\n" +
-	"\x0eUploadDocument\x12\x12.rag.UploadRequest\x1a\x13.rag.UploadResponse(\x01B\x06Z\x04./pbb\x06proto3"
+	"\x0eUploadDocument\x12\x12.rag.UploadRequest\x1a\x13.rag.UploadResponse(\x01\x12H\n" +
+	"\x11WatchIngestionJob\x12\x18.rag.IngestionJobRequest\x1a\x17.rag.IngestionJobStatus0\x01\x12D\n" +
+	"\x13BulkUploadDocuments\x12\x12.rag.UploadRequest\x1a\x17.rag.BulkUploadResponse(\x01B\x06Z\x04./pbb\x06proto3"
 
 var (
 	file_rag_service_proto_rawDescOnce sync.Once
@@ -516,29 +1119,42 @@ func file_rag_service_proto_rawDescGZIP() []byte {
 	return file_rag_service_proto_rawDescData
 }
 
-var file_rag_service_proto_msgTypes = make([]protoimpl.MessageInfo, 7)
+var file_rag_service_proto_msgTypes = make([]protoimpl.MessageInfo, 13)
 var file_rag_service_proto_goTypes = []any{
-	(*ChatRequest)(nil),    // 0: rag.ChatRequest
-	(*QueryConfig)(nil),    // 1: rag.QueryConfig
-	(*ChatResponse)(nil),   // 2: rag.ChatResponse
-	(*Source)(nil),         // 3: rag.Source
-	(*UploadRequest)(nil),  // 4: rag.UploadRequest
-	(*UploadMetadata)(nil), // 5: rag.UploadMetadata
-	(*UploadResponse)(nil), // 6: rag.UploadResponse
+	(*ChatRequest)(nil),         // 0: rag.ChatRequest
+	(*QueryConfig)(nil),         // 1: rag.QueryConfig
+	(*SearchFilter)(nil),        // 2: rag.SearchFilter
+	(*ChatResponse)(nil),        // 3: rag.ChatResponse
+	(*StageTimings)(nil),        // 4: rag.StageTimings
+	(*Source)(nil),              // 5: rag.Source
+	(*UploadRequest)(nil),       // 6: rag.UploadRequest
+	(*UploadMetadata)(nil),      // 7: rag.UploadMetadata
+	(*UploadResponse)(nil),      // 8: rag.UploadResponse
+	(*BulkUploadResponse)(nil),  // 9: rag.BulkUploadResponse
+	(*FileError)(nil),           // 10: rag.FileError
+	(*IngestionJobRequest)(nil), // 11: rag.IngestionJobRequest
+	(*IngestionJobStatus)(nil),  // 12: rag.IngestionJobStatus
 }
 var file_rag_service_proto_depIdxs = []int32{
-	1, // 0: rag.ChatRequest.config:type_name -> rag.QueryConfig
-	3, // 1: rag.ChatResponse.source_documents:type_name -> rag.Source
-	5, // 2: rag.UploadRequest.metadata:type_name -> rag.UploadMetadata
-	0, // 3: rag.RagService.Chat:input_type -> rag.ChatRequest
-	4, // 4: rag.RagService.UploadDocument:input_type -> rag.UploadRequest
-	2, // 5: rag.RagService.Chat:output_type -> rag.ChatResponse
-	6, // 6: rag.RagService.UploadDocument:output_type -> rag.UploadResponse
-	5, // [5:7] is the sub-list for method output_type
-	3, // [3:5] is the sub-list for method input_type
-	3, // [3:3] is the sub-list for extension type_name
-	3, // [3:3] is the sub-list for extension extendee
-	0, // [0:3] is the sub-list for field type_name
+	1,  // 0: rag.ChatRequest.config:type_name -> rag.QueryConfig
+	2,  // 1: rag.QueryConfig.filter:type_name -> rag.SearchFilter
+	5,  // 2: rag.ChatResponse.source_documents:type_name -> rag.Source
+	4,  // 3: rag.ChatResponse.timings:type_name -> rag.StageTimings
+	7,  // 4: rag.UploadRequest.metadata:type_name -> rag.UploadMetadata
+	10, // 5: rag.BulkUploadResponse.errors:type_name -> rag.FileError
+	0,  // 6: rag.RagService.Chat:input_type -> rag.ChatRequest
+	6,  // 7: rag.RagService.UploadDocument:input_type -> rag.UploadRequest
+	11, // 8: rag.RagService.WatchIngestionJob:input_type -> rag.IngestionJobRequest
+	6,  // 9: rag.RagService.BulkUploadDocuments:input_type -> rag.UploadRequest
+	3,  // 10: rag.RagService.Chat:output_type -> rag.ChatResponse
+	8,  // 11: rag.RagService.UploadDocument:output_type -> rag.UploadResponse
+	12, // 12: rag.RagService.WatchIngestionJob:output_type -> rag.IngestionJobStatus
+	9,  // 13: rag.RagService.BulkUploadDocuments:output_type -> rag.BulkUploadResponse
+	10, // [10:14] is the sub-list for method output_type
+	6,  // [6:10] is the sub-list for method input_type
+	6,  // [6:6] is the sub-list for extension type_name
+	6,  // [6:6] is the sub-list for extension extendee
+	0,  // [0:6] is the sub-list for field type_name
 }
 
 func init() { file_rag_service_proto_init() }
@@ -546,7 +1162,7 @@ func file_rag_service_proto_init() {
 	if File_rag_service_proto != nil {
 		return
 	}
-	file_rag_service_proto_msgTypes[4].OneofWrappers = []any{
+	file_rag_service_proto_msgTypes[6].OneofWrappers = []any{
 		(*UploadRequest_Metadata)(nil),
 		(*UploadRequest_Chunk)(nil),
 	}
@@ -556,7 +1172,7 @@ func file_rag_service_proto_init() {
 			GoPackagePath: reflect.TypeOf(x{}).PkgPath(),
 			RawDescriptor: unsafe.Slice(unsafe.StringData(file_rag_service_proto_rawDesc), len(file_rag_service_proto_rawDesc)),
 			NumEnums:      0,
-			NumMessages:   7,
+			NumMessages:   13,
 			NumExtensions: 0,
 			NumServices:   1,
 		},
@@ -19,8 +19,10 @@ import (
 const _ = grpc.SupportPackageIsVersion9
 
 const (
-	RagService_Chat_FullMethodName           = "/rag.RagService/Chat"
-	RagService_UploadDocument_FullMethodName = "/rag.RagService/UploadDocument"
+	RagService_Chat_FullMethodName                = "/rag.RagService/Chat"
+	RagService_UploadDocument_FullMethodName      = "/rag.RagService/UploadDocument"
+	RagService_WatchIngestionJob_FullMethodName   = "/rag.RagService/WatchIngestionJob"
+	RagService_BulkUploadDocuments_FullMethodName = "/rag.RagService/BulkUploadDocuments"
 )
 
 // RagServiceClient is the client API for RagService service.
@@ -39,6 +41,13 @@ type RagServiceClient interface {
 	// / It takes an UploadRequest with file details and content,
 	// / and returns an UploadResponse indicating the status of the upload.
 	UploadDocument(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[UploadRequest, UploadResponse], error)
+	// / WatchIngestionJob streams the progress of a background upload's ingestion job.
+	// / It sends the job's current status, then every change until the job has finished.
+	WatchIngestionJob(ctx context.Context, in *IngestionJobRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[IngestionJobStatus], error)
+	// / BulkUploadDocuments ingests many files sent on one stream, each as an UploadMetadata
+	// / message followed by its chunks, into the first file's collection. Files are parsed
+	// / concurrently and their chunks share embedding batches.
+	BulkUploadDocuments(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[UploadRequest, BulkUploadResponse], error)
 }
 
 type ragServiceClient struct {
@@ -81,6 +90,38 @@ func (c *ragServiceClient) UploadDocument(ctx context.Context, opts ...grpc.Call
 // This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
 type RagService_UploadDocumentClient = grpc.ClientStreamingClient[UploadRequest, UploadResponse]
 
+func (c *ragServiceClient) WatchIngestionJob(ctx context.Context, in *IngestionJobRequest, opts ...grpc.CallOption) (grpc.ServerStreamingClient[IngestionJobStatus], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &RagService_ServiceDesc.Streams[2], RagService_WatchIngestionJob_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[IngestionJobRequest, IngestionJobStatus]{ClientStream: stream}
+	if err := x.ClientStream.SendMsg(in); err != nil {
+		return nil, err
+	}
+	if err := x.ClientStream.CloseSend(); err != nil {
+		return nil, err
+	}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type RagService_WatchIngestionJobClient = grpc.ServerStreamingClient[IngestionJobStatus]
+
+func (c *ragServiceClient) BulkUploadDocuments(ctx context.Context, opts ...grpc.CallOption) (grpc.ClientStreamingClient[UploadRequest, BulkUploadResponse], error) {
+	cOpts := append([]grpc.CallOption{grpc.StaticMethod()}, opts...)
+	stream, err := c.cc.NewStream(ctx, &RagService_ServiceDesc.Streams[3], RagService_BulkUploadDocuments_FullMethodName, cOpts...)
+	if err != nil {
+		return nil, err
+	}
+	x := &grpc.GenericClientStream[UploadRequest, BulkUploadResponse]{ClientStream: stream}
+	return x, nil
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type RagService_BulkUploadDocumentsClient = grpc.ClientStreamingClient[UploadRequest, BulkUploadResponse]
+
 // RagServiceServer is the server API for RagService service.
 // All implementations must embed UnimplementedRagServiceServer
 // for forward compatibility.
@@ -97,6 +138,13 @@ type RagServiceServer interface {
 	// / It takes an UploadRequest with file details and content,
 	// / and returns an UploadResponse indicating the status of the upload.
 	UploadDocument(grpc.ClientStreamingServer[UploadRequest, UploadResponse]) error
+	// / WatchIngestionJob streams the progress of a background upload's ingestion job.
+	// / It sends the job's current status, then every change until the job has finished.
+	WatchIngestionJob(*IngestionJobRequest, grpc.ServerStreamingServer[IngestionJobStatus]) error
+	// / BulkUploadDocuments ingests many files sent on one stream, each as an UploadMetadata
+	// / message followed by its chunks, into the first file's collection. Files are parsed
+	// / concurrently and their chunks share embedding batches.
+	BulkUploadDocuments(grpc.ClientStreamingServer[UploadRequest, BulkUploadResponse]) error
 	mustEmbedUnimplementedRagServiceServer()
 }
 
@@ -113,6 +161,12 @@ func (UnimplementedRagServiceServer) Chat(*ChatRequest, grpc.ServerStreamingServ
 func (UnimplementedRagServiceServer) UploadDocument(grpc.ClientStreamingServer[UploadRequest, UploadResponse]) error {
 	return status.Error(codes.Unimplemented, "method UploadDocument not implemented")
 }
+func (UnimplementedRagServiceServer) WatchIngestionJob(*IngestionJobRequest, grpc.ServerStreamingServer[IngestionJobStatus]) error {
+	return status.Error(codes.Unimplemented, "method WatchIngestionJob not implemented")
+}
+func (UnimplementedRagServiceServer) BulkUploadDocuments(grpc.ClientStreamingServer[UploadRequest, BulkUploadResponse]) error {
+	return status.Error(codes.Unimplemented, "method BulkUploadDocuments not implemented")
+}
 func (UnimplementedRagServiceServer) mustEmbedUnimplementedRagServiceServer() {}
 func (UnimplementedRagServiceServer) testEmbeddedByValue()                    {}
 
@@ -152,6 +206,24 @@ func _RagService_UploadDocument_Handler(srv interface{}, stream grpc.ServerStrea
 // This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
 type RagService_UploadDocumentServer = grpc.ClientStreamingServer[UploadRequest, UploadResponse]
 
+func _RagService_WatchIngestionJob_Handler(srv interface{}, stream grpc.ServerStream) error {
+	m := new(IngestionJobRequest)
+	if err := stream.RecvMsg(m); err != nil {
+		return err
+	}
+	return srv.(RagServiceServer).WatchIngestionJob(m, &grpc.GenericServerStream[IngestionJobRequest, IngestionJobStatus]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type RagService_WatchIngestionJobServer = grpc.ServerStreamingServer[IngestionJobStatus]
+
+func _RagService_BulkUploadDocuments_Handler(srv interface{}, stream grpc.ServerStream) error {
+	return srv.(RagServiceServer).BulkUploadDocuments(&grpc.GenericServerStream[UploadRequest, BulkUploadResponse]{ServerStream: stream})
+}
+
+// This type alias is provided for backwards compatibility with existing code that references the prior non-generic stream type by name.
+type RagService_BulkUploadDocumentsServer = grpc.ClientStreamingServer[UploadRequest, BulkUploadResponse]
+
 // RagService_ServiceDesc is the grpc.ServiceDesc for RagService service.
 // It's only intended for direct use with grpc.RegisterService,
 // and not to be introspected or modified (even as a copy)
@@ -170,6 +242,16 @@ var RagService_ServiceDesc = grpc.ServiceDesc{
 			Handler:       _RagService_UploadDocument_Handler,
 			ClientStreams: true,
 		},
+		{
+			StreamName:    "WatchIngestionJob",
+			Handler:       _RagService_WatchIngestionJob_Handler,
+			ServerStreams: true,
+		},
+		{
+			StreamName:    "BulkUploadDocuments",
+			Handler:       _RagService_BulkUploadDocuments_Handler,
+			ClientStreams: true,
+		},
 	},
 	Metadata: "rag_service.proto",
 }
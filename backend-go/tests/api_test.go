@@ -14,6 +14,8 @@ import (
 	"github.com/stretchr/testify/assert"
 	"github.com/stretchr/testify/mock"
 	"google.golang.org/grpc"
+	"google.golang.org/grpc/codes"
+	"google.golang.org/grpc/status"
 
 	"github.com/EgehanKilicarslan/constructor-rag-assistant/backend-go/internal/api"
 	"github.com/EgehanKilicarslan/constructor-rag-assistant/backend-go/internal/config"
@@ -38,6 +40,22 @@ func (m *MockRagServiceClient) UploadDocument(ctx context.Context, opts ...grpc.
 	return args.Get(0).(pb.RagService_UploadDocumentClient), args.Error(1)
 }
 
+func (m *MockRagServiceClient) WatchIngestionJob(ctx context.Context, in *pb.IngestionJobRequest, opts ...grpc.CallOption) (pb.RagService_WatchIngestionJobClient, error) {
+	args := m.Called(ctx, in)
+	if args.Get(0) == nil {
+		return nil, args.Error(1)
+	}
+	return args.Get(0).(pb.RagService_WatchIngestionJobClient), args.Error(1)
+}
+
+func (m *MockRagServiceClient) BulkUploadDocuments(ctx context.Context, opts ...grpc.CallOption) (pb.RagService_BulkUploadDocumentsClient, error) {
+	args := m.Called(ctx)
+	if args.Get(0) == nil {
+		return nil, args.Error(1)
+	}
+	return args.Get(0).(pb.RagService_BulkUploadDocumentsClient), args.Error(1)
+}
+
 type MockChatStream struct {
 	grpc.ClientStream
 	mock.Mock
@@ -51,6 +69,19 @@ func (m *MockChatStream) Recv() (*pb.ChatResponse, error) {
 	return nil, args.Error(1)
 }
 
+type MockJobStream struct {
+	grpc.ClientStream
+	mock.Mock
+}
+
+func (m *MockJobStream) Recv() (*pb.IngestionJobStatus, error) {
+	args := m.Called()
+	if resp := args.Get(0); resp != nil {
+		return resp.(*pb.IngestionJobStatus), args.Error(1)
+	}
+	return nil, args.Error(1)
+}
+
 type MockUploadStream struct {
 	grpc.ClientStream
 	mock.Mock
@@ -139,6 +170,64 @@ func TestChatHandler_Success(t *testing.T) {
 	assert.Contains(t, w.Body.String(), "Hello from Go Test")
 }
 
+func TestChatHandler_ForwardsQueryConfig(t *testing.T) {
+	// 1. ARRANGE
+	mockClient := new(MockRagServiceClient)
+	mockStream := new(MockChatStream)
+	mockStream.On("Recv").Return(nil, io.EOF).Once()
+
+	isTenantQuery := mock.MatchedBy(func(in *pb.ChatRequest) bool {
+		return in.GetConfig().GetCollectionName() == "tenant_a" && in.GetConfig().GetMaxResults() == 5
+	})
+	mockClient.On("Chat", mock.Anything, isTenantQuery).Return(mockStream, nil)
+
+	ragClient := &rag.Client{Service: mockClient}
+	router := setupRouter(ragClient)
+
+	jsonBody := []byte(`{"query": "Hi", "session_id": "1", "collection_name": "tenant_a", "max_results": 5}`)
+	req, _ := http.NewRequest("POST", "/api/chat", bytes.NewBuffer(jsonBody))
+	req.Header.Set("Content-Type", "application/json")
+
+	w := NewStreamRecorder()
+
+	// 2. ACT
+	router.ServeHTTP(w, req)
+
+	// 3. ASSERT
+	assert.Equal(t, 200, w.Code)
+	mockClient.AssertExpectations(t)
+}
+
+func TestChatHandler_ForwardsSearchFilter(t *testing.T) {
+	// 1. ARRANGE
+	mockClient := new(MockRagServiceClient)
+	mockStream := new(MockChatStream)
+	mockStream.On("Recv").Return(nil, io.EOF).Once()
+
+	isScopedQuery := mock.MatchedBy(func(in *pb.ChatRequest) bool {
+		filter := in.GetConfig().GetFilter()
+		return len(filter.GetFilenames()) == 1 && filter.GetFilenames()[0] == "handbook.pdf" &&
+			filter.GetPageFrom() == 3 && filter.GetUploadedAfter() == 1700000000
+	})
+	mockClient.On("Chat", mock.Anything, isScopedQuery).Return(mockStream, nil)
+
+	ragClient := &rag.Client{Service: mockClient}
+	router := setupRouter(ragClient)
+
+	jsonBody := []byte(`{"query": "Hi", "session_id": "1", "filter": {"filenames": ["handbook.pdf"], "page_from": 3, "uploaded_after": 1700000000}}`)
+	req, _ := http.NewRequest("POST", "/api/chat", bytes.NewBuffer(jsonBody))
+	req.Header.Set("Content-Type", "application/json")
+
+	w := NewStreamRecorder()
+
+	// 2. ACT
+	router.ServeHTTP(w, req)
+
+	// 3. ASSERT
+	assert.Equal(t, 200, w.Code)
+	mockClient.AssertExpectations(t)
+}
+
 func TestUploadHandler_Success(t *testing.T) {
 	// 1. ARRANGE
 	mockClient := new(MockRagServiceClient)
@@ -183,3 +272,72 @@ func TestUploadHandler_Success(t *testing.T) {
 	mockClient.AssertExpectations(t)
 	mockUploadStream.AssertExpectations(t)
 }
+
+func TestUploadHandler_BackgroundReturnsJobID(t *testing.T) {
+	mockClient := new(MockRagServiceClient)
+	mockUploadStream := new(MockUploadStream)
+	mockClient.On("UploadDocument", mock.Anything).Return(mockUploadStream, nil)
+
+	// The metadata message must ask for a background job
+	mockUploadStream.On("Send", mock.MatchedBy(func(req *pb.UploadRequest) bool {
+		meta := req.GetMetadata()
+		return meta == nil || meta.GetBackground()
+	})).Return(nil)
+	mockUploadStream.On("CloseAndRecv").Return(&pb.UploadResponse{Status: "queued", JobId: "abc123"}, nil)
+
+	router := setupRouter(&rag.Client{Service: mockClient})
+
+	body := new(bytes.Buffer)
+	writer := multipart.NewWriter(body)
+	part, _ := writer.CreateFormFile("file", "test.txt")
+	part.Write([]byte("dummy content"))
+	writer.WriteField("background", "true")
+	writer.Close()
+
+	req, _ := http.NewRequest("POST", "/api/upload", body)
+	req.Header.Set("Content-Type", writer.FormDataContentType())
+	w := httptest.NewRecorder()
+	router.ServeHTTP(w, req)
+
+	assert.Equal(t, 200, w.Code)
+	assert.Contains(t, w.Body.String(), `"job_id":"abc123"`)
+	mockUploadStream.AssertExpectations(t)
+}
+
+func TestJobHandler_StreamsStatusUntilFinished(t *testing.T) {
+	mockClient := new(MockRagServiceClient)
+	mockStream := new(MockJobStream)
+	mockStream.On("Recv").Return(&pb.IngestionJobStatus{JobId: "abc123", State: "running", PagesParsed: 3}, nil).Once()
+	mockStream.On("Recv").Return(&pb.IngestionJobStatus{JobId: "abc123", State: "succeeded", ChunksCount: 12}, nil).Once()
+	mockStream.On("Recv").Return(nil, io.EOF).Once()
+
+	mockClient.On("WatchIngestionJob", mock.Anything, mock.MatchedBy(func(req *pb.IngestionJobRequest) bool {
+		return req.GetJobId() == "abc123"
+	})).Return(mockStream, nil)
+
+	router := setupRouter(&rag.Client{Service: mockClient})
+
+	w := NewStreamRecorder()
+	req, _ := http.NewRequest("GET", "/api/jobs/abc123", nil)
+	router.ServeHTTP(w, req)
+
+	assert.Equal(t, 200, w.Code)
+	assert.Contains(t, w.Body.String(), `"state":"running"`)
+	assert.Contains(t, w.Body.String(), `"state":"succeeded"`)
+	mockStream.AssertExpectations(t)
+}
+
+func TestJobHandler_UnknownJob(t *testing.T) {
+	mockClient := new(MockRagServiceClient)
+	mockStream := new(MockJobStream)
+	mockStream.On("Recv").Return(nil, status.Error(codes.NotFound, "Unknown job")).Once()
+	mockClient.On("WatchIngestionJob", mock.Anything, mock.Anything).Return(mockStream, nil)
+
+	router := setupRouter(&rag.Client{Service: mockClient})
+
+	w := httptest.NewRecorder()
+	req, _ := http.NewRequest("GET", "/api/jobs/missing", nil)
+	router.ServeHTTP(w, req)
+
+	assert.Equal(t, 404, w.Code)
+}
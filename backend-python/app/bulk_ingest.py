@@ -0,0 +1,121 @@
+"""
+Bulk-ingest a directory of documents into a collection, without the gRPC server.
+
+Supported files (PDF, TXT, MD) are parsed INGESTION_PARSE_CONCURRENCY at a time and
+their chunks are packed into shared embedding batches, as BulkUploadDocuments does.
+Files are identified by their name, so a file whose name occurs twice is skipped.
+
+Usage (from backend-python/):
+    python -m app.bulk_ingest ./handbooks --collection school_docs
+    python -m app.bulk_ingest ./handbooks --recursive --concurrency 8
+"""
+
+import argparse
+import asyncio
+import functools
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List
+
+from app.containers import Container
+from app.services.document_parser import SUPPORTED_EXTENSIONS
+from app.services.ingestion_pipeline import DocumentTask, IngestionPipeline, IngestionResult
+from app.telemetry import configure_logging
+
+PROGRESS_INTERVAL = 5.0  # seconds between progress lines
+
+
+def find_documents(directory: Path, recursive: bool) -> tuple[List[Path], Dict[str, str]]:
+    """Supported files by name, and the ones that were skipped (name -> reason)."""
+    paths = sorted(directory.rglob("*") if recursive else directory.iterdir())
+    documents: Dict[str, Path] = {}
+    skipped: Dict[str, str] = {}
+    for path in paths:
+        if not path.is_file() or path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+            continue
+        if path.name in documents:
+            skipped[path.name] = f"Duplicate filename ({path})"
+            continue
+        documents[path.name] = path
+    for name in skipped:
+        documents.pop(name, None)
+    return list(documents.values()), skipped
+
+
+async def ingest_directory(args: argparse.Namespace) -> int:
+    container = Container()
+    settings = container.config()
+    configure_logging(settings)
+
+    paths, skipped = find_documents(args.directory, args.recursive)
+    if not paths:
+        print(f"No supported files ({', '.join(SUPPORTED_EXTENSIONS)}) in {args.directory}")
+        return 1
+    collection_name = args.collection or settings.qdrant_collection
+    print(f"Ingesting {len(paths)} files into {collection_name!r}")
+
+    try:
+        embedding_service = await container.embedding_service()
+        document_parser = await container.document_parser()
+        pipeline = IngestionPipeline(
+            embedding_service,
+            batch_size=settings.ingestion_batch_size,
+            queue_size=settings.ingestion_queue_size,
+        )
+
+        async def documents() -> AsyncIterator[DocumentTask]:
+            for path in paths:
+                yield (
+                    path.name,
+                    functools.partial(document_parser.iter_chunks, str(path), path.name),
+                )
+
+        start_time = time.perf_counter()
+        last_report = start_time
+
+        async def report_progress(result: IngestionResult):
+            nonlocal last_report
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                print(
+                    f"  {result.pages} pages, {result.chunks} chunks, {result.upserted} upserted "
+                    f"({result.pages / (now - start_time):.1f} pages/s)"
+                )
+
+        result = await pipeline.run_many(
+            documents(),
+            concurrency=args.concurrency or settings.ingestion_parse_concurrency,
+            collection_name=collection_name,
+            on_progress=report_progress,
+        )
+        elapsed = time.perf_counter() - start_time
+    finally:
+        await container.shutdown_resources()
+
+    failed = {**skipped, **result.failed}
+    print(
+        f"Indexed {result.chunks} chunks ({result.upserted} new, {result.skipped} unchanged, "
+        f"{result.deleted} removed) from {len(paths) - len(result.failed)} files in {elapsed:.1f} s"
+    )
+    print(
+        f"{result.pages / elapsed:.1f} pages/s, {result.chunks / elapsed:.1f} chunks/s, "
+        f"{len(failed)} files failed"
+    )
+    for name, error in failed.items():
+        print(f"  {name}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--collection", help="target collection (default: QDRANT_COLLECTION)")
+    parser.add_argument("--recursive", action="store_true", help="include subdirectories")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="files parsed at a time (default: INGESTION_PARSE_CONCURRENCY)",
+    )
+    sys.exit(asyncio.run(ingest_directory(parser.parse_args())))
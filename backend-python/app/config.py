@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
@@ -6,6 +6,18 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     python_port: int = Field(default=50051)
+    # Seconds in-flight RPCs get to finish after SIGTERM
+    shutdown_grace_period: float = Field(default=10.0)
+
+    # Observability: leveled logs as "text" or "json" lines, Prometheus metrics served on
+    # http://METRICS_HOST:METRICS_PORT/metrics (0 disables it), and spans exported over
+    # OTLP/gRPC when OTEL_EXPORTER_OTLP_ENDPOINT is set (e.g. "http://otel-collector:4317")
+    log_level: str = Field(default="INFO")
+    log_format: str = Field(default="text")
+    metrics_host: str = Field(default="0.0.0.0")
+    metrics_port: int = Field(default=9464)
+    otel_exporter_otlp_endpoint: Optional[str] = Field(default=None)
+    otel_service_name: str = Field(default="rag-python")
 
     llm_provider: str = Field(default="dummy")
 
@@ -13,41 +25,191 @@ class Settings(BaseSettings):
 
     llm_timeout: float = Field(default=60.0)
 
+    # LLM_PROVIDER=router: comma-separated backends, each "provider" or "provider:model"
+    # (e.g. "local,openai:gpt-4o-mini"), routed by time-to-first-token
+    llm_router_backends: str = Field(default="")
+    llm_router_hedge_after_ms: float = Field(default=0.0)  # 0 disables hedged requests
+    llm_router_failure_cooldown: float = Field(default=30.0)
+    llm_router_window: int = Field(default=100)  # TTFT samples kept per backend
+
+    # Connection pool and admission control per LLM backend. The concurrency limit defaults
+    # to the provider's (LLMProvider.MAX_CONCURRENT_GENERATIONS) and also sizes the pool
+    llm_max_concurrency: Optional[int] = Field(default=None)
+    llm_max_queue: int = Field(default=32)  # waiting generations beyond this are rejected at once
+    llm_queue_timeout: float = Field(default=10.0)  # seconds to wait for a free slot
+    llm_keepalive_expiry: float = Field(default=30.0)
+    llm_http2: bool = Field(default=True)  # negotiated over TLS only, plain http stays HTTP/1.1
+
     openai_api_key: Optional[str] = Field(default=None)
     gemini_api_key: Optional[str] = Field(default=None)
 
     local_llm_url: str = Field(default="http://localhost:8080/v1/chat/completions")
 
+    # Server-side prompt prefix caching: llama.cpp `cache_prompt` for the local provider,
+    # explicit cached contents (with this TTL, 0 disables them) for Gemini
+    local_llm_cache_prompt: bool = Field(default=True)
+    gemini_cache_ttl_seconds: int = Field(default=300)
+
     qdrant_host: str = Field(default="localhost")
     qdrant_port: int = Field(default=6333)
+    # Embedded Qdrant (":memory:" or a storage directory) instead of a server, e.g. for benchmarks
+    qdrant_path: Optional[str] = Field(default=None)
     qdrant_collection: str = Field(default="school_docs")
+    # Missing collections are re-checked after this long (known ones are cached for good)
+    qdrant_missing_collection_ttl: float = Field(default=30.0)
+
+    # Storage and HNSW index of new collections (and of existing ones when
+    # QDRANT_UPDATE_EXISTING_COLLECTIONS is set; Qdrant rebuilds them in the background).
+    # Quantization keeps compressed copies of the dense vectors in RAM: "scalar" (int8, 4x
+    # smaller), "binary" (1 bit, 32x smaller, needs oversampling) or "none"
+    qdrant_quantization: str = Field(default="none")
+    qdrant_quantization_always_ram: bool = Field(default=True)
+    qdrant_on_disk_vectors: bool = Field(default=False)  # original vectors memory-mapped
+    qdrant_on_disk_payload: bool = Field(default=False)
+    qdrant_hnsw_m: Optional[int] = Field(default=None)  # None = Qdrant's default (16)
+    qdrant_hnsw_ef_construct: Optional[int] = Field(default=None)  # None = Qdrant's default (100)
+    qdrant_update_existing_collections: bool = Field(default=False)
+    # Per-query search: HNSW beam width, and how many quantized candidates (limit x
+    # oversampling) are re-scored with the original vectors (None = Qdrant's defaults)
+    qdrant_search_hnsw_ef: Optional[int] = Field(default=None)
+    qdrant_search_rescore: bool = Field(default=True)
+    qdrant_search_oversampling: Optional[float] = Field(default=None)
+
+    default_max_results: int = Field(default=3)
+    max_results_limit: int = Field(default=20)
 
     embedding_vector_size: int = Field(default=384)
     embedding_chunk_size: int = Field(default=500)
     embedding_chunk_overlap: int = Field(default=50)
 
+    # "hybrid" (dense + BM25 sparse vectors, fused with RRF) or "dense"
+    retrieval_mode: str = Field(default="hybrid")
+    sparse_embedding_model: str = Field(default="Qdrant/bm25")
+    hybrid_prefetch_limit: int = Field(default=20)  # candidates per leg before fusion
+
+    # Cross-encoder reranking of over-fetched candidates (the model is downloaded on first use)
+    reranker_enabled: bool = Field(default=False)
+    reranker_model: str = Field(default="Xenova/ms-marco-MiniLM-L-6-v2")
+    reranker_candidates: int = Field(default=20)
+    reranker_budget_ms: float = Field(default=150.0)  # keep vector order when exceeded
+
+    # Prompt context packing; the budget defaults to the provider's (see LLMProvider). Tokens
+    # are counted with the embedding model's tokenizer (~4 chars/token if it isn't cached)
+    context_token_budget: Optional[int] = Field(default=None)
+    context_tokenizer_path: Optional[str] = Field(default=None)  # tokenizer.json to use instead
+    context_duplicate_threshold: float = Field(default=0.9)  # word-set Jaccard similarity
+
+    query_embedding_cache_size: int = Field(default=4096)
+    embedding_batching_enabled: bool = Field(default=True)
+    embedding_batch_max_size: int = Field(default=32)
+    embedding_batch_max_wait_ms: float = Field(default=2.0)
+
     maximum_file_size: int = Field(default=50 * 1024 * 1024)  # 50 MB
+    # Uploads up to this size are parsed from memory, larger ones spill to a memory-mapped
+    # temporary file written in UPLOAD_FLUSH_SIZE blocks
+    upload_memory_limit: int = Field(default=8 * 1024 * 1024)
+    upload_flush_size: int = Field(default=1024 * 1024)
+
+    ingestion_batch_size: int = Field(default=32)
+    ingestion_queue_size: int = Field(default=4)
+    ingestion_parse_concurrency: int = Field(default=4)  # files parsed at a time by bulk uploads
+
+    # Background uploads (UploadMetadata.background) are spooled to INGESTION_JOB_DIR, which
+    # also holds the job database, and ingested by INGESTION_JOB_WORKERS tasks (0 disables
+    # them, such uploads are then ingested before UploadDocument returns)
+    ingestion_job_workers: int = Field(default=2)
+    ingestion_job_max_pending: int = Field(default=100)  # queued + running jobs
+    ingestion_job_dir: str = Field(default="ingestion_jobs")
+    ingestion_job_ttl_seconds: float = Field(default=7 * 24 * 3600.0)  # finished jobs kept
+
+    document_parser_workers: int = Field(default=2)  # 0 disables the process pool
+    document_parser_pages_per_task: int = Field(default=16)
+    document_parser_min_pages: int = Field(default=32)
+
+    # Conversation memory: "memory", "sqlite" or "none"
+    session_store: str = Field(default="memory")
+    session_sqlite_path: str = Field(default="sessions.db")
+    session_sqlite_purge_every: int = Field(default=100)  # appends between expired-session purges
+    session_ttl_seconds: float = Field(default=3600.0)
+    session_max_sessions: int = Field(default=10000)
+    session_max_turns: int = Field(default=20)  # user + assistant messages kept per session
+    session_max_turn_chars: int = Field(default=4000)
+    session_history_token_budget: int = Field(default=1024)
+
+    # Answer streaming: text is flushed to the client every STREAM_FLUSH_INTERVAL_MS or
+    # STREAM_FLUSH_MAX_CHARS characters, whichever comes first (0 ms sends every chunk)
+    stream_flush_interval_ms: float = Field(default=30.0)
+    stream_flush_max_chars: int = Field(default=256)
+
+    # Identical questions in flight at the same time share one retrieval + LLM stream
+    chat_coalescing_enabled: bool = Field(default=True)
+
+    # Serves a cached answer to a near-identical question (off: paraphrases can differ in meaning)
+    answer_cache_enabled: bool = Field(default=False)
+    answer_cache_similarity_threshold: float = Field(default=0.95)
+    answer_cache_max_entries: int = Field(default=1024)
+    answer_cache_ttl_seconds: float = Field(default=600.0)
 
     @model_validator(mode="after")
     def validate_provider(self) -> "Settings":
-        """Validate and normalize the LLM provider"""
+        """Validate and normalize the LLM provider(s), retrieval and storage modes and logging"""
         v = self.llm_provider.lower()
-        valid_providers = ["openai", "gemini", "local", "dummy"]
+        valid_providers = ["openai", "gemini", "local", "dummy", "router"]
 
         if v not in valid_providers:
             raise ValueError(
                 f"Invalid LLM provider. Valid options are: {', '.join(valid_providers)}"
             )
 
+        selected = [v]
+        if v == "router":
+            selected = [name for name, _ in self.router_backends()]
+            if not selected:
+                raise ValueError("Router selected but LLM_ROUTER_BACKENDS is empty")
+            if any(name not in valid_providers or name == "router" for name in selected):
+                raise ValueError(
+                    "Invalid router backend. Valid options are: openai, gemini, local, dummy"
+                )
+
         # API key checks
-        if v == "openai" and not self.openai_api_key:
+        if "openai" in selected and not self.openai_api_key:
             raise ValueError("OpenAI selected but OPENAI_API_KEY is missing")
-        if v == "gemini" and not self.gemini_api_key:
+        if "gemini" in selected and not self.gemini_api_key:
             raise ValueError("Gemini selected but GEMINI_API_KEY is missing")
 
         self.llm_provider = v
+
+        self.retrieval_mode = self.retrieval_mode.lower()
+        if self.retrieval_mode not in ("hybrid", "dense"):
+            raise ValueError("Invalid retrieval mode. Valid options are: hybrid, dense")
+
+        self.qdrant_quantization = self.qdrant_quantization.lower()
+        if self.qdrant_quantization not in ("none", "scalar", "binary"):
+            raise ValueError("Invalid Qdrant quantization. Valid options are: none, scalar, binary")
+
+        self.session_store = self.session_store.lower()
+        if self.session_store not in ("memory", "sqlite", "none"):
+            raise ValueError("Invalid session store. Valid options are: memory, sqlite, none")
+
+        self.log_level = self.log_level.upper()
+        if self.log_level not in ("DEBUG", "INFO", "WARNING", "ERROR"):
+            raise ValueError("Invalid log level. Valid options are: DEBUG, INFO, WARNING, ERROR")
+
+        self.log_format = self.log_format.lower()
+        if self.log_format not in ("text", "json"):
+            raise ValueError("Invalid log format. Valid options are: text, json")
+
         return self
 
+    def router_backends(self) -> List[Tuple[str, str]]:
+        """Parse LLM_ROUTER_BACKENDS into (provider, model) pairs, model defaulting to MODEL_NAME."""
+        backends = []
+        for entry in self.llm_router_backends.split(","):
+            if entry.strip():
+                name, _, model = entry.strip().partition(":")
+                backends.append((name.strip().lower(), model.strip() or self.model_name))
+        return backends
+
     class ConfigDict:
         env_file = ".env"
         env_file_encoding = "utf-8"
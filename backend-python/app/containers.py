@@ -2,16 +2,65 @@ from dependency_injector import containers, providers
 
 from .config import settings
 from .llm import get_llm_provider
-from .services import EmbeddingService, RagService
+from .services import (
+    RagService,
+    get_answer_cache,
+    get_context_packer,
+    get_single_flight,
+    init_document_parser,
+    init_embedding_service,
+    init_ingestion_jobs,
+    init_reranker,
+    init_session_store,
+)
+from .telemetry import init_telemetry
 
 
 class Container(containers.DeclarativeContainer):
     config = providers.Object(settings)
 
-    llm_client = providers.Factory(get_llm_provider, settings=config)
+    # Metrics endpoint and trace exporter
+    telemetry = providers.Resource(init_telemetry, settings=config)
 
-    embedding_service = providers.Factory(EmbeddingService, settings=config)
+    # One provider per process, so its connection pool and concurrency limit are shared
+    llm_client = providers.Singleton(get_llm_provider, settings=config)
+
+    # Resources are created once by init_resources() and closed by shutdown_resources()
+    embedding_service = providers.Resource(init_embedding_service, settings=config)
+
+    answer_cache = providers.Singleton(get_answer_cache, settings=config)
+
+    context_packer = providers.Singleton(
+        get_context_packer, settings=config, llm_provider=llm_client
+    )
+
+    single_flight = providers.Singleton(get_single_flight, settings=config)
+
+    document_parser = providers.Resource(init_document_parser, settings=config)
+
+    reranker = providers.Resource(init_reranker, settings=config)
+
+    session_store = providers.Resource(init_session_store, settings=config)
+
+    # Background ingestion workers, unfinished jobs resume when the resource starts
+    ingestion_jobs = providers.Resource(
+        init_ingestion_jobs,
+        settings=config,
+        embedding_service=embedding_service,
+        document_parser=document_parser,
+        answer_cache=answer_cache,
+    )
 
     rag_service = providers.Factory(
-        RagService, settings=config, llm_provider=llm_client, embedding_service=embedding_service
+        RagService,
+        settings=config,
+        llm_provider=llm_client,
+        embedding_service=embedding_service,
+        answer_cache=answer_cache,
+        context_packer=context_packer,
+        document_parser=document_parser,
+        reranker=reranker,
+        session_store=session_store,
+        single_flight=single_flight,
+        ingestion_jobs=ingestion_jobs,
     )
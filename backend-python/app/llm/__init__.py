@@ -1,4 +1,11 @@
-from .base import LLMProvider
+from .base import ERROR_PREFIX, LLMProvider
+from .concurrency import ConcurrencyLimiter, ProviderOverloadedError
 from .factory import get_llm_provider
 
-__all__ = ["LLMProvider", "get_llm_provider"]
+__all__ = [
+    "ERROR_PREFIX",
+    "ConcurrencyLimiter",
+    "LLMProvider",
+    "ProviderOverloadedError",
+    "get_llm_provider",
+]
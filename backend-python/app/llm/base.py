@@ -1,5 +1,16 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, Dict, List
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import AsyncGenerator, Dict, List, Optional
+
+from app.telemetry import LLM_CACHED_PROMPT_TOKENS, LLM_PROMPT_TOKENS
+
+from .concurrency import ConcurrencyLimiter
+
+# Providers stream failures as a text chunk starting with this prefix
+ERROR_PREFIX = "Error generating response"
+
+logger = logging.getLogger(__name__)
 
 
 class LLMProvider(ABC):
@@ -14,13 +25,65 @@ class LLMProvider(ABC):
         "Do not fabricate information or use outside knowledge unless explicitly asked."
     )
 
-    def _build_context_prompt(self, query: str, context_docs: List[str]) -> str:
-        """Shared prompt builder for all providers"""
+    # Tokens of retrieved context packed into each prompt
+    CONTEXT_TOKEN_BUDGET: int = 3000
+    # Generations allowed in flight at once (also the HTTP connection pool size)
+    MAX_CONCURRENT_GENERATIONS: int = 32
+
+    def __init__(self, limiter: Optional[ConcurrencyLimiter] = None) -> None:
+        self.limiter = limiter
+        # Prompt tokens reported by the server, and how many of them came from its prefix cache
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+
+    def _generation_slot(self) -> AbstractAsyncContextManager:
+        """
+        Slot to hold while streaming a generation (no limit without a limiter).
+
+        Providers enter it outside their error handling, so that ProviderOverloadedError
+        reaches the caller instead of being streamed as an error message.
+        """
+        if self.limiter is None:
+            return nullcontext()
+        return self.limiter.slot()
+
+    def _build_context_block(self, context_docs: List[str]) -> str:
+        """
+        Retrieved context in the order given (most relevant first, as ranked and packed),
+        which is already the same for the same results, so they give the same prefix.
+        """
         context_str = "\n\n---\n\n".join(context_docs)
-        return (
-            f"Please answer the question based on the following context:\n\n"
-            f"CONTEXT:\n{context_str}\n\n"
-            f"QUESTION: {query}"
+        return f"Answer the question based on the following context.\n\nCONTEXT:\n{context_str}"
+
+    def _build_messages(
+        self, query: str, context_docs: List[str], history: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """
+        Shared prompt layout for all providers, ordered from most to least stable:
+        system prompt + context, conversation history, then the question.
+
+        Servers that cache prompt prefixes (OpenAI, llama.cpp, Gemini) can then reuse
+        the prefill of follow-up questions asked against the same documents.
+        """
+        system = f"{self.DEFAULT_SYSTEM_PROMPT}\n\n{self._build_context_block(context_docs)}"
+        return [
+            {"role": "system", "content": system},
+            *({"role": h["role"], "content": h["content"]} for h in history),
+            {"role": "user", "content": f"QUESTION: {query}"},
+        ]
+
+    def _record_prompt_usage(self, prompt_tokens: int, cached_tokens: int):
+        self.prompt_tokens += prompt_tokens
+        self.cached_prompt_tokens += cached_tokens
+        LLM_PROMPT_TOKENS.labels(backend=self.backend_label).inc(prompt_tokens)
+        LLM_CACHED_PROMPT_TOKENS.labels(backend=self.backend_label).inc(cached_tokens)
+        logger.debug(
+            "Prompt cache usage",
+            extra={
+                "provider": self.provider_name,
+                "prompt_tokens": prompt_tokens,
+                "cached_prompt_tokens": cached_tokens,
+            },
         )
 
     @abstractmethod
@@ -55,3 +118,9 @@ class LLMProvider(ABC):
             str: The name of the provider.
         """
         pass
+
+    @property
+    def backend_label(self) -> str:
+        """Provider and model ("openai:gpt-4o-mini"), the `backend` label of LLM metrics."""
+        model = getattr(self, "model", None)
+        return f"{self.provider_name}:{model}" if model else self.provider_name
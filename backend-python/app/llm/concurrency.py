@@ -0,0 +1,75 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.telemetry import LLM_QUEUE_DEPTH, LLM_REJECTED, LLM_SLOTS_IN_FLIGHT
+
+
+class ProviderOverloadedError(Exception):
+    """Raised when a generation can't get a slot on the LLM backend in time."""
+
+
+class ConcurrencyLimiter:
+    """
+    Caps in-flight generations per LLM backend, with a bounded wait queue.
+
+    Requests beyond `max_queue` waiters, or waiting longer than `queue_timeout`,
+    are rejected with ProviderOverloadedError instead of piling up on the server.
+    Slot usage, queue depth and rejections are exported per backend (`name`).
+    """
+
+    def __init__(
+        self, max_in_flight: int, max_queue: int, queue_timeout: float, name: str = "default"
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+        self._in_flight_gauge = LLM_SLOTS_IN_FLIGHT.labels(name)
+        self._queue_gauge = LLM_QUEUE_DEPTH.labels(name)
+        self._rejected_counter = LLM_REJECTED.labels(name)
+
+    def _reject(self, message: str) -> ProviderOverloadedError:
+        self.rejected += 1
+        self._rejected_counter.inc()
+        return ProviderOverloadedError(message)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a generation slot for the duration of the block."""
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            raise self._reject(f"LLM queue is full ({self.waiting} waiting)")
+
+        self.waiting += 1
+        self._queue_gauge.inc()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject(f"No LLM slot freed up within {self.queue_timeout:.1f}s") from None
+        finally:
+            self.waiting -= 1
+            self._queue_gauge.dec()
+
+        self.in_flight += 1
+        self._in_flight_gauge.inc()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._in_flight_gauge.dec()
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        """Export slot usage and queue depth for monitoring."""
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "max_in_flight": self.max_in_flight,
+        }
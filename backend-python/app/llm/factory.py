@@ -1,32 +1,81 @@
+import logging
+from typing import Type
+
 from app.config import Settings
 
 from .base import LLMProvider
+from .concurrency import ConcurrencyLimiter
 from .provider import (
     DummyProvider,
     GeminiProvider,
     LocalProvider,
     OpenAIProvider,
+    RouterProvider,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _connection_options(settings: Settings, provider_cls: Type[LLMProvider], backend: str) -> dict:
+    """Pool and concurrency options shared by the HTTP-backed providers."""
+    max_concurrency = settings.llm_max_concurrency or provider_cls.MAX_CONCURRENT_GENERATIONS
+    return {
+        "max_connections": max_concurrency,
+        "keepalive_expiry": settings.llm_keepalive_expiry,
+        "http2": settings.llm_http2,
+        "limiter": ConcurrencyLimiter(
+            max_in_flight=max_concurrency,
+            max_queue=settings.llm_max_queue,
+            queue_timeout=settings.llm_queue_timeout,
+            name=backend,  # "provider:model", the metrics label
+        ),
+    }
+
 
 def get_llm_provider(settings: Settings) -> LLMProvider:
     provider = settings.llm_provider
-    print(f"🧠 [Factory] Selected LLM Provider: {provider}")
+    logger.info("Selected LLM provider", extra={"provider": provider})
+
+    if provider == "router":
+        return RouterProvider(
+            backends=[
+                _create_provider(settings, name, model)
+                for name, model in settings.router_backends()
+            ],
+            hedge_after_ms=settings.llm_router_hedge_after_ms,
+            failure_cooldown=settings.llm_router_failure_cooldown,
+            window=settings.llm_router_window,
+        )
+
+    return _create_provider(settings, provider, settings.model_name)
+
 
+def _create_provider(settings: Settings, provider: str, model: str) -> LLMProvider:
     if provider == "openai":
         assert settings.openai_api_key is not None
         return OpenAIProvider(
-            api_key=settings.openai_api_key, model=settings.model_name, timeout=settings.llm_timeout
+            api_key=settings.openai_api_key,
+            model=model,
+            timeout=settings.llm_timeout,
+            **_connection_options(settings, OpenAIProvider, f"openai:{model}"),
         )
 
     elif provider == "gemini":
         assert settings.gemini_api_key is not None
         return GeminiProvider(
-            api_key=settings.gemini_api_key, model=settings.model_name, timeout=settings.llm_timeout
+            api_key=settings.gemini_api_key,
+            model=model,
+            timeout=settings.llm_timeout,
+            cache_ttl_seconds=settings.gemini_cache_ttl_seconds,
+            **_connection_options(settings, GeminiProvider, f"gemini:{model}"),
         )
     elif provider == "local":
         return LocalProvider(
-            base_url=settings.local_llm_url, model=settings.model_name, timeout=settings.llm_timeout
+            base_url=settings.local_llm_url,
+            model=model,
+            timeout=settings.llm_timeout,
+            cache_prompt=settings.local_llm_cache_prompt,
+            **_connection_options(settings, LocalProvider, f"local:{model}"),
         )
 
     else:
@@ -2,10 +2,12 @@ from .dummy_provider import DummyProvider
 from .gemini_provider import GeminiProvider
 from .local_provider import LocalProvider
 from .openai_provider import OpenAIProvider
+from .router_provider import RouterProvider
 
 __all__ = [
     "DummyProvider",
     "LocalProvider",
     "GeminiProvider",
     "OpenAIProvider",
+    "RouterProvider",
 ]
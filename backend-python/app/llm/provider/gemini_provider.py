@@ -1,45 +1,142 @@
-from typing import AsyncGenerator, Dict, List
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 
+import httpx
 from google.genai import Client
-from google.genai.types import GenerateContentConfig
+from google.genai.types import CreateCachedContentConfig, GenerateContentConfig, HttpOptions
 
-from ..base import LLMProvider
+from ..base import ERROR_PREFIX, LLMProvider
+from ..concurrency import ConcurrencyLimiter
+
+# Gemini rejects cached contents below a model-dependent minimum (1024 tokens for Flash)
+MIN_CACHED_PREFIX_TOKENS = 1024
+MAX_TRACKED_PREFIXES = 256
+
+logger = logging.getLogger(__name__)
 
 
 class GeminiProvider(LLMProvider):
-    def __init__(self, api_key: str, model: str, timeout: float) -> None:
-        self.client = Client(api_key=api_key).aio
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        timeout: float,
+        cache_ttl_seconds: int = 0,
+        max_connections: int = LLMProvider.MAX_CONCURRENT_GENERATIONS,
+        keepalive_expiry: float = 5.0,
+        http2: bool = False,
+        limiter: Optional[ConcurrencyLimiter] = None,
+    ) -> None:
+        super().__init__(limiter=limiter)
+        self.client = Client(
+            api_key=api_key,
+            http_options=HttpOptions(
+                timeout=int(timeout * 1000),  # milliseconds
+                async_client_args={
+                    "limits": httpx.Limits(
+                        max_connections=max_connections,
+                        max_keepalive_connections=max_connections,
+                        keepalive_expiry=keepalive_expiry,
+                    ),
+                    "http2": http2,
+                },
+            ),
+        ).aio
         self.model = model
+        # 0 disables explicit context caching (implicit caching still applies)
+        self.cache_ttl_seconds = cache_ttl_seconds
 
-    async def generate_response(
-        self, query: str, context_docs: List[str], history: List[Dict[str, str]]
-    ) -> AsyncGenerator[str, None]:
-        messages = []
-        if history:
-            messages.extend(history)
+        # prefix hash -> times seen, and prefix hash -> (cached content name, expiry)
+        self._seen_prefixes: OrderedDict[str, int] = OrderedDict()
+        self._cached_prefixes: OrderedDict[str, Tuple[str, float]] = OrderedDict()
 
-        messages.append(super()._build_context_prompt(query, context_docs))
+    async def _get_cached_prefix(self, system: str) -> Optional[str]:
+        """
+        Return a cached-content handle for the system prompt + context, if worth having.
+
+        A cache is only created the second time the same prefix is seen (a follow-up
+        against the same documents), since creating one is an extra round trip.
+        """
+        if self.cache_ttl_seconds <= 0 or len(system) // 4 < MIN_CACHED_PREFIX_TOKENS:
+            return None
+
+        key = hashlib.sha256(system.encode()).hexdigest()
+        entry = self._cached_prefixes.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        self._seen_prefixes[key] = self._seen_prefixes.pop(key, 0) + 1
+        while len(self._seen_prefixes) > MAX_TRACKED_PREFIXES:
+            self._seen_prefixes.popitem(last=False)
+        if self._seen_prefixes[key] < 2:
+            return None
 
         try:
-            response = await self.client.models.generate_content_stream(
+            cached = await self.client.caches.create(
                 model=self.model,
-                contents=messages,
-                config=GenerateContentConfig(
-                    system_instruction=super().DEFAULT_SYSTEM_PROMPT,
-                    max_output_tokens=1024,
-                    temperature=0.1,
+                config=CreateCachedContentConfig(
+                    system_instruction=system, ttl=f"{self.cache_ttl_seconds}s"
                 ),
             )
+        except Exception as e:
+            logger.warning("Could not create Gemini context cache", extra={"error": str(e)})
+            return None
 
-            if not response:
-                raise ValueError("Response text is None")
+        assert cached.name is not None
+        # Expire our handle a little early so we never reference a deleted cache
+        self._cached_prefixes[key] = (cached.name, time.monotonic() + self.cache_ttl_seconds * 0.9)
+        while len(self._cached_prefixes) > MAX_TRACKED_PREFIXES:
+            self._cached_prefixes.popitem(last=False)
+        return cached.name
 
-            async for chunk in response:
-                if chunk.text:
-                    yield chunk.text
+    async def generate_response(
+        self, query: str, context_docs: List[str], history: List[Dict[str, str]]
+    ) -> AsyncGenerator[str, None]:
+        system, *turns = super()._build_messages(query, context_docs, history)
 
-        except Exception as e:
-            yield f"Error generating response (Gemini): {str(e)}"
+        # Gemini calls the assistant role "model" and wraps text in parts
+        messages = [
+            {
+                "role": "model" if turn["role"] == "assistant" else "user",
+                "parts": [{"text": turn["content"]}],
+            }
+            for turn in turns
+        ]
+
+        async with self._generation_slot():
+            try:
+                cached_content = await self._get_cached_prefix(system["content"])
+                response = await self.client.models.generate_content_stream(
+                    model=self.model,
+                    contents=messages,
+                    config=GenerateContentConfig(
+                        # A cached content already carries the system instruction
+                        system_instruction=None if cached_content else system["content"],
+                        cached_content=cached_content,
+                        max_output_tokens=1024,
+                        temperature=0.1,
+                    ),
+                )
+
+                if not response:
+                    raise ValueError("Response text is None")
+
+                usage = None
+                async for chunk in response:
+                    usage = chunk.usage_metadata or usage
+                    if chunk.text:
+                        yield chunk.text
+
+                if usage is not None and usage.prompt_token_count:
+                    self._record_prompt_usage(
+                        usage.prompt_token_count, usage.cached_content_token_count or 0
+                    )
+
+            except Exception as e:
+                yield f"{ERROR_PREFIX} (Gemini): {str(e)}"
 
     @property
     def provider_name(self) -> str:
@@ -1,59 +1,88 @@
-from typing import AsyncGenerator, Dict, List, cast
+from typing import AsyncGenerator, Dict, List, Optional, cast
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from openai.types.chat import ChatCompletionMessageParam
 
-from ..base import LLMProvider
+from ..base import ERROR_PREFIX, LLMProvider
+from ..concurrency import ConcurrencyLimiter
 
 
 class LocalProvider(LLMProvider):
-    def __init__(self, base_url: str, model: str, timeout: float) -> None:
-        self.client = AsyncOpenAI(base_url=base_url, api_key="no-api-key", timeout=timeout)
+    # Local models usually run with a small context window, and prompt processing is slow
+    CONTEXT_TOKEN_BUDGET = 1500
+    # A llama.cpp server only decodes a few sequences in parallel (its --parallel slots)
+    MAX_CONCURRENT_GENERATIONS = 4
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        timeout: float,
+        cache_prompt: bool = True,
+        max_connections: int = MAX_CONCURRENT_GENERATIONS,
+        keepalive_expiry: float = 5.0,
+        http2: bool = False,
+        limiter: Optional[ConcurrencyLimiter] = None,
+    ) -> None:
+        super().__init__(limiter=limiter)
+        self.client = AsyncOpenAI(
+            base_url=base_url,
+            api_key="no-api-key",
+            timeout=timeout,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                http2=http2,
+            ),
+        )
         self.model = model
+        self.cache_prompt = cache_prompt
 
     async def generate_response(
         self, query: str, context_docs: List[str], history: List[Dict[str, str]]
     ) -> AsyncGenerator[str, None]:
-        system_prompt = (
-            "You are a helpful and precise AI assistant. "
-            "Your task is to answer the user's question based ONLY on the provided context. "
-            "If the answer is not present in the context, state that you do not have enough information. "
-            "Do not fabricate information or use outside knowledge unless explicitly asked."
+        messages = cast(
+            List[ChatCompletionMessageParam],
+            super()._build_messages(query, context_docs, history),
         )
 
-        messages: List[ChatCompletionMessageParam] = [{"role": "system", "content": system_prompt}]
-
-        if history:
-            messages.extend(
-                cast(
-                    List[ChatCompletionMessageParam],
-                    [{"role": h["role"], "content": h["content"]} for h in history],
+        async with self._generation_slot():
+            try:
+                # llama.cpp server: reuse the KV cache of the longest common prompt prefix
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.1,
+                    max_tokens=1024,
+                    stream=True,
+                    extra_body={"cache_prompt": self.cache_prompt},
                 )
-            )
 
-        messages.append(
-            {"role": "user", "content": super()._build_context_prompt(query, context_docs)}
-        )
+                if not response:
+                    raise ValueError("Response text is None")
+
+                async for chunk in response:
+                    # llama.cpp reports prefill stats in the final chunk: cache_n tokens were
+                    # reused, prompt_n tokens had to be processed
+                    timings = (chunk.model_extra or {}).get("timings")
+                    if timings:
+                        cached_tokens = timings.get("cache_n", 0)
+                        self._record_prompt_usage(
+                            cached_tokens + timings.get("prompt_n", 0), cached_tokens
+                        )
+
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
 
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.1,
-                max_tokens=1024,
-                stream=True,
-            )
-
-            if not response:
-                raise ValueError("Response text is None")
-
-            async for chunk in response:
-                content = chunk.choices[0].delta.content
-                if content:
-                    yield content
-
-        except Exception as e:
-            yield f"Error generating response (Local): {str(e)}"
+            except Exception as e:
+                yield f"{ERROR_PREFIX} (Local): {str(e)}"
 
     @property
     def provider_name(self) -> str:
@@ -1,59 +1,76 @@
-from typing import AsyncGenerator, Dict, List, cast
+from typing import AsyncGenerator, Dict, List, Optional, cast
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from openai.types.chat import ChatCompletionMessageParam
 
-from ..base import LLMProvider
+from ..base import ERROR_PREFIX, LLMProvider
+from ..concurrency import ConcurrencyLimiter
 
 
 class OpenAIProvider(LLMProvider):
-    def __init__(self, api_key: str, model: str, timeout: float) -> None:
-        self.client = AsyncOpenAI(api_key=api_key, timeout=timeout)
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        timeout: float,
+        max_connections: int = LLMProvider.MAX_CONCURRENT_GENERATIONS,
+        keepalive_expiry: float = 5.0,
+        http2: bool = False,
+        limiter: Optional[ConcurrencyLimiter] = None,
+    ) -> None:
+        super().__init__(limiter=limiter)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            timeout=timeout,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+                http2=http2,
+            ),
+        )
         self.model = model
 
     async def generate_response(
         self, query: str, context_docs: List[str], history: List[Dict[str, str]]
     ) -> AsyncGenerator[str, None]:
-        system_prompt = (
-            "You are a helpful and precise AI assistant. "
-            "Your task is to answer the user's question based ONLY on the provided context. "
-            "If the answer is not present in the context, state that you do not have enough information. "
-            "Do not fabricate information or use outside knowledge unless explicitly asked."
+        messages = cast(
+            List[ChatCompletionMessageParam],
+            super()._build_messages(query, context_docs, history),
         )
 
-        messages: List[ChatCompletionMessageParam] = [{"role": "system", "content": system_prompt}]
-
-        if history:
-            messages.extend(
-                cast(
-                    List[ChatCompletionMessageParam],
-                    [{"role": h["role"], "content": h["content"]} for h in history],
+        async with self._generation_slot():
+            try:
+                # OpenAI caches prompt prefixes automatically, the usage chunk reports the hits
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.1,
+                    max_tokens=1024,
+                    stream=True,
+                    stream_options={"include_usage": True},
                 )
-            )
 
-        messages.append(
-            {"role": "user", "content": super()._build_context_prompt(query, context_docs)}
-        )
+                if not response:
+                    raise ValueError("Response text is None")
+
+                async for chunk in response:
+                    if chunk.usage is not None:
+                        details = chunk.usage.prompt_tokens_details
+                        cached_tokens = (details.cached_tokens or 0) if details else 0
+                        self._record_prompt_usage(chunk.usage.prompt_tokens, cached_tokens)
+
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        yield content
 
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.1,
-                max_tokens=1024,
-                stream=True,
-            )
-
-            if not response:
-                raise ValueError("Response text is None")
-
-            async for chunk in response:
-                content = chunk.choices[0].delta.content
-                if content:
-                    yield content
-
-        except Exception as e:
-            yield f"Error generating response (OpenAI): {str(e)}"
+            except Exception as e:
+                yield f"{ERROR_PREFIX} (OpenAI): {str(e)}"
 
     @property
     def provider_name(self) -> str:
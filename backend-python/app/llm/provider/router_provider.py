@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncGenerator, Deque, Dict, List, Optional, Tuple
+
+from app.telemetry import (
+    LLM_ROUTER_FAILURES,
+    LLM_ROUTER_HEDGE_WINS,
+    LLM_ROUTER_REQUESTS,
+    LLM_ROUTER_TTFT_SECONDS,
+)
+
+from ..base import ERROR_PREFIX, LLMProvider
+from ..concurrency import ProviderOverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class BackendStats:
+    """Rolling time-to-first-token samples and health of one routed backend."""
+
+    def __init__(self, window: int):
+        self.ttft: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.failures = 0
+        self.hedge_wins = 0
+        self.unhealthy_until = 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.ttft:
+            return None
+        samples = sorted(self.ttft)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+
+class RouterProvider(LLMProvider):
+    """
+    Routes each generation to the fastest healthy backend among several providers.
+
+    Backends are ranked by their rolling p50 time-to-first-token (untried ones first,
+    so every backend gets measured). If the first token hasn't arrived after
+    `hedge_after_ms`, the same request is also sent to the next backend and whichever
+    answers first wins; the other stream is cancelled. A backend that fails before its
+    first token is skipped for `failure_cooldown` seconds and the request fails over to
+    the next one. Failures after the first token can't be retried, the answer is
+    already partially streamed.
+    """
+
+    def __init__(
+        self,
+        backends: List[LLMProvider],
+        hedge_after_ms: float = 0.0,
+        failure_cooldown: float = 30.0,
+        window: int = 100,
+    ) -> None:
+        super().__init__()
+        if not backends:
+            raise ValueError("RouterProvider needs at least one backend")
+
+        self.backends = backends
+        self.hedge_after = hedge_after_ms / 1000 if hedge_after_ms > 0 else None
+        self.failure_cooldown = failure_cooldown
+        self.stats_by_backend: Dict[int, BackendStats] = {
+            id(backend): BackendStats(window) for backend in backends
+        }
+        self.hedges = 0
+
+        # The prompt must fit the most constrained backend
+        self.CONTEXT_TOKEN_BUDGET = min(b.CONTEXT_TOKEN_BUDGET for b in backends)
+
+    def _stats(self, backend: LLMProvider) -> BackendStats:
+        return self.stats_by_backend[id(backend)]
+
+    def _ranked_backends(self) -> List[LLMProvider]:
+        """Healthy backends by p50 time-to-first-token, then the unhealthy ones as a last resort."""
+
+        def speed(backend: LLMProvider) -> float:
+            p50 = self._stats(backend).percentile(0.5)
+            return 0.0 if p50 is None else p50
+
+        healthy = [b for b in self.backends if self._stats(b).healthy]
+        unhealthy = [b for b in self.backends if not self._stats(b).healthy]
+        return sorted(healthy, key=speed) + unhealthy
+
+    def _mark_failed(self, backend: LLMProvider, reason: str):
+        stats = self._stats(backend)
+        stats.failures += 1
+        LLM_ROUTER_FAILURES.labels(backend=backend.backend_label).inc()
+        stats.unhealthy_until = time.monotonic() + self.failure_cooldown
+        logger.warning(
+            "Router backend failed, failing over",
+            extra={"backend": backend.backend_label, "reason": reason},
+        )
+
+    async def _first_chunk(
+        self, query: str, context_docs: List[str], history: List[Dict[str, str]]
+    ) -> Tuple[str, Optional[AsyncGenerator[str, None]]]:
+        """
+        Race backends for the first token (hedging and failing over as needed).
+
+        Returns:
+            The winner's first chunk and the rest of its stream, or the last error
+            chunk and None when every backend failed
+        """
+        queue = self._ranked_backends()
+        pending: Dict[asyncio.Task, Tuple[LLMProvider, AsyncGenerator[str, None], float]] = {}
+        last_error: Optional[str] = None
+        last_exception: Optional[BaseException] = None
+        hedged = False
+
+        def launch():
+            backend = queue.pop(0)
+            stream = backend.generate_response(query, context_docs, history)
+            task = asyncio.ensure_future(stream.__anext__())
+            pending[task] = (backend, stream, time.perf_counter())
+            self._stats(backend).requests += 1
+            LLM_ROUTER_REQUESTS.labels(backend=backend.backend_label).inc()
+
+        launch()
+        try:
+            while pending:
+                can_hedge = self.hedge_after is not None and queue and not hedged
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    hedged = True
+                    self.hedges += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    backend, stream, started = pending.pop(task)
+                    try:
+                        chunk = task.result()
+                    except StopAsyncIteration:
+                        chunk = f"{ERROR_PREFIX} (Router): empty response"
+                    except ProviderOverloadedError as e:
+                        last_exception = e
+                        chunk = None
+                    except Exception as e:
+                        chunk = f"{ERROR_PREFIX} (Router): {e}"
+
+                    if chunk is not None and not chunk.startswith(ERROR_PREFIX):
+                        stats = self._stats(backend)
+                        ttft = time.perf_counter() - started
+                        stats.ttft.append(ttft)
+                        LLM_ROUTER_TTFT_SECONDS.labels(backend=backend.backend_label).observe(ttft)
+                        stats.unhealthy_until = 0.0
+                        if hedged:
+                            stats.hedge_wins += 1
+                            LLM_ROUTER_HEDGE_WINS.labels(backend=backend.backend_label).inc()
+                        return chunk, stream
+
+                    if chunk is not None:
+                        self._mark_failed(backend, chunk)
+                        last_error = chunk
+                    else:
+                        # A full queue isn't a fault: fail over without cooling the backend down
+                        logger.info(
+                            "Router backend overloaded, failing over",
+                            extra={"backend": backend.backend_label},
+                        )
+                    await stream.aclose()
+
+                # Nothing in flight any more: fail over to the next backend
+                if not pending and queue:
+                    launch()
+        finally:
+            # Cancel the losing (or abandoned) streams
+            for task in pending:
+                task.cancel()
+            for task, (_, stream, _) in pending.items():
+                await asyncio.gather(task, return_exceptions=True)
+                await stream.aclose()
+
+        if last_error is None and last_exception is not None:
+            raise last_exception
+        assert last_error is not None
+        return last_error, None
+
+    async def generate_response(
+        self, query: str, context_docs: List[str], history: List[Dict[str, str]]
+    ) -> AsyncGenerator[str, None]:
+        first, rest = await self._first_chunk(query, context_docs, history)
+        yield first
+        if rest is None:
+            return
+
+        try:
+            async for chunk in rest:
+                yield chunk
+        finally:
+            await rest.aclose()
+
+    @property
+    def provider_name(self) -> str:
+        return "router(" + ",".join(b.backend_label for b in self.backends) + ")"
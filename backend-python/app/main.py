@@ -1,34 +1,60 @@
 import asyncio
+import logging
+import signal
 
 import grpc
 from pb import rag_service_pb2_grpc  # noqa: E402
 
 from app.containers import Container  # noqa: E402
+from app.telemetry import TelemetryInterceptor, configure_logging  # noqa: E402
+
+logger = logging.getLogger("app.main")
 
 
 async def serve():
     # 1. Create DI Container
     container = Container()
-
-    # 2. Resolve service
     settings = container.config()
-    rag_service_instance = container.rag_service()
+    configure_logging(settings)
+
+    # 2. Initialize shared resources (embedding model warm-up, Qdrant collection,
+    # parsing process pool) before accepting traffic
+    await container.init_resources()
+
+    try:
+        # 3. Resolve service
+        rag_service_instance = await container.rag_service()
+
+        # 4. Start gRPC Server in async mode
+        server = grpc.aio.server(interceptors=[TelemetryInterceptor()])
 
-    # 3. Start gRPC Server in async mode
-    server = grpc.aio.server()
+        # Save service
+        rag_service_pb2_grpc.add_RagServiceServicer_to_server(rag_service_instance, server)
 
-    # Save service
-    rag_service_pb2_grpc.add_RagServiceServicer_to_server(rag_service_instance, server)
+        server.add_insecure_port(f"[::]:{settings.python_port}")
 
-    server.add_insecure_port(f"[::]:{settings.python_port}")
+        logger.info(
+            "AI service started",
+            extra={
+                "port": settings.python_port,
+                "llm_provider": rag_service_instance.llm.provider_name,
+            },
+        )
 
-    print("🚀 [Python] AI Service Started (DI Enabled)!")
-    print(f"   -> Active LLM: {rag_service_instance.llm.provider_name}")
+        await server.start()
 
-    await server.start()
+        # Keep the server running until SIGTERM/SIGINT
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop_event.set)
+        await stop_event.wait()
 
-    # Keep the server running
-    await server.wait_for_termination()
+        logger.info("Shutting down, draining in-flight requests")
+        await server.stop(settings.shutdown_grace_period)
+    finally:
+        # Close the Qdrant client, embedding scheduler and process pool
+        await container.shutdown_resources()
 
 
 if __name__ == "__main__":
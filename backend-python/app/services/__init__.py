@@ -1,4 +1,49 @@
-from .embedding_service import EmbeddingService
+from .answer_cache import CachedAnswer, SemanticAnswerCache, get_answer_cache
+from .context_packer import ContextPacker, get_context_packer
+from .document_parser import DocumentParser, get_document_parser, init_document_parser
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import QueryEmbeddingCache
+from .embedding_service import EmbeddingService, init_embedding_service
+from .ingestion_jobs import IngestionJob, IngestionJobManager, init_ingestion_jobs
 from .rag_service import RagService
+from .reranker import CrossEncoderReranker, init_reranker
+from .session_store import (
+    ChatTurn,
+    InMemorySessionStore,
+    SessionStore,
+    SQLiteSessionStore,
+    init_session_store,
+)
+from .single_flight import SingleFlight, get_single_flight
+from .stream_coalescer import StreamCoalescer
+from .upload_buffer import UploadBuffer
 
-__all__ = ["EmbeddingService", "RagService"]
+__all__ = [
+    "CachedAnswer",
+    "ChatTurn",
+    "ContextPacker",
+    "CrossEncoderReranker",
+    "DocumentParser",
+    "EmbeddingBatcher",
+    "EmbeddingService",
+    "InMemorySessionStore",
+    "IngestionJob",
+    "IngestionJobManager",
+    "QueryEmbeddingCache",
+    "RagService",
+    "SemanticAnswerCache",
+    "SessionStore",
+    "SingleFlight",
+    "SQLiteSessionStore",
+    "StreamCoalescer",
+    "UploadBuffer",
+    "get_answer_cache",
+    "get_context_packer",
+    "get_document_parser",
+    "get_single_flight",
+    "init_document_parser",
+    "init_embedding_service",
+    "init_ingestion_jobs",
+    "init_reranker",
+    "init_session_store",
+]
@@ -0,0 +1,184 @@
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import Settings
+from app.telemetry import ANSWER_CACHE
+
+# Course codes, form numbers, years...: words the embedding barely tells apart
+_CODE_PATTERN = re.compile(r"\w*\d\w*")
+
+
+def _codes(query: str) -> FrozenSet[str]:
+    return frozenset(_CODE_PATTERN.findall(query.lower()))
+
+
+@dataclass
+class CachedAnswer:
+    """A fully generated answer, stored as the chunks that were streamed to the client."""
+
+    chunks: List[str]
+    search_results: List[Dict[str, Any]]
+    max_results: int = 0  # retrieval limit the answer was generated with
+
+
+@dataclass
+class _CacheEntry:
+    vector: np.ndarray
+    answer: CachedAnswer
+    expires_at: float
+    codes: FrozenSet[str] = frozenset()
+
+
+class SemanticAnswerCache:
+    """
+    In-memory answer cache keyed on the query embedding and the collection name.
+    A lookup hits when the cosine similarity between the new query and a cached one
+    reaches the configured threshold and both contain the same codes (words with
+    digits), so "CS101" and "CS102" never share an answer however similar the rest of
+    the question is. Entries are evicted by TTL and global LRU order.
+
+    Each collection has a generation, bumped by `invalidate()`: an answer generated
+    from context retrieved before an invalidation is not stored.
+    """
+
+    def __init__(self, similarity_threshold: float, max_entries: int, ttl_seconds: float):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._collections: Dict[str, Dict[int, _CacheEntry]] = {}
+        # Global LRU order across all collections: (collection, entry_id) -> None
+        self._lru: OrderedDict[Tuple[str, int], None] = OrderedDict()
+        # Stacked vector matrix per collection, rebuilt lazily after mutations
+        self._matrices: Dict[str, Tuple[List[int], np.ndarray]] = {}
+        self._next_id = 0
+        self._generations: Dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = ANSWER_CACHE.labels(result="hit")
+        self._miss_counter = ANSWER_CACHE.labels(result="miss")
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else vec
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def _remove(self, collection: str, entry_id: int):
+        entries = self._collections.get(collection)
+        if entries is not None:
+            entries.pop(entry_id, None)
+            if not entries:
+                del self._collections[collection]
+        self._lru.pop((collection, entry_id), None)
+        self._matrices.pop(collection, None)
+
+    def _purge_expired(self, collection: str, now: float):
+        entries = self._collections.get(collection, {})
+        for entry_id in [i for i, e in entries.items() if e.expires_at <= now]:
+            self._remove(collection, entry_id)
+
+    def _matrix(self, collection: str) -> Tuple[List[int], np.ndarray]:
+        cached = self._matrices.get(collection)
+        if cached is None:
+            entries = self._collections[collection]
+            ids = list(entries.keys())
+            cached = (ids, np.stack([entries[i].vector for i in ids]))
+            self._matrices[collection] = cached
+        return cached
+
+    def lookup(
+        self, query_vector: Sequence[float], collection: str, query: str = ""
+    ) -> Optional[CachedAnswer]:
+        """Return the cached answer most similar to the query, if it clears the threshold."""
+        self._purge_expired(collection, time.monotonic())
+
+        if collection not in self._collections:
+            self.misses += 1
+            self._miss_counter.inc()
+            return None
+
+        ids, matrix = self._matrix(collection)
+        similarities = matrix @ self._normalize(query_vector)
+        codes = _codes(query)
+
+        entries = self._collections[collection]
+        for best in np.argsort(-similarities):
+            if float(similarities[best]) < self.similarity_threshold:
+                break
+            entry_id = ids[int(best)]
+            if entries[entry_id].codes == codes:
+                self._lru.move_to_end((collection, entry_id))
+                self.hits += 1
+                self._hit_counter.inc()
+                return entries[entry_id].answer
+
+        self.misses += 1
+        self._miss_counter.inc()
+        return None
+
+    def generation(self, collection: str) -> int:
+        """Current generation of a collection, read before retrieving an answer's context."""
+        return self._generations.get(collection, 0)
+
+    def store(
+        self,
+        query_vector: Sequence[float],
+        collection: str,
+        answer: CachedAnswer,
+        query: str = "",
+        generation: Optional[int] = None,
+    ):
+        """
+        Cache a generated answer, evicting the least recently used entries if full.
+
+        Args:
+            generation: The collection's generation when the answer's context was
+                retrieved; the answer is dropped if the collection changed since
+        """
+        if self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation(collection):
+            return
+
+        entry_id = self._next_id
+        self._next_id += 1
+
+        self._collections.setdefault(collection, {})[entry_id] = _CacheEntry(
+            vector=self._normalize(query_vector),
+            answer=answer,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            codes=_codes(query),
+        )
+        self._lru[(collection, entry_id)] = None
+        self._matrices.pop(collection, None)
+
+        while len(self._lru) > self.max_entries:
+            (old_collection, old_id), _ = self._lru.popitem(last=False)
+            self._remove(old_collection, old_id)
+
+    def invalidate(self, collection: str):
+        """Drop every cached answer of a collection (e.g. after its documents changed)."""
+        self._generations[collection] = self.generation(collection) + 1
+        for entry_id in list(self._collections.get(collection, {})):
+            self._remove(collection, entry_id)
+
+
+def get_answer_cache(settings: Settings) -> Optional[SemanticAnswerCache]:
+    if not settings.answer_cache_enabled:
+        return None
+
+    return SemanticAnswerCache(
+        similarity_threshold=settings.answer_cache_similarity_threshold,
+        max_entries=settings.answer_cache_max_entries,
+        ttl_seconds=settings.answer_cache_ttl_seconds,
+    )
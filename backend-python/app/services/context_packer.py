@@ -0,0 +1,171 @@
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from fastembed import TextEmbedding
+from fastembed.common.utils import define_cache_dir
+from huggingface_hub import try_to_load_from_cache
+from tokenizers import Tokenizer
+
+from app.config import Settings
+
+from ..llm import LLMProvider
+from .embedding_service import EMBEDDING_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Shorter suffix/prefix matches are too likely to be coincidental
+MIN_OVERLAP_CHARS = 16
+
+
+def _relevance(hit: Dict[str, Any]) -> float:
+    """Cross-encoder score when the hit was reranked, vector score otherwise."""
+    return hit.get("rerank_score", hit.get("score", 0.0))
+
+
+def _source_key(hit: Dict[str, Any]) -> tuple:
+    metadata = hit.get("metadata", {})
+    return metadata.get("filename"), metadata.get("page")
+
+
+def _overlap(left: str, right: str, max_chars: int) -> int:
+    """Length of the longest suffix of `left` that is a prefix of `right` (0 if too short)."""
+    for size in range(min(len(left), len(right), max_chars), MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ContextPacker:
+    """
+    Turns search results into the context that is actually sent to the LLM.
+
+    Chunks of the same file/page that overlap (the splitter repeats up to
+    `chunk_overlap` characters between neighbours) are stitched back together,
+    near-duplicates are dropped, and the rest is added by relevance until the
+    token budget is used up.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        max_overlap_chars: int,
+        duplicate_threshold: float = 0.9,
+        tokenizer: Optional[Tokenizer] = None,
+    ):
+        self.token_budget = token_budget
+        self.max_overlap_chars = max_overlap_chars
+        self.duplicate_threshold = duplicate_threshold
+        self.tokenizer = tokenizer
+
+    def count_tokens(self, text: str) -> int:
+        if self.tokenizer is None:
+            return max(1, len(text) // 4)  # ~4 characters per token for English text
+        return len(self.tokenizer.encode(text, add_special_tokens=False).ids)
+
+    def _merge_overlapping(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        merged: List[Dict[str, Any]] = []
+        for hit in results:
+            hit = dict(hit)
+            # Stitching can make a chunk overlap an earlier one, so keep merging until stable
+            i = 0
+            while i < len(merged):
+                other = merged[i]
+                if _source_key(other) != _source_key(hit):
+                    i += 1
+                    continue
+
+                if size := _overlap(other["content"], hit["content"], self.max_overlap_chars):
+                    content = other["content"] + hit["content"][size:]
+                elif size := _overlap(hit["content"], other["content"], self.max_overlap_chars):
+                    content = hit["content"] + other["content"][size:]
+                else:
+                    i += 1
+                    continue
+
+                merged.pop(i)
+                for key in ("score", "rerank_score"):
+                    scores = [h[key] for h in (hit, other) if key in h]
+                    if scores:
+                        hit[key] = max(scores)
+                hit["content"] = content
+                i = 0
+            merged.append(hit)
+        return merged
+
+    def pack(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Select the context for a prompt.
+
+        Args:
+            results: Search results (content, metadata, score)
+
+        Returns:
+            Merged, de-duplicated results ordered by relevance, whose contents
+            fit in the token budget
+        """
+        candidates = sorted(self._merge_overlapping(results), key=_relevance, reverse=True)
+
+        packed: List[Dict[str, Any]] = []
+        kept_words: List[Set[str]] = []
+        used = 0
+        for hit in candidates:
+            words = set(hit["content"].lower().split())
+            if any(_jaccard(words, kept) >= self.duplicate_threshold for kept in kept_words):
+                continue
+
+            # A chunk that doesn't fit may still leave room for a shorter, less relevant one
+            tokens = self.count_tokens(hit["content"])
+            if used + tokens > self.token_budget:
+                continue
+
+            packed.append(hit)
+            kept_words.append(words)
+            used += tokens
+
+        return packed
+
+
+def load_tokenizer(path: str) -> Tokenizer:
+    """Load a `tokenizer.json` for counting only (no truncation or padding)."""
+    tokenizer = Tokenizer.from_file(path)
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    return tokenizer
+
+
+def find_model_tokenizer(model_name: str) -> Optional[str]:
+    """Path of the `tokenizer.json` fastembed downloaded with `model_name`, if it is cached."""
+    for description in TextEmbedding.list_supported_models():
+        repo_id = description["sources"].get("hf")
+        if description["model"] == model_name and repo_id:
+            path = try_to_load_from_cache(
+                repo_id, "tokenizer.json", cache_dir=str(define_cache_dir())
+            )
+            return path if isinstance(path, str) else None
+    return None
+
+
+def get_context_packer(settings: Settings, llm_provider: LLMProvider) -> ContextPacker:
+    # The embedding service has downloaded its model (with the tokenizer) by now
+    path = settings.context_tokenizer_path or find_model_tokenizer(EMBEDDING_MODEL)
+    tokenizer = None
+    if path:
+        tokenizer = load_tokenizer(path)
+    else:
+        logger.warning(
+            "No tokenizer.json found for the embedding model, estimating ~4 characters per token",
+            extra={"model": EMBEDDING_MODEL},
+        )
+
+    return ContextPacker(
+        token_budget=settings.context_token_budget or llm_provider.CONTEXT_TOKEN_BUDGET,
+        max_overlap_chars=settings.embedding_chunk_overlap,
+        duplicate_threshold=settings.context_duplicate_threshold,
+        tokenizer=tokenizer,
+    )
@@ -0,0 +1,312 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+import fitz
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.config import Settings
+from app.telemetry import PARSE_PAGE_SECONDS
+
+from .ingestion_pipeline import ChunkBatch, iterate_in_thread
+
+logger = logging.getLogger(__name__)
+
+# A document to parse: a file path, or the file's contents (e.g. an UploadBuffer's)
+DocumentSource = Union[str, bytes, bytearray, memoryview]
+
+# Anything else is parsed as UTF-8 text
+SUPPORTED_EXTENSIONS = (".pdf", ".txt", ".md")
+
+# One splitter per (chunk_size, chunk_overlap), reused by every task a process runs
+_splitters: Dict[Tuple[int, int], RecursiveCharacterTextSplitter] = {}
+
+
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    key = (chunk_size, chunk_overlap)
+    if key not in _splitters:
+        _splitters[key] = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=["\n\n", "\n", " ", ""],
+        )
+    return _splitters[key]
+
+
+def _open_pdf(source: DocumentSource) -> fitz.Document:
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _read_text(source: DocumentSource) -> str:
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as f:
+            return f.read()
+    return str(source, "utf-8")
+
+
+def _spill_to_temp_file(data: Union[bytes, bytearray, memoryview]) -> str:
+    """Write in-memory contents to a temp file once, for pool workers to open by path."""
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+        f.write(data)
+        return f.name
+
+
+def _iter_pdf_pages(
+    doc: fitz.Document,
+    filename: str,
+    start: int,
+    stop: int,
+    splitter: RecursiveCharacterTextSplitter,
+    page_seconds: List[float],
+) -> Iterator[ChunkBatch]:
+    """
+    Extract and split pages [start, stop) of an open PDF, one page at a time.
+    The time spent on each page is appended to `page_seconds`.
+    """
+    for i in range(start, stop):
+        page_start = time.perf_counter()
+        text = doc[i].get_text()
+        page_chunks = splitter.split_text(text) if isinstance(text, str) and text.strip() else []
+        page_seconds.append(time.perf_counter() - page_start)
+
+        if page_chunks:
+            yield page_chunks, [{"filename": filename, "page": i + 1} for _ in page_chunks]
+
+
+def _observe_pages(page_seconds: List[float]):
+    for seconds in page_seconds:
+        PARSE_PAGE_SECONDS.observe(seconds)
+    page_seconds.clear()
+
+
+def _parse_pdf_page_range(
+    path: str,
+    filename: str,
+    start: int,
+    stop: int,
+    chunk_size: int,
+    chunk_overlap: int,
+) -> Tuple[List[ChunkBatch], List[float]]:
+    """
+    Process-pool task: parse a page range of the PDF at `path`.
+    Page timings are returned, metrics recorded in a worker process would be lost.
+    """
+    splitter = _get_splitter(chunk_size, chunk_overlap)
+    page_seconds: List[float] = []
+    with fitz.open(path) as doc:
+        batches = list(_iter_pdf_pages(doc, filename, start, stop, splitter, page_seconds))
+    return batches, page_seconds
+
+
+def _warm_up_worker(chunk_size: int, chunk_overlap: int) -> int:
+    """Process-pool task: finish imports and build the splitter ahead of the first upload."""
+    _get_splitter(chunk_size, chunk_overlap)
+    return os.getpid()
+
+
+class DocumentParser:
+    """
+    Extracts text chunks (with filename/page metadata) from uploaded documents.
+
+    Small documents are parsed on a worker thread. Large PDFs are split into page
+    ranges that are parsed in parallel on a shared process pool, sidestepping the GIL.
+    Results are always yielded in page order, so output is deterministic.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int,
+        workers: int = 0,
+        pages_per_task: int = 16,
+        min_pages_for_pool: int = 32,
+    ):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.workers = workers
+        self.pages_per_task = max(1, pages_per_task)
+        self.min_pages_for_pool = min_pages_for_pool
+        self.text_splitter = _get_splitter(chunk_size, chunk_overlap)
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """Create the shared process pool and spawn all of its workers (blocking)."""
+        if self.workers <= 0 or self._pool is not None:
+            return
+
+        # 'spawn' avoids forking a process that already runs gRPC/ONNX threads
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        warm_up = [
+            self._pool.submit(_warm_up_worker, self.chunk_size, self.chunk_overlap)
+            for _ in range(self.workers)
+        ]
+        pids = {f.result() for f in warm_up}
+        logger.info("Parser process pool ready", extra={"workers": len(pids)})
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def iter_chunks_sync(self, source: DocumentSource, filename: str) -> Iterator[ChunkBatch]:
+        """
+        🛑 THIS METHOD CONTAINS CPU-INTENSIVE OPERATIONS (Runs synchronously).
+        Yields the chunks of one page at a time so ingestion can start before the
+        whole document is parsed. Iterate it on a worker thread (see 'iterate_in_thread').
+        `source` is a file path or the file's contents.
+        """
+        logger.debug("Parsing file", extra={"document": filename})
+        chunk_count = 0
+
+        try:
+            # A) PDF Processing
+            if filename.lower().endswith(".pdf"):
+                page_seconds: List[float] = []
+                with _open_pdf(source) as doc:
+                    for page_chunks, page_metadatas in _iter_pdf_pages(
+                        doc, filename, 0, len(doc), self.text_splitter, page_seconds
+                    ):
+                        _observe_pages(page_seconds)
+                        chunk_count += len(page_chunks)
+                        yield page_chunks, page_metadatas
+                _observe_pages(page_seconds)
+
+                logger.info(
+                    "Extracted chunks from PDF", extra={"document": filename, "chunks": chunk_count}
+                )
+
+            # B) Text/MD Processing
+            else:
+                text = _read_text(source)
+                file_chunks = self.text_splitter.split_text(text)
+                yield file_chunks, [{"filename": filename, "page": 1} for _ in file_chunks]
+                logger.info(
+                    "Extracted chunks from text file",
+                    extra={"document": filename, "chunks": len(file_chunks)},
+                )
+
+        except Exception:
+            logger.exception("Parsing failed", extra={"document": filename})
+            raise
+
+    def parse_sync(self, source: DocumentSource, filename: str) -> Tuple[List[str], List[Dict]]:
+        """Parse a whole document on the calling thread (reference, single-core path)."""
+        text_chunks = []
+        metadatas = []
+        for page_chunks, page_metadatas in self.iter_chunks_sync(source, filename):
+            text_chunks.extend(page_chunks)
+            metadatas.extend(page_metadatas)
+        return text_chunks, metadatas
+
+    @staticmethod
+    def _count_pages(source: DocumentSource) -> int:
+        with _open_pdf(source) as doc:
+            return len(doc)
+
+    async def _iter_pool_chunks(
+        self, path: str, filename: str, page_count: int
+    ) -> AsyncIterator[ChunkBatch]:
+        pool = self._pool
+        assert pool is not None
+        ranges = deque(
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        )
+        in_flight: deque[Future] = deque()
+
+        def submit_next():
+            start, stop = ranges.popleft()
+            in_flight.append(
+                pool.submit(
+                    _parse_pdf_page_range,
+                    path,
+                    filename,
+                    start,
+                    stop,
+                    self.chunk_size,
+                    self.chunk_overlap,
+                )
+            )
+
+        logger.info(
+            "Parsing on the process pool", extra={"document": filename, "pages": page_count}
+        )
+        try:
+            # Keep a bounded window of ranges in flight and yield them in page order
+            while ranges and len(in_flight) < self.workers * 2:
+                submit_next()
+
+            while in_flight:
+                page_batches, page_seconds = await asyncio.wrap_future(in_flight.popleft())
+                _observe_pages(page_seconds)
+                if ranges:
+                    submit_next()
+                for batch in page_batches:
+                    yield batch
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    async def iter_chunks(
+        self, source: DocumentSource, filename: str, path: Optional[str] = None
+    ) -> AsyncIterator[ChunkBatch]:
+        """
+        Yield per-page chunk batches of a document without blocking the event loop.
+
+        Args:
+            source: File path, or the file's contents
+            filename: Original filename (selects the format, stored in the metadata)
+            path: A file with the same contents, handed to pool workers instead of a copy
+        """
+        if self._pool is not None and filename.lower().endswith(".pdf"):
+            page_count = await asyncio.to_thread(self._count_pages, source)
+            if page_count >= self.min_pages_for_pool:
+                # Workers open the file themselves, tasks never carry a copy of the bytes
+                spilled: Optional[str] = None
+                if isinstance(source, str):
+                    worker_path = source
+                elif path is not None:
+                    worker_path = path
+                else:
+                    spilled = worker_path = await asyncio.to_thread(_spill_to_temp_file, source)
+                try:
+                    async for batch in self._iter_pool_chunks(worker_path, filename, page_count):
+                        yield batch
+                finally:
+                    if spilled is not None:
+                        await asyncio.to_thread(os.remove, spilled)
+                return
+
+        async for batch in iterate_in_thread(self.iter_chunks_sync, source, filename):
+            yield batch
+
+
+def get_document_parser(settings: Settings) -> DocumentParser:
+    return DocumentParser(
+        chunk_size=settings.embedding_chunk_size,
+        chunk_overlap=settings.embedding_chunk_overlap,
+        workers=settings.document_parser_workers,
+        pages_per_task=settings.document_parser_pages_per_task,
+        min_pages_for_pool=settings.document_parser_min_pages,
+    )
+
+
+async def init_document_parser(settings: Settings) -> AsyncIterator[DocumentParser]:
+    """Container resource: the shared parser, with its process pool running while in use."""
+    parser = get_document_parser(settings)
+    try:
+        await asyncio.to_thread(parser.start)
+        yield parser
+    finally:
+        await asyncio.to_thread(parser.shutdown)
@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+EmbedFn = Callable[[List[str]], List[np.ndarray]]
+
+
+class EmbeddingBatcher:
+    """
+    Async micro-batching scheduler for embedding requests.
+
+    Texts submitted within `max_wait_ms` of each other (up to `max_batch_size`) are
+    embedded with a single model call on a dedicated worker thread, and each vector
+    is handed back to the future of the caller that submitted it.
+    """
+
+    def __init__(self, embed_fn: EmbedFn, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        # A single dedicated thread keeps model calls off the default thread pool
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-batcher")
+        self._queue: Optional[asyncio.Queue[Tuple[str, asyncio.Future]]] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if (
+            self._queue is None
+            or self._worker is None
+            or self._worker.done()
+            or self._loop is not loop
+        ):
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Submit a text for embedding and wait for its vector."""
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((text, future))
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take everything that is already waiting before sleeping on the window
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # Callers that gave up while waiting don't need a vector
+        return [(text, future) for text, future in batch if not future.done()]
+
+    async def _run(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect(queue)
+            if not batch:
+                continue
+
+            try:
+                vectors = await loop.run_in_executor(
+                    self._executor, self.embed_fn, [text for text, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    async def close(self):
+        """Stop the scheduler and release its worker thread."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+            self._worker = None
+        self._executor.shutdown(wait=False)
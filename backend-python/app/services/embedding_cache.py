@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from app.telemetry import QUERY_EMBEDDING_CACHE
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded, thread-safe LRU cache of normalized query text -> embedding vector.
+    Vectors are stored as read-only float32 arrays to keep the footprint compact.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = QUERY_EMBEDDING_CACHE.labels(result="hit")
+        self._miss_counter = QUERY_EMBEDDING_CACHE.labels(result="miss")
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Collapse whitespace and case (the BGE tokenizer is uncased)."""
+        return " ".join(query.split()).lower()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, query: str) -> Optional[np.ndarray]:
+        key = self.normalize(query)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                self._miss_counter.inc()
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hit_counter.inc()
+            return vector
+
+    def put(self, query: str, vector: np.ndarray) -> np.ndarray:
+        """Store the vector for a query and return the cached (read-only) copy."""
+        stored = np.array(vector, dtype=np.float32)
+        stored.setflags(write=False)
+
+        if self.max_entries <= 0:
+            return stored
+
+        key = self.normalize(query)
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return stored
@@ -1,11 +1,146 @@
 import asyncio
+import hashlib
+import logging
+import time
 import uuid
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Collection, Dict, List, Optional, Sequence, Set
 
-from fastembed import TextEmbedding
-from qdrant_client import AsyncQdrantClient, QdrantClient, models
+import numpy as np
+from fastembed import SparseTextEmbedding, TextEmbedding
+from qdrant_client import AsyncQdrantClient, models
 
 from app.config import Settings
+from app.telemetry import EMBEDDING_BATCH_SIZE, EMBEDDING_SECONDS, QDRANT_SECONDS
+
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import QueryEmbeddingCache
+
+# BGE small (384 dimensions)
+EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+
+# Named vectors of hybrid collections (collections created before hybrid retrieval
+# use a single unnamed dense vector and are searched dense-only)
+DENSE_VECTOR = "dense"
+SPARSE_VECTOR = "sparse"
+
+# Payload fields search filters use (see metadata_filter), indexed in every collection so
+# Qdrant can apply the filter while traversing the HNSW graph
+PAYLOAD_INDEXES = {
+    "filename": models.PayloadSchemaType.KEYWORD,
+    "page": models.PayloadSchemaType.INTEGER,
+    "uploaded_at": models.PayloadSchemaType.INTEGER,  # unix seconds of the file's last upload
+}
+
+# Namespace for deterministic point IDs (uuid5 of filename, page and chunk content hash)
+POINT_ID_NAMESPACE = uuid.UUID("8f4f2d4e-6a0b-4f5c-9d51-3c0f8e7a2b19")
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(document: str) -> str:
+    """SHA-256 of a chunk's text, stored in the payload as 'content_hash'."""
+    return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+
+def document_point_id(document: str, metadata: Dict) -> str:
+    """
+    Deterministic Qdrant point ID for a chunk: the same chunk of the same file/page
+    always maps to the same ID, so re-uploads overwrite instead of duplicating.
+    """
+    filename = metadata.get("filename", "")
+    page = metadata.get("page", "")
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{filename}\x00{page}\x00{content_hash(document)}"))
+
+
+def metadata_filter(
+    filenames: Collection[str] = (),
+    page_from: int = 0,
+    page_to: int = 0,
+    uploaded_after: int = 0,
+    uploaded_before: int = 0,
+) -> Optional[models.Filter]:
+    """
+    Payload filter restricting a search to some documents, a page range (inclusive)
+    and/or an upload time window (unix seconds, `uploaded_before` exclusive).
+    0 / empty leaves a criterion out; returns None when nothing is restricted.
+    """
+    conditions: List[models.Condition] = []
+    if filenames:
+        conditions.append(
+            models.FieldCondition(key="filename", match=models.MatchAny(any=list(filenames)))
+        )
+    if page_from or page_to:
+        conditions.append(
+            models.FieldCondition(
+                key="page", range=models.Range(gte=page_from or None, lte=page_to or None)
+            )
+        )
+    if uploaded_after or uploaded_before:
+        conditions.append(
+            models.FieldCondition(
+                key="uploaded_at",
+                range=models.Range(gte=uploaded_after or None, lt=uploaded_before or None),
+            )
+        )
+    return models.Filter(must=conditions) if conditions else None
+
+
+def quantization_config(settings: Settings) -> Optional[models.QuantizationConfig]:
+    """The QDRANT_QUANTIZATION config for dense vectors (None = full precision only)."""
+    if settings.qdrant_quantization == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,  # clip outliers so they don't stretch the int8 range
+                always_ram=settings.qdrant_quantization_always_ram,
+            )
+        )
+    if settings.qdrant_quantization == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(
+                always_ram=settings.qdrant_quantization_always_ram
+            )
+        )
+    return None
+
+
+def hnsw_config(settings: Settings) -> Optional[models.HnswConfigDiff]:
+    """QDRANT_HNSW_M / QDRANT_HNSW_EF_CONSTRUCT overrides (None = Qdrant's defaults)."""
+    if settings.qdrant_hnsw_m is None and settings.qdrant_hnsw_ef_construct is None:
+        return None
+    return models.HnswConfigDiff(
+        m=settings.qdrant_hnsw_m, ef_construct=settings.qdrant_hnsw_ef_construct
+    )
+
+
+def search_params(settings: Settings) -> Optional[models.SearchParams]:
+    """Per-query dense search parameters (None = Qdrant's defaults)."""
+    quantization = None
+    if settings.qdrant_quantization != "none":
+        quantization = models.QuantizationSearchParams(
+            rescore=settings.qdrant_search_rescore,
+            oversampling=settings.qdrant_search_oversampling,
+        )
+    if settings.qdrant_search_hnsw_ef is None and quantization is None:
+        return None
+    return models.SearchParams(hnsw_ef=settings.qdrant_search_hnsw_ef, quantization=quantization)
+
+
+def _is_hybrid(info: models.CollectionInfo) -> bool:
+    """Whether a collection has the named dense + sparse vector layout."""
+    vectors = info.config.params.vectors
+    sparse_vectors = info.config.params.sparse_vectors or {}
+    return isinstance(vectors, dict) and DENSE_VECTOR in vectors and SPARSE_VECTOR in sparse_vectors
+
+
+def _quantization_kind(config: Optional[models.QuantizationConfig]) -> str:
+    if isinstance(config, models.ScalarQuantization):
+        return "scalar"
+    if isinstance(config, models.BinaryQuantization):
+        return "binary"
+    if isinstance(config, models.ProductQuantization):
+        return "product"
+    return "none"
 
 
 class EmbeddingService:
@@ -18,44 +153,437 @@ class EmbeddingService:
         # Initialize connection parameters from settings
         self.host = settings.qdrant_host
         self.port = settings.qdrant_port
+        self.path = settings.qdrant_path
         self.collection_name = settings.qdrant_collection
         self.vector_size = settings.embedding_vector_size
 
-        print(f"📦 [EmbeddingService] Connecting to Qdrant at {self.host}:{self.port}")
+        # "hybrid" (dense + sparse, fused with RRF) or "dense"
+        self.retrieval_mode = settings.retrieval_mode
+        self.hybrid_prefetch_limit = settings.hybrid_prefetch_limit
+
+        # Collection storage / HNSW index, and per-query search parameters
+        self.quantization = settings.qdrant_quantization
+        self.quantization_config = quantization_config(settings)
+        self.quantization_always_ram = settings.qdrant_quantization_always_ram
+        self.hnsw_config = hnsw_config(settings)
+        self.on_disk_vectors = settings.qdrant_on_disk_vectors
+        self.on_disk_payload = settings.qdrant_on_disk_payload
+        self.update_existing_collections = settings.qdrant_update_existing_collections
+        self.search_params = search_params(settings)
+
+        # Collections known to exist (name -> has named dense + sparse vectors),
+        # and when missing ones were last checked
+        self._known_collections: Dict[str, bool] = {}
+        self._missing_collections: Dict[str, float] = {}
+        self._missing_collection_ttl = settings.qdrant_missing_collection_ttl
+        self._collection_lock = asyncio.Lock()
+
+        if self.path:
+            logger.info("Using embedded Qdrant", extra={"path": self.path})
+        else:
+            logger.info("Connecting to Qdrant", extra={"host": self.host, "port": self.port})
+
+        # Load the dense embedding model
+        self.embedding_model = TextEmbedding(model_name=EMBEDDING_MODEL)
+
+        # Sparse (BM25) model for exact-term matching in hybrid mode
+        self.sparse_model: Optional[SparseTextEmbedding] = None
+        if self.retrieval_mode == "hybrid":
+            self.sparse_model = SparseTextEmbedding(model_name=settings.sparse_embedding_model)
+
+        # Memoize query embeddings so repeated questions skip the ONNX model
+        self.query_cache = QueryEmbeddingCache(settings.query_embedding_cache_size)
+
+        # Coalesce concurrent query embeddings into shared model calls
+        self.query_batcher: Optional[EmbeddingBatcher] = None
+        if settings.embedding_batching_enabled:
+            self.query_batcher = EmbeddingBatcher(
+                self._embed_queries_sync,
+                max_batch_size=settings.embedding_batch_max_size,
+                max_wait_ms=settings.embedding_batch_max_wait_ms,
+            )
+
+        # Create async client for runtime operations (connects lazily)
+        if self.path:
+            self.client = AsyncQdrantClient(path=self.path)
+        else:
+            self.client = AsyncQdrantClient(host=self.host, port=self.port)
 
-        # Load the BGE small embedding model (384 dimensions)
-        self.embedding_model = TextEmbedding(model_name="BAAI/bge-small-en-v1.5")
+    async def start(self):
+        """
+        Startup hook: make sure the default collection exists and warm up the model,
+        so the first real request doesn't pay for ONNX session initialization.
+        """
+        await self.ensure_collection(self.collection_name)
 
-        # Use synchronous client for initialization to ensure collection exists
-        sync_client = QdrantClient(host=self.host, port=self.port)
-        try:
-            self._create_collection_if_not_exists(sync_client)
-        finally:
-            sync_client.close()
+        start_time = time.perf_counter()
+        await asyncio.to_thread(self._warm_up_sync)
+        logger.info(
+            "Embedding model warmed up",
+            extra={"elapsed_ms": round((time.perf_counter() - start_time) * 1000)},
+        )
 
-        # Create async client for runtime operations
-        self.client = AsyncQdrantClient(host=self.host, port=self.port)
+    def _warm_up_sync(self):
+        """Run the query and document embedding paths once (results are discarded)."""
+        self._embed_queries_sync(["warm-up query"])
+        self._generate_embeddings_sync(["warm-up document"])
+        if self.sparse_model is not None:
+            self._embed_sparse_query_sync("warm-up query")
+            self._generate_sparse_embeddings_sync(["warm-up document"])
 
-    def _create_collection_if_not_exists(self, client: QdrantClient):
-        """Create Qdrant collection with cosine similarity if it doesn't exist."""
-        if not client.collection_exists(self.collection_name):
-            client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=models.VectorParams(
-                    size=self.vector_size,
-                    distance=models.Distance.COSINE,  # Use cosine similarity for semantic search
-                ),
+    def _dense_vector_params(self) -> models.VectorParams:
+        return models.VectorParams(
+            size=self.vector_size,
+            distance=models.Distance.COSINE,  # Use cosine similarity for semantic search
+            on_disk=self.on_disk_vectors,
+        )
+
+    async def _create_collection(self, collection_name: str) -> bool:
+        """Create a collection for the configured retrieval mode, returns whether it is hybrid."""
+        storage = {
+            "on_disk_payload": self.on_disk_payload,
+            "hnsw_config": self.hnsw_config,
+            "quantization_config": self.quantization_config,
+        }
+        if self.retrieval_mode != "hybrid":
+            await self.client.create_collection(
+                collection_name=collection_name,
+                vectors_config=self._dense_vector_params(),
+                **storage,
             )
-            print("✅ [EmbeddingService] Collection created (Startup check).")
+            return False
+
+        await self.client.create_collection(
+            collection_name=collection_name,
+            vectors_config={DENSE_VECTOR: self._dense_vector_params()},
+            # BM25 term weights need the collection-wide IDF applied at query time
+            sparse_vectors_config={
+                SPARSE_VECTOR: models.SparseVectorParams(
+                    index=models.SparseIndexParams(on_disk=self.on_disk_vectors),
+                    modifier=models.Modifier.IDF,
+                )
+            },
+            **storage,
+        )
+        return True
+
+    async def _create_payload_indexes(self, collection_name: str, existing: Collection[str] = ()):
+        """Index the PAYLOAD_INDEXES fields of a collection, except the `existing` ones."""
+        if self.path:
+            return  # embedded Qdrant has no payload indexes, it filters exhaustively
+
+        for field, schema in PAYLOAD_INDEXES.items():
+            if field not in existing:
+                await self.client.create_payload_index(
+                    collection_name=collection_name, field_name=field, field_schema=schema
+                )
+                logger.info(
+                    "Payload index created", extra={"collection": collection_name, "field": field}
+                )
+
+    async def _adopt_collection(self, collection_name: str) -> bool:
+        """
+        First use of an existing collection: add missing payload indexes (and update its
+        config if enabled). Returns whether it is hybrid.
+        """
+        info = await self.client.get_collection(collection_name)
+        await self._create_payload_indexes(collection_name, info.payload_schema or {})
+        if self.update_existing_collections:
+            await self._update_collection_config(collection_name, info)
+        return _is_hybrid(info)
+
+    async def _update_collection_config(self, collection_name: str, info: models.CollectionInfo):
+        """
+        Bring an existing collection's quantization, HNSW and on-disk settings in line with
+        the configuration. Qdrant re-indexes in the background, searches keep working.
+        """
+        config = info.config
+        changes: Dict[str, Any] = {}
+
+        current = config.quantization_config
+        kind = _quantization_kind(current)
+        if kind != self.quantization or (
+            kind != "none"
+            and bool(getattr(current, kind).always_ram) != self.quantization_always_ram
+        ):
+            changes["quantization_config"] = self.quantization_config or models.Disabled.DISABLED
+
+        if self.hnsw_config is not None and any(
+            wanted is not None and wanted != getattr(config.hnsw_config, field)
+            for field, wanted in (
+                ("m", self.hnsw_config.m),
+                ("ef_construct", self.hnsw_config.ef_construct),
+            )
+        ):
+            changes["hnsw_config"] = self.hnsw_config
+
+        if bool(config.params.on_disk_payload) != self.on_disk_payload:
+            changes["collection_params"] = models.CollectionParamsDiff(
+                on_disk_payload=self.on_disk_payload
+            )
+
+        # The unnamed vector of legacy collections is addressed as ""
+        name, dense = "", config.params.vectors
+        if isinstance(dense, dict):
+            name, dense = DENSE_VECTOR, dense.get(DENSE_VECTOR)
+        if dense is not None and bool(dense.on_disk) != self.on_disk_vectors:
+            changes["vectors_config"] = {
+                name: models.VectorParamsDiff(on_disk=self.on_disk_vectors)
+            }
+
+        if changes:
+            await self.client.update_collection(collection_name=collection_name, **changes)
+            logger.info(
+                "Collection config updated",
+                extra={"collection": collection_name, "changed": ",".join(sorted(changes))},
+            )
+
+    async def collection_exists(self, collection_name: str) -> bool:
+        """
+        Check whether a collection exists, caching the answer.
+        Existing collections are remembered for good; missing ones for a short TTL.
+        """
+        if collection_name in self._known_collections:
+            return True
+        if self._recently_missing(collection_name):
+            return False
+
+        # Adopt under the lock, so concurrent first uses don't adopt (or create) twice
+        async with self._collection_lock:
+            if collection_name in self._known_collections:
+                return True
+            if self._recently_missing(collection_name):
+                return False
+
+            if await self.client.collection_exists(collection_name):
+                self._remember_collection(
+                    collection_name, await self._adopt_collection(collection_name)
+                )
+                return True
+
+            # Bound the negative cache, unknown names come straight from requests
+            if len(self._missing_collections) >= 1024:
+                self._missing_collections.pop(next(iter(self._missing_collections)))
+            self._missing_collections[collection_name] = time.monotonic()
+            return False
+
+    def _recently_missing(self, collection_name: str) -> bool:
+        checked_at = self._missing_collections.get(collection_name)
+        return (
+            checked_at is not None and time.monotonic() - checked_at < self._missing_collection_ttl
+        )
+
+    async def ensure_collection(self, collection_name: str):
+        """Create a collection on first use (no-op for collections already known)."""
+        if collection_name in self._known_collections:
+            return
+
+        async with self._collection_lock:
+            if collection_name in self._known_collections:
+                return
+            if await self.client.collection_exists(collection_name):
+                hybrid = await self._adopt_collection(collection_name)
+            else:
+                hybrid = await self._create_collection(collection_name)
+                await self._create_payload_indexes(collection_name)
+                logger.info("Collection created", extra={"collection": collection_name})
+            self._remember_collection(collection_name, hybrid)
+
+    def _remember_collection(self, collection_name: str, hybrid: bool):
+        if not hybrid and self.retrieval_mode == "hybrid":
+            logger.warning(
+                "Collection has no sparse vectors, it will be searched dense-only "
+                "(re-index into a new collection for hybrid)",
+                extra={"collection": collection_name},
+            )
+        self._known_collections[collection_name] = hybrid
+        self._missing_collections.pop(collection_name, None)
 
     def _generate_embeddings_sync(self, documents: List[str]) -> List[List[float]]:
         """Generate embeddings synchronously using FastEmbed model."""
-        embeddings_generator = self.embedding_model.embed(documents)
-        # Convert numpy arrays to lists for JSON serialization
-        return [e.tolist() for e in embeddings_generator]
+        EMBEDDING_BATCH_SIZE.labels("document").observe(len(documents))
+        with EMBEDDING_SECONDS.labels("document").time():
+            embeddings_generator = self.embedding_model.embed(documents)
+            # Convert numpy arrays to lists for JSON serialization
+            return [e.tolist() for e in embeddings_generator]
+
+    def _embed_query_sync(self, query: str) -> np.ndarray:
+        """Generate a single query embedding synchronously as a float32 vector."""
+        return self._embed_queries_sync([query])[0]
+
+    def _embed_queries_sync(self, queries: List[str]) -> List[np.ndarray]:
+        """Generate query embeddings synchronously in a single model call."""
+        EMBEDDING_BATCH_SIZE.labels("query").observe(len(queries))
+        with EMBEDDING_SECONDS.labels("query").time():
+            return [
+                np.asarray(e, dtype=np.float32)
+                for e in self.embedding_model.embed(queries, batch_size=len(queries))
+            ]
+
+    def _generate_sparse_embeddings_sync(self, documents: List[str]) -> List[models.SparseVector]:
+        """Generate sparse (BM25) document vectors synchronously."""
+        assert self.sparse_model is not None
+        EMBEDDING_BATCH_SIZE.labels("sparse_document").observe(len(documents))
+        with EMBEDDING_SECONDS.labels("sparse_document").time():
+            return [
+                models.SparseVector(indices=e.indices.tolist(), values=e.values.tolist())
+                for e in self.sparse_model.embed(documents)
+            ]
+
+    def _embed_sparse_query_sync(self, query: str) -> models.SparseVector:
+        """Generate a sparse (BM25) query vector synchronously."""
+        assert self.sparse_model is not None
+        with EMBEDDING_SECONDS.labels("sparse_query").time():
+            e = next(iter(self.sparse_model.query_embed(query)))
+        return models.SparseVector(indices=e.indices.tolist(), values=e.values.tolist())
+
+    async def embed_query(self, query: str) -> np.ndarray:
+        """Generate (or reuse a cached) search query embedding without blocking the event loop."""
+        cached = self.query_cache.get(query)
+        if cached is not None:
+            return cached
+
+        if self.query_batcher is not None:
+            vector = await self.query_batcher.embed(query)
+        else:
+            vector = await asyncio.to_thread(self._embed_query_sync, query)
+        return self.query_cache.put(query, vector)
+
+    async def embed_documents(self, documents: List[str]) -> List[List[float]]:
+        """Generate document embeddings in a thread pool to avoid blocking the async loop."""
+        return await asyncio.to_thread(self._generate_embeddings_sync, documents)
+
+    async def upsert_documents(
+        self,
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict],
+        collection_name: Optional[str] = None,
+        uploaded_at: Optional[int] = None,
+    ) -> int:
+        """
+        Store already embedded documents in the vector store.
+        The target collection (default: the configured one) is created on first use.
+
+        Args:
+            uploaded_at: Upload time (unix seconds) stored with the points, so upload
+                time filters match them as soon as they are searchable
+
+        Returns:
+            Number of points upserted to the collection
+        """
+        collection_name = collection_name or self.collection_name
+        await self.ensure_collection(collection_name)
+
+        vectors: List[models.VectorStruct] = list(embeddings)
+        if self._known_collections[collection_name]:
+            vectors = [{DENSE_VECTOR: emb} for emb in embeddings]
+            # Runs in the upsert stage, overlapping with dense embedding of the next batch
+            if self.sparse_model is not None:
+                sparse = await asyncio.to_thread(self._generate_sparse_embeddings_sync, documents)
+                for vector, sparse_vector in zip(vectors, sparse):
+                    vector[SPARSE_VECTOR] = sparse_vector
+
+        extra_payload = {} if uploaded_at is None else {"uploaded_at": uploaded_at}
+
+        # Create point structures with content-derived IDs for Qdrant
+        points = [
+            models.PointStruct(
+                id=document_point_id(doc, meta),
+                vector=vector,
+                # Store content and metadata
+                payload={
+                    "page_content": doc,
+                    "content_hash": content_hash(doc),
+                    **meta,
+                    **extra_payload,
+                },
+            )
+            for doc, vector, meta in zip(documents, vectors, metadatas)
+        ]
+
+        # Upsert points to Qdrant (insert or update if ID exists)
+        with QDRANT_SECONDS.labels("upsert").time():
+            await self.client.upsert(collection_name=collection_name, points=points)
+        return len(points)
+
+    async def existing_point_ids(
+        self, point_ids: List[str], collection_name: Optional[str] = None
+    ) -> Set[str]:
+        """Return which of the given point IDs are already stored (one batched lookup)."""
+        collection_name = collection_name or self.collection_name
+        if not point_ids or not await self.collection_exists(collection_name):
+            return set()
+
+        with QDRANT_SECONDS.labels("retrieve").time():
+            records = await self.client.retrieve(
+                collection_name=collection_name,
+                ids=point_ids,
+                with_payload=False,
+                with_vectors=False,
+            )
+        return {str(record.id) for record in records}
+
+    async def delete_stale_points(
+        self, filename: str, keep_ids: Collection[str], collection_name: Optional[str] = None
+    ) -> int:
+        """
+        Delete the points of a file that are not part of its latest version.
+
+        Returns:
+            Number of deleted points
+        """
+        collection_name = collection_name or self.collection_name
+        if not await self.collection_exists(collection_name):
+            return 0
+
+        stale_ids: List[models.ExtendedPointId] = []
+        file_filter = metadata_filter(filenames=[filename])
+
+        offset = None
+        while True:
+            with QDRANT_SECONDS.labels("scroll").time():
+                records, offset = await self.client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=file_filter,
+                    limit=1024,
+                    offset=offset,
+                    with_payload=False,
+                    with_vectors=False,
+                )
+            stale_ids.extend(r.id for r in records if str(r.id) not in keep_ids)
+            if offset is None:
+                break
+
+        if stale_ids:
+            with QDRANT_SECONDS.labels("delete").time():
+                await self.client.delete(
+                    collection_name=collection_name,
+                    points_selector=models.PointIdsList(points=stale_ids),
+                )
+        return len(stale_ids)
+
+    async def set_upload_time(
+        self, point_ids: List[str], uploaded_at: int, collection_name: Optional[str] = None
+    ):
+        """Set the `uploaded_at` payload (unix seconds) of stored points (e.g. unchanged chunks)."""
+        collection_name = collection_name or self.collection_name
+        if not point_ids or not await self.collection_exists(collection_name):
+            return
+
+        with QDRANT_SECONDS.labels("set_payload").time():
+            await self.client.set_payload(
+                collection_name=collection_name,
+                payload={"uploaded_at": uploaded_at},
+                points=models.PointIdsList(points=point_ids),
+            )
 
     async def add_documents(
-        self, documents: List[str], metadatas: List[Dict], batch_size: int = 32
+        self,
+        documents: List[str],
+        metadatas: List[Dict],
+        batch_size: int = 32,
+        collection_name: Optional[str] = None,
     ):
         """
         Add documents to the vector store in batches.
@@ -64,6 +592,7 @@ class EmbeddingService:
             documents: List of text documents to embed and store
             metadatas: List of metadata dicts corresponding to each document
             batch_size: Number of documents to process per batch (default: 32)
+            collection_name: Target collection (default: the configured collection)
 
         Returns:
             Total number of points added to the collection
@@ -72,50 +601,104 @@ class EmbeddingService:
             return 0
 
         total_points = 0
+        uploaded_at = int(time.time())
 
         # Process documents in batches to manage memory and API limits
         for i in range(0, len(documents), batch_size):
             batch_docs = documents[i : i + batch_size]
             batch_meta = metadatas[i : i + batch_size]
 
-            # Generate embeddings in a thread pool to avoid blocking async loop
-            embeddings = await asyncio.to_thread(self._generate_embeddings_sync, batch_docs)
-
-            # Create point structures with unique IDs for Qdrant
-            points = [
-                models.PointStruct(
-                    id=uuid.uuid4().hex,  # Generate unique ID for each point
-                    vector=emb,
-                    payload={"page_content": doc, **meta},  # Store content and metadata
-                )
-                for doc, emb, meta in zip(batch_docs, embeddings, batch_meta)
-            ]
-
-            # Upsert points to Qdrant (insert or update if ID exists)
-            await self.client.upsert(collection_name=self.collection_name, points=points)
-            total_points += len(points)
+            embeddings = await self.embed_documents(batch_docs)
+            total_points += await self.upsert_documents(
+                batch_docs,
+                embeddings,
+                batch_meta,
+                collection_name=collection_name,
+                uploaded_at=uploaded_at,
+            )
 
         return total_points
 
-    async def search(self, query: str, limit: int = 3) -> List[Dict[str, Any]]:
+    async def _query_points(self, **kwargs) -> models.QueryResponse:
+        with QDRANT_SECONDS.labels("query").time():
+            return await self.client.query_points(**kwargs)
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 3,
+        query_vector: Optional[Sequence[float]] = None,
+        collection_name: Optional[str] = None,
+        query_filter: Optional[models.Filter] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Perform semantic search for similar documents.
 
         Args:
             query: Search query text
             limit: Maximum number of results to return (default: 3)
+            query_vector: Precomputed query embedding; generated from `query` when omitted
+            collection_name: Collection to search (default: the configured collection)
+            query_filter: Payload filter (see metadata_filter), applied by Qdrant while
+                searching, so `limit` matching results are returned when they exist
 
         Returns:
-            List of dicts containing content, metadata, and similarity score
+            List of dicts containing content, metadata, and relevance score
+            (empty if the collection does not exist)
         """
-        # Generate embedding for the query
-        query_embeddings = await asyncio.to_thread(self._generate_embeddings_sync, [query])
-        query_vec = query_embeddings[0]
+        collection_name = collection_name or self.collection_name
+        if not await self.collection_exists(collection_name):
+            return []
 
-        # Query Qdrant for similar vectors
-        search_result = await self.client.query_points(
-            collection_name=self.collection_name, query=query_vec, limit=limit
-        )
+        # Generate embedding for the query unless the caller already has it
+        if query_vector is None:
+            query_vector = await self.embed_query(query)
+
+        dense_query = np.asarray(query_vector, dtype=np.float32).tolist()
+
+        if not self._known_collections[collection_name]:
+            # Legacy collection with a single unnamed dense vector
+            search_result = await self._query_points(
+                collection_name=collection_name,
+                query=dense_query,
+                query_filter=query_filter,
+                search_params=self.search_params,
+                limit=limit,
+            )
+        elif self.sparse_model is None:
+            search_result = await self._query_points(
+                collection_name=collection_name,
+                query=dense_query,
+                using=DENSE_VECTOR,
+                query_filter=query_filter,
+                search_params=self.search_params,
+                limit=limit,
+            )
+        else:
+            # Both legs and the reciprocal rank fusion run in a single Qdrant round trip
+            sparse_query = await asyncio.to_thread(self._embed_sparse_query_sync, query)
+            prefetch_limit = max(limit, self.hybrid_prefetch_limit)
+            search_result = await self._query_points(
+                collection_name=collection_name,
+                prefetch=[
+                    # Each leg filters its own candidates, so fusion only sees matches
+                    models.Prefetch(
+                        query=dense_query,
+                        using=DENSE_VECTOR,
+                        filter=query_filter,
+                        params=self.search_params,
+                        limit=prefetch_limit,
+                    ),
+                    models.Prefetch(
+                        query=sparse_query,
+                        using=SPARSE_VECTOR,
+                        filter=query_filter,
+                        limit=prefetch_limit,
+                    ),
+                ],
+                query=models.FusionQuery(fusion=models.Fusion.RRF),
+                limit=limit,
+            )
 
         hits = search_result.points
 
@@ -126,11 +709,25 @@ class EmbeddingService:
                 "metadata": {k: v for k, v in hit.payload.items() if k != "page_content"}
                 if hit.payload
                 else {},
-                "score": hit.score,  # Cosine similarity score (higher = more similar)
+                # Cosine similarity (dense) or RRF score (hybrid), higher = more relevant
+                "score": hit.score,
             }
             for hit in hits
         ]
 
     async def close(self):
-        """Close the async Qdrant client connection."""
+        """Stop the embedding scheduler and close the async Qdrant client connection."""
+        if self.query_batcher is not None:
+            await self.query_batcher.close()
         await self.client.close()
+
+
+async def init_embedding_service(settings: Settings) -> AsyncIterator[EmbeddingService]:
+    """Container resource: one shared, warmed-up EmbeddingService for the process lifetime."""
+    # Loading the ONNX model is blocking, keep it off the event loop
+    service = await asyncio.to_thread(EmbeddingService, settings)
+    try:
+        await service.start()
+        yield service
+    finally:
+        await service.close()
@@ -0,0 +1,386 @@
+import asyncio
+import dataclasses
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+from app.config import Settings
+from app.telemetry import tracer
+
+from .answer_cache import SemanticAnswerCache
+from .document_parser import DocumentParser
+from .embedding_service import EmbeddingService
+from .ingestion_pipeline import IngestionPipeline, IngestionResult
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class IngestionQueueFullError(Exception):
+    """Raised when a background upload is submitted while too many jobs are pending."""
+
+
+@dataclass
+class IngestionJob:
+    """A background ingestion of one spooled upload, with its live progress."""
+
+    id: str
+    filename: str
+    collection_name: str
+    path: str  # the spooled upload, deleted once the job has finished
+    state: str = QUEUED
+    result: IngestionResult = field(default_factory=IngestionResult)
+    message: str = ""
+    attempts: int = 0  # runs started, > 1 once a restart has resumed the job
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (SUCCEEDED, FAILED)
+
+    def snapshot(self) -> "IngestionJob":
+        return dataclasses.replace(self, result=dataclasses.replace(self.result))
+
+
+class IngestionJobStore:
+    """SQLite table of jobs and their last committed progress, survives restarts."""
+
+    _COLUMNS = (
+        "id, filename, collection_name, path, state, message, attempts, created_at,"
+        " pages, chunks, embedded, upserted, skipped, deleted"
+    )
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ingestion_jobs ("
+                " id TEXT PRIMARY KEY,"
+                " filename TEXT NOT NULL,"
+                " collection_name TEXT NOT NULL,"
+                " path TEXT NOT NULL,"
+                " state TEXT NOT NULL,"
+                " message TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " pages INTEGER NOT NULL,"
+                " chunks INTEGER NOT NULL,"
+                " embedded INTEGER NOT NULL,"
+                " upserted INTEGER NOT NULL,"
+                " skipped INTEGER NOT NULL,"
+                " deleted INTEGER NOT NULL)"
+            )
+
+    @staticmethod
+    def _from_row(row) -> IngestionJob:
+        job_id, filename, collection_name, path, state, message, attempts, created_at = row[:8]
+        return IngestionJob(
+            id=job_id,
+            filename=filename,
+            collection_name=collection_name,
+            path=path,
+            state=state,
+            result=IngestionResult(*row[8:]),
+            message=message,
+            attempts=attempts,
+            created_at=created_at,
+        )
+
+    def _save_sync(self, job: IngestionJob):
+        r = job.result
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO ingestion_jobs ({self._COLUMNS}, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    job.filename,
+                    job.collection_name,
+                    job.path,
+                    job.state,
+                    job.message,
+                    job.attempts,
+                    job.created_at,
+                    r.pages,
+                    r.chunks,
+                    r.embedded,
+                    r.upserted,
+                    r.skipped,
+                    r.deleted,
+                    time.time(),
+                ),
+            )
+
+    def _get_sync(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM ingestion_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def _unfinished_sync(self) -> List[IngestionJob]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM ingestion_jobs WHERE state IN (?, ?)"
+                " ORDER BY created_at",
+                (QUEUED, RUNNING),
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def _purge_finished_sync(self, ttl_seconds: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM ingestion_jobs WHERE state IN (?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, time.time() - ttl_seconds),
+            )
+            return cursor.rowcount
+
+    async def save(self, job: IngestionJob):
+        await asyncio.to_thread(self._save_sync, job)
+
+    async def get(self, job_id: str) -> Optional[IngestionJob]:
+        return await asyncio.to_thread(self._get_sync, job_id)
+
+    async def unfinished(self) -> List[IngestionJob]:
+        """Queued and interrupted jobs, oldest first."""
+        return await asyncio.to_thread(self._unfinished_sync)
+
+    async def purge_finished(self, ttl_seconds: float) -> int:
+        """Delete finished jobs last updated more than `ttl_seconds` ago."""
+        return await asyncio.to_thread(self._purge_finished_sync, ttl_seconds)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class IngestionJobManager:
+    """
+    Ingests spooled uploads on a fixed number of background workers.
+
+    Progress is published to watchers after every page parsed and every batch embedded
+    or upserted, and committed to the job store after every upserted batch. Jobs that
+    were queued or running when the process stopped are queued again on start: their
+    already upserted chunks are found by point ID and skipped before embedding, so a
+    resumed job continues from its last committed batch.
+    """
+
+    def __init__(
+        self,
+        store: IngestionJobStore,
+        pipeline: IngestionPipeline,
+        document_parser: DocumentParser,
+        spool_dir: str,
+        workers: int = 2,
+        max_pending: int = 100,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+    ):
+        self.store = store
+        self.pipeline = pipeline
+        self.document_parser = document_parser
+        self.spool_dir = Path(spool_dir)
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.answer_cache = answer_cache
+
+        self._queue: asyncio.Queue[IngestionJob] = asyncio.Queue()
+        # Queued and running jobs; finished ones are read back from the store
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    async def start(self, ttl_seconds: float):
+        """Purge expired jobs, queue the unfinished ones again and start the workers."""
+        purged = await self.store.purge_finished(ttl_seconds)
+        for job in await self.store.unfinished():
+            if not Path(job.path).exists():
+                job.state, job.message = FAILED, "Spooled upload is missing."
+                await self.store.save(job)
+                continue
+            self._enqueue(job)
+        logger.info(
+            "Ingestion jobs started",
+            extra={"workers": self.workers, "resumed": self.pending, "purged": purged},
+        )
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        """Stop the workers, interrupted jobs stay queued in the store."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+
+    def _enqueue(self, job: IngestionJob):
+        job.state = QUEUED
+        self._jobs[job.id] = job
+        self._changed[job.id] = asyncio.Event()
+        self._queue.put_nowait(job)
+
+    def _publish(self, job: IngestionJob):
+        """Wake the job's watchers, the next change gets a fresh event."""
+        self._changed.pop(job.id).set()
+        if not job.finished:
+            self._changed[job.id] = asyncio.Event()
+
+    async def submit(
+        self, data: Union[bytes, memoryview], filename: str, collection_name: str
+    ) -> IngestionJob:
+        """
+        Spool an upload to disk and queue it for ingestion.
+
+        Raises:
+            IngestionQueueFullError: `max_pending` jobs are already queued or running
+        """
+        if self.pending >= self.max_pending:
+            raise IngestionQueueFullError(f"Too many pending ingestion jobs ({self.max_pending})")
+
+        job_id = uuid.uuid4().hex
+        job = IngestionJob(
+            id=job_id,
+            filename=filename,
+            collection_name=collection_name,
+            path=str(self.spool_dir / f"{job_id}{Path(filename).suffix.lower()}"),
+        )
+        await asyncio.to_thread(Path(job.path).write_bytes, data)
+        await self.store.save(job)
+        self._enqueue(job)
+
+        logger.info("Ingestion job queued", extra={"job_id": job_id, "document": filename})
+        return job
+
+    async def get(self, job_id: str) -> Optional[IngestionJob]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.snapshot()
+        return await self.store.get(job_id)
+
+    async def watch(self, job_id: str) -> AsyncIterator[IngestionJob]:
+        """
+        Yield the job's state now and after every change, until it has finished.
+        Unknown job IDs yield nothing.
+        """
+        while True:
+            job = self._jobs.get(job_id)
+            if job is None:
+                stored = await self.store.get(job_id)
+                if stored is not None:
+                    yield stored
+                return
+
+            changed = self._changed[job_id]
+            yield job.snapshot()
+            if job.finished:
+                return
+            await changed.wait()
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            await self._run(job)
+
+    async def _run(self, job: IngestionJob):
+        job.state = RUNNING
+        job.attempts += 1
+        job.result = IngestionResult()
+        await self.store.save(job)
+        self._publish(job)
+        committed = 0
+
+        async def on_progress(result: IngestionResult):
+            nonlocal committed
+            job.result = result
+            self._publish(job)
+            if result.upserted != committed:
+                committed = result.upserted
+                await self.store.save(job)
+
+        try:
+            with tracer.start_as_current_span(
+                "ingestion.job",
+                attributes={"rag.collection": job.collection_name, "rag.attempt": job.attempts},
+            ) as span:
+                result = await self.pipeline.run(
+                    self.document_parser.iter_chunks(job.path, job.filename),
+                    collection_name=job.collection_name,
+                    on_progress=on_progress,
+                    filename=job.filename,
+                )
+                span.set_attribute("rag.chunks", result.chunks)
+            job.result = result
+            job.state = SUCCEEDED
+            job.message = (
+                f"Successfully processed and indexed {result.chunks} chunks "
+                f"({result.upserted} new, {result.skipped} unchanged, {result.deleted} removed)."
+            )
+            if result.chunks == 0:
+                job.message = "No text extracted from the document."
+        except asyncio.CancelledError:
+            # Shutting down, the job resumes on the next start
+            raise
+        except Exception as e:
+            logger.exception("Ingestion job failed", extra={"job_id": job.id})
+            job.state, job.message = FAILED, str(e)
+
+        # Cached answers may no longer reflect the collection's contents
+        if self.answer_cache is not None:
+            self.answer_cache.invalidate(job.collection_name)
+        await asyncio.to_thread(Path(job.path).unlink, missing_ok=True)
+        await self.store.save(job)
+        del self._jobs[job.id]
+        self._publish(job)
+
+        logger.info(
+            "Ingestion job finished",
+            extra={"job_id": job.id, "state": job.state, "chunks": job.result.chunks},
+        )
+
+
+async def init_ingestion_jobs(
+    settings: Settings,
+    embedding_service: EmbeddingService,
+    document_parser: DocumentParser,
+    answer_cache: Optional[SemanticAnswerCache],
+) -> AsyncIterator[Optional[IngestionJobManager]]:
+    """Container resource: the background ingestion workers (None when disabled)."""
+    if settings.ingestion_job_workers <= 0:
+        yield None
+        return
+
+    Path(settings.ingestion_job_dir).mkdir(parents=True, exist_ok=True)
+    manager = IngestionJobManager(
+        store=IngestionJobStore(str(Path(settings.ingestion_job_dir) / "jobs.db")),
+        pipeline=IngestionPipeline(
+            embedding_service,
+            batch_size=settings.ingestion_batch_size,
+            queue_size=settings.ingestion_queue_size,
+        ),
+        document_parser=document_parser,
+        spool_dir=settings.ingestion_job_dir,
+        workers=settings.ingestion_job_workers,
+        max_pending=settings.ingestion_job_max_pending,
+        answer_cache=answer_cache,
+    )
+    await manager.start(settings.ingestion_job_ttl_seconds)
+    try:
+        yield manager
+    finally:
+        await manager.close()
@@ -0,0 +1,360 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .embedding_service import document_point_id
+
+if TYPE_CHECKING:
+    from .embedding_service import EmbeddingService
+
+# A group of text chunks with their metadata (e.g. all chunks of one page)
+ChunkBatch = Tuple[List[str], List[Dict]]
+ProgressCallback = Callable[["IngestionResult"], Awaitable[None]]
+# A document of a bulk ingestion: its filename, and a function that starts parsing it
+DocumentTask = Tuple[str, Callable[[], AsyncIterator[ChunkBatch]]]
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+async def iterate_in_thread(
+    factory: Callable[..., Iterator[ChunkBatch]], *args, maxsize: int = 4
+) -> AsyncIterator[ChunkBatch]:
+    """
+    Drive a blocking generator on a worker thread and expose it as an async iterator.
+    The bounded queue applies backpressure: the thread stops producing while the
+    consumer is `maxsize` items behind.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # Blocks the worker thread until the event loop has accepted the item
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while not stop.is_set():
+            try:
+                future.result(timeout=0.1)
+                return True
+            except TimeoutError:
+                continue
+        future.cancel()
+        return False
+
+    def produce():
+        try:
+            for item in factory(*args):
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        await producer
+
+
+@dataclass
+class IngestionResult:
+    pages: int = 0  # pages (text files: documents) the parser produced chunks for
+    chunks: int = 0  # chunks produced by the parser
+    embedded: int = 0  # chunks embedded in this run
+    upserted: int = 0  # new or changed chunks that were embedded and stored
+    skipped: int = 0  # unchanged chunks already present in the collection
+    deleted: int = 0  # stale points of re-uploaded files that were removed
+    failed: Dict[str, str] = field(default_factory=dict)  # run_many(): filename -> error
+
+    @property
+    def changed(self) -> bool:
+        return self.upserted > 0 or self.deleted > 0
+
+
+class IngestionPipeline:
+    """
+    Streaming parse -> embed -> upsert pipeline connected by bounded queues.
+
+    Chunks are regrouped into fixed-size embedding batches as they arrive, so a page
+    can be embedded while the document is still being parsed and earlier batches
+    are still being upserted to Qdrant.
+
+    Point IDs are derived from filename, page and chunk content: chunks that already
+    exist are skipped before embedding (and re-dated with the upload time new chunks
+    are stored with), and once a file has been fully ingested its points that no
+    longer exist in the new version are deleted.
+    """
+
+    def __init__(
+        self, embedding_service: "EmbeddingService", batch_size: int = 32, queue_size: int = 4
+    ):
+        self.embedding_service = embedding_service
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+
+    @staticmethod
+    async def _report(result: IngestionResult, on_progress: Optional[ProgressCallback]):
+        if on_progress is not None:
+            await on_progress(result)
+
+    async def _batch(
+        self,
+        source: AsyncIterator[ChunkBatch],
+        embed_queue: asyncio.Queue,
+        result: IngestionResult,
+        on_progress: Optional[ProgressCallback],
+    ):
+        texts: List[str] = []
+        metas: List[Dict] = []
+
+        async for chunk_texts, chunk_metas in source:
+            result.pages += 1
+            result.chunks += len(chunk_texts)
+            await self._report(result, on_progress)
+            texts.extend(chunk_texts)
+            metas.extend(chunk_metas)
+            while len(texts) >= self.batch_size:
+                await embed_queue.put((texts[: self.batch_size], metas[: self.batch_size]))
+                texts, metas = texts[self.batch_size :], metas[self.batch_size :]
+
+        if texts:
+            await embed_queue.put((texts, metas))
+        await embed_queue.put(_DONE)
+
+    async def _filter_new(
+        self,
+        texts: List[str],
+        metas: List[Dict],
+        seen_ids: Dict[str, Set[str]],
+        result: IngestionResult,
+        collection_name: Optional[str],
+        uploaded_at: int,
+    ) -> Tuple[List[str], List[Dict]]:
+        """Drop chunks that are repeated in this run or already stored unchanged."""
+        candidates = []
+        for text, meta in zip(texts, metas):
+            point_id = document_point_id(text, meta)
+            file_ids = seen_ids.setdefault(meta.get("filename", ""), set())
+            if point_id in file_ids:
+                result.skipped += 1
+                continue
+            file_ids.add(point_id)
+            candidates.append((point_id, text, meta))
+
+        existing = await self.embedding_service.existing_point_ids(
+            [c[0] for c in candidates], collection_name=collection_name
+        )
+        result.skipped += len(existing)
+        # Unchanged chunks belong to this upload too, date them along with the new ones
+        await self.embedding_service.set_upload_time(
+            list(existing), uploaded_at, collection_name=collection_name
+        )
+
+        new = [(text, meta) for point_id, text, meta in candidates if point_id not in existing]
+        return [text for text, _ in new], [meta for _, meta in new]
+
+    async def _embed(
+        self,
+        embed_queue: asyncio.Queue,
+        upsert_queue: asyncio.Queue,
+        seen_ids: Dict[str, Set[str]],
+        result: IngestionResult,
+        collection_name: Optional[str],
+        uploaded_at: int,
+        on_progress: Optional[ProgressCallback],
+    ):
+        while (item := await embed_queue.get()) is not _DONE:
+            texts, metas = await self._filter_new(
+                *item, seen_ids, result, collection_name, uploaded_at
+            )
+            if not texts:
+                continue
+            embeddings = await self.embedding_service.embed_documents(texts)
+            result.embedded += len(texts)
+            await self._report(result, on_progress)
+            await upsert_queue.put((texts, embeddings, metas))
+        await upsert_queue.put(_DONE)
+
+    async def _upsert(
+        self,
+        upsert_queue: asyncio.Queue,
+        result: IngestionResult,
+        collection_name: Optional[str],
+        uploaded_at: int,
+        on_progress: Optional[ProgressCallback],
+    ):
+        while (item := await upsert_queue.get()) is not _DONE:
+            texts, embeddings, metas = item
+            result.upserted += await self.embedding_service.upsert_documents(
+                texts, embeddings, metas, collection_name=collection_name, uploaded_at=uploaded_at
+            )
+            await self._report(result, on_progress)
+
+    async def run(
+        self,
+        source: AsyncIterator[ChunkBatch],
+        collection_name: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        filename: Optional[str] = None,
+    ) -> IngestionResult:
+        """
+        Consume chunk batches from `source` until exhausted.
+
+        Args:
+            source: Per-page chunk batches (see DocumentParser.iter_chunks)
+            collection_name: Target collection (default: the embedding service's collection)
+            on_progress: Awaited with the running counts after every page parsed and
+                every batch embedded or upserted
+            filename: The document's filename, so its previous points are pruned even
+                when the new version yields no chunks
+
+        Returns:
+            Counts of parsed, upserted, skipped (unchanged) and deleted (stale) chunks
+        """
+        seen_ids: Dict[str, Set[str]] = {filename: set()} if filename else {}
+        return await self._run(source, IngestionResult(), seen_ids, collection_name, on_progress)
+
+    async def run_many(
+        self,
+        documents: AsyncIterator[DocumentTask],
+        concurrency: int = 4,
+        collection_name: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> IngestionResult:
+        """
+        Ingest many documents in one run. Up to `concurrency` documents are parsed at a
+        time and their chunks are packed into shared embedding batches, so only the
+        run's last batch is partial.
+
+        A document that fails to parse is recorded in the result's `failed` and the
+        others carry on. Its chunks parsed so far are kept, but its points from a
+        previous upload are not pruned.
+
+        Args:
+            documents: (filename, start parsing) pairs, pulled as parsers become free
+            concurrency: Documents parsed at the same time
+            collection_name: Target collection (default: the embedding service's collection)
+            on_progress: See run()
+
+        Returns:
+            Counts over all documents, and the errors of those that failed
+        """
+        result = IngestionResult()
+        seen_ids: Dict[str, Set[str]] = {}
+        source = self._interleave(documents, max(1, concurrency), result, seen_ids)
+        return await self._run(source, result, seen_ids, collection_name, on_progress)
+
+    async def _interleave(
+        self,
+        documents: AsyncIterator[DocumentTask],
+        concurrency: int,
+        result: IngestionResult,
+        seen_ids: Dict[str, Set[str]],
+    ) -> AsyncIterator[ChunkBatch]:
+        """
+        Parse documents on `concurrency` tasks, yielding their page batches as they come.
+        Every document is registered in `seen_ids`, so one without chunks is pruned too.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        lock = asyncio.Lock()
+
+        async def parse_documents():
+            while True:
+                async with lock:
+                    try:
+                        filename, parse = await anext(documents)
+                    except StopAsyncIteration:
+                        return
+                seen_ids.setdefault(filename, set())
+                try:
+                    async for batch in parse():
+                        await queue.put(batch)
+                except Exception as e:
+                    logger.warning(
+                        "Skipping document", extra={"document": filename, "error": str(e)}
+                    )
+                    result.failed[filename] = str(e)
+
+        async def produce():
+            try:
+                await asyncio.gather(*(parse_documents() for _ in range(concurrency)))
+                await queue.put(_DONE)
+            except Exception as e:
+                await queue.put(e)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (item := await queue.get()) is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _run(
+        self,
+        source: AsyncIterator[ChunkBatch],
+        result: IngestionResult,
+        seen_ids: Dict[str, Set[str]],
+        collection_name: Optional[str],
+        on_progress: Optional[ProgressCallback],
+    ) -> IngestionResult:
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        uploaded_at = int(time.time())
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._batch(source, embed_queue, result, on_progress))
+                tg.create_task(
+                    self._embed(
+                        embed_queue,
+                        upsert_queue,
+                        seen_ids,
+                        result,
+                        collection_name,
+                        uploaded_at,
+                        on_progress,
+                    )
+                )
+                tg.create_task(
+                    self._upsert(upsert_queue, result, collection_name, uploaded_at, on_progress)
+                )
+        except ExceptionGroup as eg:
+            # Surface the original stage error rather than the group wrapper
+            raise eg.exceptions[0]
+
+        # Only prune once every chunk of the new version is known to be stored (a version
+        # without chunks keeps no points)
+        for filename, keep_ids in seen_ids.items():
+            if filename in result.failed:
+                continue
+            result.deleted += await self.embedding_service.delete_stale_points(
+                filename, keep_ids, collection_name=collection_name
+            )
+
+        return result
@@ -1,20 +1,42 @@
-import asyncio
+import functools
+import logging
 import re
-import tempfile
 import time
 from pathlib import Path
-from typing import AsyncGenerator, Dict, List, Tuple
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Set, Union
 
-import fitz
 import grpc
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import numpy as np
+from opentelemetry import trace
 from pb import rag_service_pb2 as rs
 from pb import rag_service_pb2_grpc as rs_grpc
+from qdrant_client import models
 
 from app.config import Settings
 from app.services import EmbeddingService
-
-from ..llm import LLMProvider
+from app.telemetry import (
+    LLM_TOKENS_PER_SECOND,
+    LLM_TTFT_SECONDS,
+    UPLOAD_BYTES,
+    UPLOAD_BYTES_PER_SECOND,
+    tracer,
+)
+
+from ..llm import ERROR_PREFIX, LLMProvider, ProviderOverloadedError
+from .answer_cache import CachedAnswer, SemanticAnswerCache
+from .context_packer import ContextPacker
+from .document_parser import SUPPORTED_EXTENSIONS, DocumentParser
+from .embedding_cache import QueryEmbeddingCache
+from .embedding_service import metadata_filter
+from .ingestion_jobs import IngestionJob, IngestionJobManager, IngestionQueueFullError
+from .ingestion_pipeline import ChunkBatch, DocumentTask, IngestionPipeline
+from .reranker import CrossEncoderReranker
+from .session_store import ChatTurn, SessionStore, estimate_tokens, trim_history
+from .single_flight import SingleFlight
+from .stream_coalescer import StreamCoalescer
+from .upload_buffer import UploadBuffer
+
+logger = logging.getLogger(__name__)
 
 
 class RagService(rs_grpc.RagServiceServicer):
@@ -23,16 +45,50 @@ class RagService(rs_grpc.RagServiceServicer):
         settings: Settings,
         llm_provider: LLMProvider,
         embedding_service: EmbeddingService,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        context_packer: Optional[ContextPacker] = None,
+        document_parser: Optional[DocumentParser] = None,
+        reranker: Optional[CrossEncoderReranker] = None,
+        session_store: Optional[SessionStore] = None,
+        single_flight: Optional[SingleFlight] = None,
+        ingestion_jobs: Optional[IngestionJobManager] = None,
     ):
         self.llm: LLMProvider = llm_provider
         self.embedding_service: EmbeddingService = embedding_service
+        self.answer_cache: Optional[SemanticAnswerCache] = answer_cache
+        self.context_packer: Optional[ContextPacker] = context_packer
+        self.reranker: Optional[CrossEncoderReranker] = reranker
+        self.reranker_candidates = settings.reranker_candidates
+        self.session_store: Optional[SessionStore] = session_store
+        self.single_flight: Optional[SingleFlight] = single_flight
+        # Merge token-sized chunks into fewer ChatResponse messages (0 ms disables it)
+        self.stream_coalescer: Optional[StreamCoalescer] = None
+        if settings.stream_flush_interval_ms > 0:
+            self.stream_coalescer = StreamCoalescer(
+                max_chars=settings.stream_flush_max_chars,
+                flush_interval_ms=settings.stream_flush_interval_ms,
+            )
+        self.history_token_budget = settings.session_history_token_budget
+        self.max_turn_chars = settings.session_max_turn_chars
+        self.collection_name = settings.qdrant_collection
+        self.default_max_results = settings.default_max_results
+        self.max_results_limit = settings.max_results_limit
         self.max_file_size = settings.maximum_file_size
-        self.allowed_file_types = {".pdf", ".txt", ".md"}
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        self.upload_memory_limit = settings.upload_memory_limit
+        self.upload_flush_size = settings.upload_flush_size
+        self.allowed_file_types = set(SUPPORTED_EXTENSIONS)
+        # Without a shared (process pool) parser, parse on a worker thread
+        self.document_parser: DocumentParser = document_parser or DocumentParser(
             chunk_size=settings.embedding_chunk_size,
             chunk_overlap=settings.embedding_chunk_overlap,
-            separators=["\n\n", "\n", " ", ""],
         )
+        self.ingestion_pipeline = IngestionPipeline(
+            embedding_service,
+            batch_size=settings.ingestion_batch_size,
+            queue_size=settings.ingestion_queue_size,
+        )
+        self.parse_concurrency = settings.ingestion_parse_concurrency
+        self.ingestion_jobs: Optional[IngestionJobManager] = ingestion_jobs
 
     def _validate_filename(self, filename: str) -> tuple[bool, str]:
         file_ext = Path(filename).suffix.lower()
@@ -47,46 +103,38 @@ class RagService(rs_grpc.RagServiceServicer):
 
         return True, ""
 
-    def _parse_document_sync(self, file_path: str, filename: str) -> Tuple[List[str], List[Dict]]:
-        """
-        🛑 THIS METHOD CONTAINS CPU-INTENSIVE OPERATIONS (Runs synchronously).
-        This method should be called within 'asyncio.to_thread'.
-        """
-        print(f"[Worker Thread] Parsing file: {filename} from {file_path}")
-        text_chunks = []
-        metadatas = []
+    def _validate_collection_name(self, collection_name: str) -> tuple[bool, str]:
+        # Empty means the default collection
+        if collection_name and not re.match(r"^[A-Za-z0-9_\-]{1,64}$", collection_name):
+            return False, f"Invalid collection name: {collection_name!r}"
 
-        try:
-            # A) PDF Processing
-            if filename.lower().endswith(".pdf"):
-                with fitz.open(file_path) as doc:
-                    for i in range(len(doc)):
-                        page = doc[i]
-                        text = page.get_text()
-
-                        if isinstance(text, str) and text.strip():
-                            page_chunks = self.text_splitter.split_text(text)
-                            for chunk in page_chunks:
-                                text_chunks.append(chunk)
-                                metadatas.append({"filename": filename, "page": i + 1})
-
-                print(f"[Worker Thread] Extracted {len(text_chunks)} chunks from PDF.")
-
-            # B) Text/MD Processing
-            else:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    text = f.read()
-                file_chunks = self.text_splitter.split_text(text)
-                for chunk in file_chunks:
-                    text_chunks.append(chunk)
-                    metadatas.append({"filename": filename, "page": 1})
-                print("[Worker Thread] Extracted chunks from text file.")
+        return True, ""
 
-            return text_chunks, metadatas
+    def _validate_filter(self, search_filter: rs.SearchFilter) -> tuple[bool, str]:
+        if len(search_filter.filenames) > 100:
+            return False, "Too many filenames in filter (max 100)"
+        for filename in search_filter.filenames:
+            if not re.match(r"^[\w\-. ]+$", filename):
+                return False, f"Invalid filename in filter: {filename!r}"
+
+        f = search_filter
+        if min(f.page_from, f.page_to, f.uploaded_after, f.uploaded_before) < 0:
+            return False, "Filter pages and upload times must be >= 0"
+        if f.page_from and f.page_to and f.page_from > f.page_to:
+            return False, "Filter page_from must be <= page_to"
+        if f.uploaded_after and f.uploaded_before and f.uploaded_after >= f.uploaded_before:
+            return False, "Filter uploaded_after must be < uploaded_before"
 
-        except Exception as e:
-            print(f"❌ Parsing Error: {e}")
-            raise e
+        return True, ""
+
+    def _resolve_max_results(self, max_results: int) -> tuple[bool, int]:
+        # proto3 can't tell unset from 0, so 0 falls back to the default
+        if max_results < 0:
+            return False, 0
+        if max_results == 0:
+            return True, self.default_max_results
+
+        return True, min(max_results, self.max_results_limit)
 
     async def UploadDocument(
         self,
@@ -94,132 +142,577 @@ class RagService(rs_grpc.RagServiceServicer):
         context: grpc.aio.ServicerContext,
     ) -> rs.UploadResponse:
         filename = "unknown"
+        collection_name = self.collection_name
+        background = False
         current_size = 0
-        temp_file = None
-        temp_file_path = None
+        buffer = UploadBuffer(self.upload_memory_limit, self.upload_flush_size)
+        ingestion_changed = False
+        start_time = time.perf_counter()
 
-        print("[RagService] UploadDocument stream started...")
+        logger.info("UploadDocument stream started")
 
         try:
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".tmp")
-            temp_file_path = temp_file.name
-
-            # 1. Stream Loop (Non-blocking I/O) - Write to temp file
-            async for request in request_iterator:
-                # Is Metadata present?
-                if request.HasField("metadata"):
-                    filename = request.metadata.filename
-                    # Validation
-                    is_valid, err_msg = self._validate_filename(filename)
-                    if not is_valid:
-                        return rs.UploadResponse(status="error", message=err_msg)
-
-                # Is Chunk present?
-                elif request.HasField("chunk"):
-                    chunk_len = len(request.chunk)
-
-                    if current_size + chunk_len > self.max_file_size:
-                        msg = f"Limit exceeded ({self.max_file_size} bytes)."
-                        return rs.UploadResponse(status="error", message=msg)
-
-                    # Write chunk to temp file asynchronously
-                    await asyncio.to_thread(temp_file.write, request.chunk)
-                    current_size += chunk_len
-
-            # Close the temp file
-            temp_file.close()
+            # 1. Stream Loop - buffer in memory, or spill to disk past the memory limit
+            with tracer.start_as_current_span("upload.receive"):
+                async for request in request_iterator:
+                    # Is Metadata present?
+                    if request.HasField("metadata"):
+                        filename = request.metadata.filename
+                        # Validation
+                        is_valid, err_msg = self._validate_filename(filename)
+                        if not is_valid:
+                            return rs.UploadResponse(status="error", message=err_msg)
+
+                        is_valid, err_msg = self._validate_collection_name(
+                            request.metadata.collection_name
+                        )
+                        if not is_valid:
+                            return rs.UploadResponse(status="error", message=err_msg)
+                        collection_name = request.metadata.collection_name or self.collection_name
+                        background = request.metadata.background
+
+                    # Is Chunk present?
+                    elif request.HasField("chunk"):
+                        chunk_len = len(request.chunk)
+
+                        if current_size + chunk_len > self.max_file_size:
+                            msg = f"Limit exceeded ({self.max_file_size} bytes)."
+                            return rs.UploadResponse(status="error", message=msg)
+
+                        await buffer.write(request.chunk)
+                        current_size += chunk_len
+                        UPLOAD_BYTES.inc(chunk_len)
 
             if current_size == 0:
                 return rs.UploadResponse(status="warning", message="Received empty file.")
 
-            # 3. Send CPU-Intensive Task to Thread (Parsing from temp file)
-            text_chunks, metadatas = await asyncio.to_thread(
-                self._parse_document_sync, temp_file_path, filename
-            )
+            # Without job workers, background uploads are ingested right away
+            if background and self.ingestion_jobs is not None:
+                try:
+                    job = await self.ingestion_jobs.submit(
+                        await buffer.getbuffer(), filename, collection_name
+                    )
+                except IngestionQueueFullError as e:
+                    return rs.UploadResponse(status="error", message=str(e))
+                return rs.UploadResponse(
+                    status="queued",
+                    job_id=job.id,
+                    message="File received, ingesting it in the background.",
+                )
+
+            # 2. Pipeline: parse pages (thread or process pool) while earlier batches
+            # are embedded and upserted (bounded queues keep memory flat)
+            ingestion_changed = True  # a failed run may still have written some batches
+            with tracer.start_as_current_span(
+                "upload.ingest",
+                attributes={"rag.collection": collection_name, "rag.spilled": bool(buffer.path)},
+            ) as span:
+                result = await self.ingestion_pipeline.run(
+                    self.document_parser.iter_chunks(
+                        await buffer.getbuffer(), filename, path=buffer.path
+                    ),
+                    collection_name=collection_name,
+                    filename=filename,
+                )
+                span.set_attribute("rag.chunks", result.chunks)
+            ingestion_changed = result.changed
+            UPLOAD_BYTES_PER_SECOND.observe(current_size / (time.perf_counter() - start_time))
 
-            if not text_chunks:
+            if result.chunks == 0:
                 return rs.UploadResponse(
                     status="warning",
                     chunks_count=0,
                     message="No text extracted from the document.",
                 )
 
-            # 4. Send to Embedding Service (Async IO)
-            count = await self.embedding_service.add_documents(
-                documents=text_chunks, metadatas=metadatas
-            )
-
             return rs.UploadResponse(
                 status="success",
-                chunks_count=count,
-                message=f"Successfully processed and indexed {count} chunks.",
+                chunks_count=result.chunks,
+                message=(
+                    f"Successfully processed and indexed {result.chunks} chunks "
+                    f"({result.upserted} new, {result.skipped} unchanged, "
+                    f"{result.deleted} removed)."
+                ),
             )
 
         except Exception as e:
-            print(f"❌ Upload Error: {e}")
+            logger.exception("Upload failed", extra={"document": filename})
             return rs.UploadResponse(status="error", chunks_count=0, message=str(e))
 
         finally:
-            # Cleanup: Close and delete temp file
-            if temp_file and not temp_file.closed:
-                temp_file.close()
-            if temp_file_path and Path(temp_file_path).exists():
-                await asyncio.to_thread(Path(temp_file_path).unlink)
-                print(f"[RagService] Cleaned up temp file: {temp_file_path}")
+            # Cached answers may no longer reflect the collection's contents
+            if ingestion_changed and self.answer_cache is not None:
+                self.answer_cache.invalidate(collection_name)
 
-    async def Chat(
-        self, request: rs.ChatRequest, context: grpc.aio.ServicerContext
-    ) -> AsyncGenerator[rs.ChatResponse, None]:
-        start_time = time.time()
-        print(f"[RagService] Question received: {request.query} | Session ID: {request.session_id}")
+            # Free the buffer (and delete its spill file, if any)
+            buffer.close()
+
+    async def _parse_upload(self, buffer: UploadBuffer, filename: str) -> AsyncIterator[ChunkBatch]:
+        """Parse a received file, then free its buffer."""
+        try:
+            async for batch in self.document_parser.iter_chunks(
+                await buffer.getbuffer(), filename, path=buffer.path
+            ):
+                yield batch
+        finally:
+            buffer.close()
+
+    async def BulkUploadDocuments(
+        self,
+        request_iterator: AsyncGenerator[rs.UploadRequest, None],
+        context: grpc.aio.ServicerContext,
+    ) -> rs.BulkUploadResponse:
+        start_time = time.perf_counter()
+        requests = aiter(request_iterator)
+        errors: Dict[str, str] = {}  # rejected or unparseable files
+        buffers: List[UploadBuffer] = []
+        accepted = 0
+        ingestion_changed = False
+
+        logger.info("BulkUploadDocuments stream started")
+
+        first = await anext(requests, None)
+        if first is None or not first.HasField("metadata"):
+            return rs.BulkUploadResponse(status="error", message="Expected file metadata first.")
+        is_valid, err_msg = self._validate_collection_name(first.metadata.collection_name)
+        if not is_valid:
+            return rs.BulkUploadResponse(status="error", message=err_msg)
+        collection_name = first.metadata.collection_name or self.collection_name
+
+        async def received_documents() -> AsyncIterator[DocumentTask]:
+            """
+            Receive the next file whenever a parser is free: the stream is read no faster
+            than files are parsed, so at most `parse_concurrency` + 1 files are buffered.
+            """
+            nonlocal accepted
+            filenames: Set[str] = set()
+            request: Optional[rs.UploadRequest] = first
+            while request is not None:
+                metadata = request.metadata
+                filename = metadata.filename
+                is_valid, error = self._validate_filename(filename)
+                if is_valid and filename in filenames:
+                    error = "Duplicate filename"
+                if is_valid and metadata.collection_name not in (
+                    "",
+                    first.metadata.collection_name,
+                ):
+                    error = "All files must target the first file's collection"
+
+                buffer: Optional[UploadBuffer] = None
+                if not error:
+                    buffer = UploadBuffer(self.upload_memory_limit, self.upload_flush_size)
+                    buffers.append(buffer)
+
+                # The file's chunks, up to the next file's metadata
+                size = 0
+                while (request := await anext(requests, None)) is not None:
+                    if request.HasField("metadata"):
+                        break
+                    size += len(request.chunk)
+                    if buffer is not None and size > self.max_file_size:
+                        error = f"Limit exceeded ({self.max_file_size} bytes)."
+                        buffer.close()
+                        buffer = None
+                    if buffer is not None:
+                        await buffer.write(request.chunk)
+                        UPLOAD_BYTES.inc(len(request.chunk))
+
+                if buffer is not None and size == 0:
+                    error = "Received empty file."
+                if error:
+                    errors[filename] = error
+                    continue
+
+                filenames.add(filename)
+                accepted += 1
+                yield filename, functools.partial(self._parse_upload, buffer, filename)
 
         try:
-            search_results = await self.embedding_service.search(request.query, limit=3)
+            # Files are parsed while later ones are still being received, and their
+            # chunks are packed into shared embedding batches
+            ingestion_changed = True  # a failed run may still have written some batches
+            with tracer.start_as_current_span(
+                "bulk_upload.ingest", attributes={"rag.collection": collection_name}
+            ) as span:
+                result = await self.ingestion_pipeline.run_many(
+                    received_documents(),
+                    concurrency=self.parse_concurrency,
+                    collection_name=collection_name,
+                )
+                span.set_attribute("rag.chunks", result.chunks)
+            ingestion_changed = result.changed
+
+        except Exception as e:
+            logger.exception("Bulk upload failed")
+            return rs.BulkUploadResponse(status="error", message=str(e))
+
+        finally:
+            # Cached answers may no longer reflect the collection's contents
+            if ingestion_changed and self.answer_cache is not None:
+                self.answer_cache.invalidate(collection_name)
+
+            for buffer in buffers:
+                buffer.close()
+
+        errors.update(result.failed)
+        files = accepted - len(result.failed)
+        elapsed = time.perf_counter() - start_time
+        pages_per_second = result.pages / elapsed
+        chunks_per_second = result.chunks / elapsed
+        logger.info(
+            "Bulk upload finished",
+            extra={
+                "files": files,
+                "failed": len(errors),
+                "chunks": result.chunks,
+                "pages_per_second": round(pages_per_second, 1),
+                "chunks_per_second": round(chunks_per_second, 1),
+            },
+        )
+
+        return rs.BulkUploadResponse(
+            status="success" if not errors else "partial" if files else "error",
+            files_count=files,
+            pages_count=result.pages,
+            chunks_count=result.chunks,
+            points_upserted=result.upserted,
+            chunks_skipped=result.skipped,
+            points_deleted=result.deleted,
+            pages_per_second=pages_per_second,
+            chunks_per_second=chunks_per_second,
+            errors=[rs.FileError(filename=f, message=m) for f, m in errors.items()],
+            message=(
+                f"Indexed {result.chunks} chunks from {files} files "
+                f"({pages_per_second:.1f} pages/s, {chunks_per_second:.1f} chunks/s), "
+                f"{len(errors)} files failed."
+            ),
+        )
+
+    def _job_status(self, job: IngestionJob) -> rs.IngestionJobStatus:
+        return rs.IngestionJobStatus(
+            job_id=job.id,
+            state=job.state,
+            filename=job.filename,
+            collection_name=job.collection_name,
+            pages_parsed=job.result.pages,
+            chunks_count=job.result.chunks,
+            chunks_embedded=job.result.embedded,
+            points_upserted=job.result.upserted,
+            chunks_skipped=job.result.skipped,
+            points_deleted=job.result.deleted,
+            attempts=job.attempts,
+            message=job.message,
+        )
+
+    async def WatchIngestionJob(
+        self, request: rs.IngestionJobRequest, context: grpc.aio.ServicerContext
+    ) -> AsyncGenerator[rs.IngestionJobStatus, None]:
+        if self.ingestion_jobs is None:
+            await context.abort(
+                grpc.StatusCode.FAILED_PRECONDITION, "Background ingestion is disabled"
+            )
+        if not re.match(r"^[0-9a-f]{32}$", request.job_id):
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Invalid job ID")
+
+        found = False
+        async for job in self.ingestion_jobs.watch(request.job_id):
+            found = True
+            yield self._job_status(job)
+
+        if not found:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown job: {request.job_id}")
+
+    def _build_sources(self, search_results: List[Dict[str, Any]]) -> List[rs.Source]:
+        source_documents = []
+        for hit in search_results:
+            meta = hit["metadata"]
+
+            doc = rs.Source(
+                filename=meta.get("filename", "Unknown file"),
+                page_number=int(meta.get("page", 1)),
+                # Truncate snippet to first 100 characters for brevity
+                snippet=hit["content"][:100].replace("\n", " ") + "...",
+                score=hit["score"],
+            )
+            source_documents.append(doc)
+
+        return source_documents
+
+    async def _load_history(self, session_id: str) -> List[Dict[str, str]]:
+        if self.session_store is None or not session_id:
+            return []
+        turns = await self.session_store.get_history(session_id)
+        count_tokens = self.context_packer.count_tokens if self.context_packer else None
+        return trim_history(turns, self.history_token_budget, count_tokens)
+
+    async def _remember_exchange(self, session_id: str, query: str, answer: str):
+        if self.session_store is None or not session_id:
+            return
+        await self.session_store.append(
+            session_id,
+            [
+                ChatTurn.create("user", query, self.max_turn_chars),
+                ChatTurn.create("assistant", answer, self.max_turn_chars),
+            ],
+        )
+
+    async def _answer(
+        self,
+        query: str,
+        collection_name: str,
+        max_results: int,
+        query_filter: Optional[models.Filter],
+        history: List[Dict[str, str]],
+        query_vector: Optional[np.ndarray],
+    ) -> AsyncGenerator[Union[str, List[Dict[str, Any]], rs.StageTimings], None]:
+        """
+        Retrieve context and stream the LLM answer for one question.
+
+        Yields the search results used as sources as soon as retrieval is done, then
+        the answer chunks, then the stage timings, which are left out when the LLM
+        streamed an error.
+        """
+        timings = rs.StageTimings()
+
+        stage_start = time.perf_counter()
+        if query_vector is None:
+            with tracer.start_as_current_span("chat.embed"):
+                query_vector = await self.embedding_service.embed_query(query)
+            timings.embed_ms = _elapsed_ms(stage_start)
+
+        # An upload finishing while this answer is generated makes it stale, don't cache it then
+        cache_generation = None
+        if self.answer_cache is not None:
+            cache_generation = self.answer_cache.generation(collection_name)
+
+        # With a reranker, over-fetch candidates and let the cross-encoder pick the top-k
+        search_limit = max_results
+        if self.reranker is not None:
+            search_limit = max(max_results, self.reranker_candidates)
+
+        stage_start = time.perf_counter()
+        with tracer.start_as_current_span(
+            "chat.search",
+            attributes={
+                "rag.collection": collection_name,
+                "rag.limit": search_limit,
+                "rag.filtered": query_filter is not None,
+            },
+        ):
+            search_results = await self.embedding_service.search(
+                query,
+                limit=search_limit,
+                query_vector=query_vector,
+                collection_name=collection_name,
+                query_filter=query_filter,
+            )
+        timings.search_ms = _elapsed_ms(stage_start)
+
+        if self.reranker is not None:
+            stage_start = time.perf_counter()
+            with tracer.start_as_current_span("chat.rerank"):
+                search_results = await self.reranker.rerank(
+                    query, search_results, top_k=max_results
+                )
+            timings.rerank_ms = _elapsed_ms(stage_start)
 
-            context_docs = [hit["content"] for hit in search_results]
+        # Stitch overlapping chunks, drop duplicates and keep the prompt within budget
+        if self.context_packer is not None:
+            with tracer.start_as_current_span("chat.pack"):
+                search_results = self.context_packer.pack(search_results)
 
-            print(f"[RagService] Retrieved {len(context_docs)} context documents from vector DB.")
+        context_docs = [hit["content"] for hit in search_results]
 
-            llm_error = False
+        logger.info("Retrieved context documents", extra={"documents": len(context_docs)})
+        yield search_results
+
+        provider = self.llm.provider_name
+        llm_error = False
+        answer_chunks = []
+        # Not a current span: StreamCoalescer may pull each chunk from a different task
+        llm_span = tracer.start_span("chat.llm", attributes={"llm.provider": provider})
+        stage_start = time.perf_counter()
+        try:
             async for chunk in self.llm.generate_response(
-                query=request.query, context_docs=context_docs, history=[]
+                query=query, context_docs=context_docs, history=history
             ):
+                if not answer_chunks:
+                    timings.llm_ttft_ms = _elapsed_ms(stage_start)
+                    llm_span.add_event("first_token")
+
                 # Check if chunk is an error message
-                if chunk.startswith("Error generating response"):
+                if chunk.startswith(ERROR_PREFIX):
                     llm_error = True
+                    llm_span.set_status(trace.StatusCode.ERROR, chunk)
 
-                yield rs.ChatResponse(
-                    answer=chunk,
-                    source_documents=[],
-                    processing_time_ms=0.0,
+                answer_chunks.append(chunk)
+                yield chunk
+        finally:
+            llm_span.end()
+
+        if not llm_error:
+            if answer_chunks:
+                LLM_TTFT_SECONDS.labels(provider).observe(timings.llm_ttft_ms / 1000)
+            # Decode rate of the chunks after the first, as fast as the client consumed them
+            decode_seconds = time.perf_counter() - stage_start - timings.llm_ttft_ms / 1000
+            if len(answer_chunks) > 1 and decode_seconds > 0:
+                decoded_tokens = estimate_tokens("".join(answer_chunks[1:]))
+                LLM_TOKENS_PER_SECOND.labels(provider).observe(decoded_tokens / decode_seconds)
+
+            # Answers that depend on earlier turns of a conversation aren't reusable, and the
+            # cache is keyed by question and collection only, so scoped answers aren't either
+            if self.answer_cache is not None and not history and query_filter is None:
+                self.answer_cache.store(
+                    query_vector,
+                    collection_name,
+                    CachedAnswer(
+                        chunks=answer_chunks,
+                        search_results=search_results,
+                        max_results=max_results,
+                    ),
+                    query=query,
+                    generation=cache_generation,
                 )
 
-            # Only send sources if LLM didn't error
-            if not llm_error:
-                processing_time = (time.time() - start_time) * 1000
+            yield timings
+
+    async def Chat(
+        self, request: rs.ChatRequest, context: grpc.aio.ServicerContext
+    ) -> AsyncGenerator[rs.ChatResponse, None]:
+        start_time = time.perf_counter()
+        logger.info(
+            "Question received", extra={"query": request.query, "session_id": request.session_id}
+        )
+
+        # Per-request routing (QueryConfig); unset fields fall back to the defaults
+        is_valid, err_msg = self._validate_collection_name(request.config.collection_name)
+        if not is_valid:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, err_msg)
+        collection_name = request.config.collection_name or self.collection_name
+
+        is_valid, max_results = self._resolve_max_results(request.config.max_results)
+        if not is_valid:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "max_results must be >= 0")
+
+        search_filter = request.config.filter
+        is_valid, err_msg = self._validate_filter(search_filter)
+        if not is_valid:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, err_msg)
+        query_filter = metadata_filter(
+            filenames=search_filter.filenames,
+            page_from=search_filter.page_from,
+            page_to=search_filter.page_to,
+            uploaded_after=search_filter.uploaded_after,
+            uploaded_before=search_filter.uploaded_before,
+        )
 
-                source_documents = []
-                for hit in search_results:
-                    meta = hit["metadata"]
+        try:
+            query_vector = None
+            embed_ms = 0.0
+            cached = None
+            history = await self._load_history(request.session_id)
+
+            # Serve repeated (or paraphrased) questions straight from the answer cache,
+            # unless earlier turns of the conversation (or a filter) could change the answer
+            if self.answer_cache is not None and not history and query_filter is None:
+                stage_start = time.perf_counter()
+                with tracer.start_as_current_span("chat.embed"):
+                    query_vector = await self.embedding_service.embed_query(request.query)
+                embed_ms = _elapsed_ms(stage_start)
+                cached = self.answer_cache.lookup(
+                    query_vector, collection_name, query=request.query
+                )
+                if cached is not None and cached.max_results != max_results:
+                    cached = None
 
-                    doc = rs.Source(
-                        filename=meta.get("filename", "Unknown file"),
-                        page_number=int(meta.get("page", 1)),
-                        # Truncate snippet to first 100 characters for brevity
-                        snippet=hit["content"][:100].replace("\n", " ") + "...",
-                        score=hit["score"],
+            if cached is not None:
+                logger.info("Answer cache hit")
+                trace.get_current_span().set_attribute("rag.answer_cache_hit", True)
+                stream = _replay(cached)
+            else:
+                answer = functools.partial(
+                    self._answer,
+                    request.query,
+                    collection_name,
+                    max_results,
+                    query_filter,
+                    history,
+                    query_vector,
+                )
+                # Identical questions asked at the same time share one retrieval + generation
+                if self.single_flight is not None and not history:
+                    key = (
+                        QueryEmbeddingCache.normalize(request.query),
+                        collection_name,
+                        max_results,
+                        search_filter.SerializeToString(deterministic=True),
                     )
-                    source_documents.append(doc)
+                    stream = self.single_flight.stream(key, answer)
+                else:
+                    stream = answer()
+
+            if self.stream_coalescer is not None:
+                stream = self.stream_coalescer.coalesce(stream)
+
+            answer_chunks: List[str] = []
+            stage_timings = None
+            async for item in stream:
+                if isinstance(item, str):
+                    answer_chunks.append(item)
+                    yield rs.ChatResponse(answer=item, source_documents=[], processing_time_ms=0.0)
+                elif isinstance(item, rs.StageTimings):
+                    stage_timings = item
+                else:
+                    # Sources go out right after retrieval, ahead of the first token
+                    yield rs.ChatResponse(
+                        answer="",
+                        source_documents=self._build_sources(item),
+                        processing_time_ms=0.0,
+                    )
+
+            # Timings only come (and the exchange is only remembered) if the LLM didn't error
+            if stage_timings is not None:
+                await self._remember_exchange(
+                    request.session_id, request.query, "".join(answer_chunks)
+                )
+
+                # Coalesced requests share the stream's timings, so fill in a copy
+                timings = rs.StageTimings()
+                timings.CopyFrom(stage_timings)
+                if embed_ms:
+                    timings.embed_ms = embed_ms
+                timings.total_ms = _elapsed_ms(start_time)
 
                 yield rs.ChatResponse(
-                    answer="", source_documents=source_documents, processing_time_ms=processing_time
+                    answer="",
+                    source_documents=[],
+                    processing_time_ms=timings.total_ms,
+                    timings=timings,
                 )
 
-        except Exception as e:
-            print(f"Error: {e}")
+        except ProviderOverloadedError as e:
+            # Fail fast so clients can back off, rather than queueing into a timeout
+            logger.warning("LLM overloaded", extra={"error": str(e)})
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, "LLM backend is overloaded")
+        except Exception:
+            logger.exception("Chat failed")
             yield rs.ChatResponse(
                 answer="Sorry, an error occurred while generating the response.",
                 source_documents=[],
                 processing_time_ms=0.0,
             )
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+async def _replay(
+    cached: CachedAnswer,
+) -> AsyncGenerator[Union[str, List[Dict[str, Any]], rs.StageTimings], None]:
+    """A cached answer in the same shape as RagService._answer streams it."""
+    yield cached.search_results
+    for chunk in cached.chunks:
+        yield chunk
+    yield rs.StageTimings()
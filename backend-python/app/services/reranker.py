@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastembed.rerank.cross_encoder import TextCrossEncoder
+
+from app.config import Settings
+from app.telemetry import RERANKS
+
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoderReranker:
+    """
+    Reorders retrieved chunks with a local ONNX cross-encoder.
+
+    Scoring runs on a dedicated worker thread under a time budget: if the model
+    doesn't finish in time, the candidates are kept in vector-search order.
+    """
+
+    def __init__(self, model_name: str, budget_ms: float):
+        self.model = TextCrossEncoder(model_name=model_name)
+        self.budget = max(0.0, budget_ms) / 1000
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+
+        self.reranked = 0
+        self.fallbacks = 0
+
+    async def start(self):
+        """Startup hook: run the model once so the first request doesn't pay session init."""
+        start_time = time.perf_counter()
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._score_sync, "warm-up query", ["warm-up document"]
+        )
+        logger.info(
+            "Reranker model warmed up",
+            extra={"elapsed_ms": round((time.perf_counter() - start_time) * 1000)},
+        )
+
+    def _score_sync(self, query: str, documents: List[str]) -> List[float]:
+        """Score (query, document) pairs synchronously, higher = more relevant."""
+        return list(self.model.rerank(query, documents, batch_size=len(documents)))
+
+    async def rerank(
+        self, query: str, results: List[Dict[str, Any]], top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Keep the `top_k` most relevant search results according to the cross-encoder.
+
+        Args:
+            query: User question
+            results: Search results (content, metadata, score) in vector order
+            top_k: Number of results to keep
+
+        Returns:
+            Reranked results with an added 'rerank_score', or the first `top_k` results
+            in their original order if the budget was exceeded or scoring failed
+        """
+        if len(results) <= 1:
+            return results[:top_k]
+
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._score_sync, query, [hit["content"] for hit in results]
+        )
+        try:
+            scores = await asyncio.wait_for(future, timeout=self.budget)
+        except asyncio.TimeoutError:
+            self.fallbacks += 1
+            RERANKS.labels(outcome="fallback").inc()
+            logger.warning(
+                "Reranker budget exceeded, using vector order",
+                extra={"budget_ms": round(self.budget * 1000)},
+            )
+            return results[:top_k]
+        except Exception as e:
+            self.fallbacks += 1
+            RERANKS.labels(outcome="fallback").inc()
+            logger.warning("Reranker scoring failed, using vector order", extra={"error": str(e)})
+            return results[:top_k]
+
+        self.reranked += 1
+        RERANKS.labels(outcome="reranked").inc()
+        ranked = sorted(zip(scores, results), key=lambda pair: pair[0], reverse=True)
+        return [{**hit, "rerank_score": float(score)} for score, hit in ranked[:top_k]]
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def init_reranker(settings: Settings) -> AsyncIterator[Optional[CrossEncoderReranker]]:
+    """Container resource: the shared, warmed-up reranker (None when disabled)."""
+    if not settings.reranker_enabled:
+        yield None
+        return
+
+    # Loading the ONNX model is blocking, keep it off the event loop
+    reranker = await asyncio.to_thread(
+        CrossEncoderReranker, settings.reranker_model, settings.reranker_budget_ms
+    )
+    try:
+        await reranker.start()
+        yield reranker
+    finally:
+        reranker.close()
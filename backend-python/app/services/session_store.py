@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class ChatTurn:
+    """One compact message of a conversation, with its token count computed once."""
+
+    role: str  # "user" or "assistant"
+    content: str
+    tokens: int
+
+    @classmethod
+    def create(cls, role: str, content: str, max_chars: int) -> "ChatTurn":
+        content = content[:max_chars]
+        return cls(role=role, content=content, tokens=estimate_tokens(content))
+
+
+def trim_history(
+    turns: List[ChatTurn],
+    token_budget: int,
+    count_tokens: Optional[Callable[[str], int]] = None,
+) -> List[Dict[str, str]]:
+    """
+    Keep the most recent turns that fit in `token_budget`.
+
+    Whole exchanges are dropped from the oldest end, so the history never starts
+    with an assistant message.
+
+    Args:
+        turns: The session's turns, oldest first
+        token_budget: Tokens the kept turns may use
+        count_tokens: Token counter of the prompt's context (ContextPacker.count_tokens),
+            so history and context are budgeted in the same unit; without it, each
+            turn's ~4 characters per token estimate is used
+
+    Returns:
+        History in the provider format: [{"role": ..., "content": ...}, ...]
+    """
+    kept: List[ChatTurn] = []
+    used = 0
+    for turn in reversed(turns):
+        tokens = turn.tokens if count_tokens is None else count_tokens(turn.content)
+        if used + tokens > token_budget:
+            break
+        kept.append(turn)
+        used += tokens
+    kept.reverse()
+
+    while kept and kept[0].role != "user":
+        kept.pop(0)
+
+    return [{"role": turn.role, "content": turn.content} for turn in kept]
+
+
+class SessionStore(ABC):
+    """Conversation memory keyed by session ID."""
+
+    def __init__(self, ttl_seconds: float, max_turns: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+
+    @abstractmethod
+    async def get_history(self, session_id: str) -> List[ChatTurn]:
+        """Return the session's turns (oldest first), empty if unknown or expired."""
+        pass
+
+    @abstractmethod
+    async def append(self, session_id: str, turns: List[ChatTurn]):
+        """Append turns to a session, keeping only its `max_turns` most recent ones."""
+        pass
+
+    async def close(self):
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store with LRU eviction across sessions and a per-session TTL."""
+
+    def __init__(self, max_sessions: int, ttl_seconds: float, max_turns: int):
+        super().__init__(ttl_seconds, max_turns)
+        self.max_sessions = max_sessions
+        # session_id -> (last update, turns)
+        self._sessions: OrderedDict[str, Tuple[float, List[ChatTurn]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def get_history(self, session_id: str) -> List[ChatTurn]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return []
+
+        updated_at, turns = entry
+        if time.monotonic() - updated_at > self.ttl_seconds:
+            del self._sessions[session_id]
+            return []
+
+        self._sessions.move_to_end(session_id)
+        return list(turns)
+
+    async def append(self, session_id: str, turns: List[ChatTurn]):
+        _, existing = self._sessions.pop(session_id, (0.0, []))
+        self._sessions[session_id] = (time.monotonic(), (existing + turns)[-self.max_turns :])
+
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Disk-backed store, survives restarts and can be shared by worker processes on one host.
+    Expired sessions are deleted every `purge_every` appends (0 disables it).
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_turns: int, purge_every: int = 100):
+        super().__init__(ttl_seconds, max_turns)
+        self.purge_every = purge_every
+        self._appends = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS chat_turns ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " session_id TEXT NOT NULL,"
+                " role TEXT NOT NULL,"
+                " content TEXT NOT NULL,"
+                " tokens INTEGER NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS chat_turns_session ON chat_turns (session_id, id)"
+            )
+
+    def _get_history_sync(self, session_id: str) -> List[ChatTurn]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT role, content, tokens, created_at FROM chat_turns"
+                " WHERE session_id = ? ORDER BY id",
+                (session_id,),
+            ).fetchall()
+
+        # The TTL counts from the session's last update, like the in-memory store
+        if not rows or time.time() - rows[-1][3] > self.ttl_seconds:
+            return []
+        return [
+            ChatTurn(role=role, content=content, tokens=tokens) for role, content, tokens, _ in rows
+        ]
+
+    def _append_sync(self, session_id: str, turns: List[ChatTurn]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO chat_turns (session_id, role, content, tokens, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(session_id, t.role, t.content, t.tokens, now) for t in turns],
+                )
+                self._conn.execute(
+                    "DELETE FROM chat_turns WHERE session_id = ? AND id NOT IN"
+                    " (SELECT id FROM chat_turns WHERE session_id = ? ORDER BY id DESC LIMIT ?)",
+                    (session_id, session_id, self.max_turns),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _purge_expired_sync(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM chat_turns WHERE session_id IN (SELECT session_id FROM chat_turns"
+                " GROUP BY session_id HAVING MAX(created_at) < ?)",
+                (time.time() - self.ttl_seconds,),
+            )
+            return cursor.rowcount
+
+    async def get_history(self, session_id: str) -> List[ChatTurn]:
+        return await asyncio.to_thread(self._get_history_sync, session_id)
+
+    async def append(self, session_id: str, turns: List[ChatTurn]):
+        await asyncio.to_thread(self._append_sync, session_id, turns)
+
+        self._appends += 1
+        if self.purge_every > 0 and self._appends % self.purge_every == 0:
+            purged = await self.purge_expired()
+            if purged:
+                logger.debug("Purged expired session turns", extra={"turns": purged})
+
+    async def purge_expired(self) -> int:
+        """Delete sessions whose last update is older than the TTL."""
+        return await asyncio.to_thread(self._purge_expired_sync)
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+async def init_session_store(settings: Settings) -> AsyncIterator[Optional[SessionStore]]:
+    """Container resource: the configured session store (None when disabled)."""
+    backend = settings.session_store
+    store: Optional[SessionStore] = None
+
+    if backend == "memory":
+        store = InMemorySessionStore(
+            max_sessions=settings.session_max_sessions,
+            ttl_seconds=settings.session_ttl_seconds,
+            max_turns=settings.session_max_turns,
+        )
+    elif backend == "sqlite":
+        store = SQLiteSessionStore(
+            path=settings.session_sqlite_path,
+            ttl_seconds=settings.session_ttl_seconds,
+            max_turns=settings.session_max_turns,
+            purge_every=settings.session_sqlite_purge_every,
+        )
+        logger.info("Purged expired session turns", extra={"turns": await store.purge_expired()})
+
+    try:
+        yield store
+    finally:
+        if store is not None:
+            await store.close()
@@ -0,0 +1,133 @@
+import asyncio
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from app.config import Settings
+from app.telemetry import CHAT_STREAMS
+
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    """One in-flight stream: every item produced so far, for replay to late joiners."""
+
+    def __init__(self):
+        self.items: List[T] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    async def publish(self, item: T):
+        async with self._changed:
+            self.items.append(item)
+            self._changed.notify_all()
+
+    async def finish(self, error: Optional[BaseException] = None):
+        async with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[T]:
+        """Replay the stream from its first item, then follow it live."""
+        position = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: position < len(self.items) or self.done)
+                items = self.items[position:]
+                done, error = self.done, self.error
+
+            for item in items:
+                yield item
+            position += len(items)
+
+            if done and position == len(self.items):
+                if error is not None:
+                    raise error
+                return
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces identical concurrent streams: the first caller for a key starts the
+    source and every caller (including later ones) receives the same items from
+    the start. The source runs in its own task, so it doesn't depend on the first
+    caller staying connected; it is cancelled once every subscriber has left.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight[T]] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: Hashable, flight: _Flight[T]):
+        # Later requests for the key start a new flight (finished answers are for the cache)
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _run(self, key: Hashable, flight: _Flight[T], source: AsyncGenerator[T, None]):
+        error: Optional[BaseException] = None
+        try:
+            async for item in source:
+                await flight.publish(item)
+        except Exception as e:
+            error = e
+        finally:
+            self._forget(key, flight)
+            await source.aclose()
+            await flight.finish(error)
+
+    async def stream(
+        self, key: Hashable, source_factory: Callable[[], AsyncGenerator[T, None]]
+    ) -> AsyncIterator[T]:
+        """
+        Subscribe to the stream for `key`, starting it with `source_factory` if needed.
+
+        Args:
+            key: Identity of the stream; equal keys share one source
+            source_factory: Creates the source when no stream for `key` is in flight
+
+        Returns:
+            The source's items from the first one; its exception, if any, is re-raised
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._run(key, flight, source_factory()))
+            self.started += 1
+            CHAT_STREAMS.labels(outcome="started").inc()
+        else:
+            self.coalesced += 1
+            CHAT_STREAMS.labels(outcome="coalesced").inc()
+
+        flight.subscribers += 1
+        try:
+            async for item in flight.subscribe():
+                yield item
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done and flight.task is not None:
+                self._forget(key, flight)
+                flight.task.cancel()
+
+
+def get_single_flight(settings: Settings) -> Optional[SingleFlight]:
+    if not settings.chat_coalescing_enabled:
+        return None
+
+    return SingleFlight()
@@ -0,0 +1,92 @@
+import asyncio
+from typing import AsyncGenerator, AsyncIterator, List, TypeVar, Union
+
+from app.telemetry import STREAM_CHUNKS, STREAM_MESSAGES
+
+T = TypeVar("T")
+
+
+class StreamCoalescer:
+    """
+    Merges small text chunks of a stream into fewer, larger messages.
+
+    The first chunk is passed through immediately (time-to-first-token is unchanged).
+    After that, text is buffered and flushed once it reaches `max_chars`, once the
+    oldest buffered chunk is `flush_interval_ms` old, or at the end of the stream.
+    Non-text items are passed through in order, flushing the buffer before them.
+    """
+
+    def __init__(self, max_chars: int = 256, flush_interval_ms: float = 30.0):
+        self.max_chars = max(1, max_chars)
+        self.flush_interval = max(0.0, flush_interval_ms) / 1000
+
+        self.chunks_in = 0
+        self.messages_out = 0
+
+    async def coalesce(
+        self, stream: AsyncGenerator[Union[str, T], None]
+    ) -> AsyncIterator[Union[str, T]]:
+        loop = asyncio.get_running_loop()
+        buffer: List[str] = []
+        buffered_chars = 0
+        deadline = 0.0
+        first = True
+
+        def flush() -> str:
+            nonlocal buffered_chars
+            text = "".join(buffer)
+            buffer.clear()
+            buffered_chars = 0
+            self.messages_out += 1
+            STREAM_MESSAGES.inc()
+            return text
+
+        # Keep one read from the source pending, so a stalled source can't delay a flush
+        next_item = asyncio.ensure_future(anext(stream))
+        try:
+            while True:
+                timeout = max(0.0, deadline - loop.time()) if buffer else None
+                done, _ = await asyncio.wait({next_item}, timeout=timeout)
+                if not done:
+                    yield flush()
+                    continue
+
+                try:
+                    item = next_item.result()
+                except StopAsyncIteration:
+                    break
+                except Exception:
+                    if buffer:
+                        yield flush()
+                    raise
+                next_item = asyncio.ensure_future(anext(stream))
+
+                if not isinstance(item, str):
+                    if buffer:
+                        yield flush()
+                    yield item
+                    continue
+
+                self.chunks_in += 1
+                STREAM_CHUNKS.inc()
+                if first:
+                    first = False
+                    self.messages_out += 1
+                    STREAM_MESSAGES.inc()
+                    yield item
+                    continue
+
+                if not buffer:
+                    deadline = loop.time() + self.flush_interval
+                buffer.append(item)
+                buffered_chars += len(item)
+                if buffered_chars >= self.max_chars:
+                    yield flush()
+
+            if buffer:
+                yield flush()
+        finally:
+            if not next_item.done():
+                next_item.cancel()
+                await asyncio.gather(next_item, return_exceptions=True)
+            await stream.aclose()
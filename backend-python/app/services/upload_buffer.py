@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import mmap
+import tempfile
+from typing import IO, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UploadBuffer:
+    """
+    Collects the bytes of one upload without a thread hop per gRPC chunk.
+
+    Uploads up to `memory_limit` bytes stay in a bytearray and never touch disk. Larger
+    ones spill to a temporary file, appended in blocks of `flush_size` bytes (one
+    worker-thread write each), which is memory-mapped once the upload is complete.
+    """
+
+    def __init__(self, memory_limit: int = 8 * 1024 * 1024, flush_size: int = 1024 * 1024):
+        self.memory_limit = memory_limit
+        self.flush_size = max(1, flush_size)
+        self.size = 0
+
+        self._pending = bytearray()
+        self._file: Optional[IO[bytes]] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+
+    @property
+    def path(self) -> Optional[str]:
+        """The spill file, None while the upload is held in memory."""
+        return self._file.name if self._file is not None else None
+
+    async def write(self, chunk: bytes):
+        self._pending += chunk
+        self.size += len(chunk)
+
+        if self._file is None:
+            if self.size > self.memory_limit:
+                self._file = await asyncio.to_thread(tempfile.NamedTemporaryFile, suffix=".upload")
+                logger.debug("Upload spilled to disk", extra={"path": self._file.name})
+                await self._flush()
+        elif len(self._pending) >= self.flush_size:
+            await self._flush()
+
+    async def _flush(self):
+        assert self._file is not None
+        block, self._pending = self._pending, bytearray()
+        await asyncio.to_thread(self._file.write, block)
+
+    async def getbuffer(self) -> memoryview:
+        """All bytes received so far, call once the upload is complete."""
+        if self._view is None:
+            if self._file is None:
+                self._view = memoryview(self._pending)
+            elif self.size == 0:
+                self._view = memoryview(b"")
+            else:
+                await self._flush()
+                await asyncio.to_thread(self._file.flush)
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)
+        return self._view
+
+    def close(self):
+        """Release the memory and delete the spill file."""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A parser still references the mapping, it is unmapped once collected
+                logger.debug("Upload buffer still in use, leaving the mapping to GC")
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()  # NamedTemporaryFile deletes itself
+            self._file = None
+        self._pending = bytearray()
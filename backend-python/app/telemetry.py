@@ -0,0 +1,284 @@
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+import time
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+import grpc
+from opentelemetry import trace
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Spans are no-ops until configure_tracing() installs an exporting provider
+tracer = trace.get_tracer("rag-python")
+
+# Seconds, from a cached query embedding (~1 ms) to a slow LLM or a large upload
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)  # fmt: skip
+
+RPC_SECONDS = Histogram(
+    "rag_rpc_seconds", "gRPC handling time", ["method", "code"], buckets=LATENCY_BUCKETS
+)
+RPCS_IN_FLIGHT = Gauge("rag_rpcs_in_flight", "gRPC calls being handled", ["method"])
+
+EMBEDDING_SECONDS = Histogram(
+    "rag_embedding_seconds", "Embedding model call latency", ["kind"], buckets=LATENCY_BUCKETS
+)
+EMBEDDING_BATCH_SIZE = Histogram(
+    "rag_embedding_batch_size",
+    "Texts per embedding model call",
+    ["kind"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+QDRANT_SECONDS = Histogram(
+    "rag_qdrant_seconds", "Qdrant request latency", ["operation"], buckets=LATENCY_BUCKETS
+)
+
+PARSE_PAGE_SECONDS = Histogram(
+    "rag_parse_page_seconds",
+    "Text extraction and splitting time per PDF page",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+LLM_TTFT_SECONDS = Histogram(
+    "rag_llm_ttft_seconds", "LLM time to first token", ["provider"], buckets=LATENCY_BUCKETS
+)
+LLM_TOKENS_PER_SECOND = Histogram(
+    "rag_llm_tokens_per_second",
+    "LLM decode rate after the first token (~4 characters per token)",
+    ["provider"],
+    buckets=(1, 5, 10, 20, 40, 60, 80, 120, 160, 240, 320),
+)
+
+LLM_PROMPT_TOKENS = Counter(
+    "rag_llm_prompt_tokens", "Prompt tokens reported by the LLM server", ["backend"]
+)
+LLM_CACHED_PROMPT_TOKENS = Counter(
+    "rag_llm_cached_prompt_tokens",
+    "Prompt tokens the LLM server served from its prefix cache",
+    ["backend"],
+)
+
+LLM_SLOTS_IN_FLIGHT = Gauge(
+    "rag_llm_slots_in_flight", "Generations holding a concurrency slot", ["backend"]
+)
+LLM_QUEUE_DEPTH = Gauge("rag_llm_queue_depth", "Generations waiting for a slot", ["backend"])
+LLM_REJECTED = Counter(
+    "rag_llm_rejected", "Generations rejected because the LLM backend was overloaded", ["backend"]
+)
+
+QUERY_EMBEDDING_CACHE = Counter(
+    "rag_query_embedding_cache", "Query embedding cache lookups", ["result"]
+)
+ANSWER_CACHE = Counter("rag_answer_cache", "Semantic answer cache lookups", ["result"])
+
+RERANKS = Counter(
+    "rag_reranks", "Rerank calls, by whether the cross-encoder order was used", ["outcome"]
+)
+
+LLM_ROUTER_TTFT_SECONDS = Histogram(
+    "rag_llm_router_ttft_seconds",
+    "Time to first token of each routed backend (hedges included)",
+    ["backend"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_ROUTER_REQUESTS = Counter(
+    "rag_llm_router_requests", "Generations sent to a routed backend (hedges included)", ["backend"]
+)
+LLM_ROUTER_FAILURES = Counter(
+    "rag_llm_router_failures", "Routed backends that failed before their first token", ["backend"]
+)
+LLM_ROUTER_HEDGE_WINS = Counter(
+    "rag_llm_router_hedge_wins", "Hedged generations won by the backend", ["backend"]
+)
+
+CHAT_STREAMS = Counter(
+    "rag_chat_streams",
+    "Chat generations started, or joined while an identical one was in flight",
+    ["outcome"],
+)
+
+STREAM_CHUNKS = Counter("rag_stream_chunks", "LLM text chunks received by the stream coalescer")
+STREAM_MESSAGES = Counter("rag_stream_messages", "Text messages sent by the stream coalescer")
+
+UPLOAD_BYTES = Counter("rag_upload_bytes", "Bytes received by UploadDocument")
+UPLOAD_BYTES_PER_SECOND = Histogram(
+    "rag_upload_bytes_per_second",
+    "UploadDocument throughput, from the first byte received to the last chunk indexed",
+    buckets=(1e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7, 2.5e7, 5e7, 1e8),
+)
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formats records with their `extra=` fields (and the current trace ID, if any)
+    as one JSON object per line, or as text followed by key=value pairs.
+    """
+
+    def __init__(self, json_output: bool = False):
+        super().__init__(datefmt="%Y-%m-%dT%H:%M:%S")
+        self.json_output = json_output
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS}
+        span_context = trace.get_current_span().get_span_context()
+        if span_context.is_valid:
+            fields["trace_id"] = format(span_context.trace_id, "032x")
+
+        if self.json_output:
+            entry = {
+                "time": self.formatTime(record, self.datefmt),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+                **fields,
+            }
+            if record.exc_info:
+                entry["exception"] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str)
+
+        line = (
+            f"{self.formatTime(record, self.datefmt)} {record.levelname:<7} "
+            f"{record.name}: {record.getMessage()}"
+        )
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure_logging(settings: Settings):
+    """Send every logger's records to stderr, as text or JSON lines (LOG_FORMAT)."""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(StructuredFormatter(json_output=settings.log_format == "json"))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.log_level)
+
+
+def configure_tracing(settings: Settings) -> Optional[TracerProvider]:
+    """Export spans over OTLP/gRPC when OTEL_EXPORTER_OTLP_ENDPOINT is set."""
+    if not settings.otel_exporter_otlp_endpoint:
+        return None
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.otel_service_name})
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.otel_exporter_otlp_endpoint))
+    )
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+@contextlib.contextmanager
+def _observe_rpc(method: str, context: grpc.aio.ServicerContext) -> Iterator[None]:
+    code = grpc.StatusCode.OK
+    start_time = time.perf_counter()
+    RPCS_IN_FLIGHT.labels(method).inc()
+    try:
+        with tracer.start_as_current_span(method, kind=trace.SpanKind.SERVER):
+            yield
+    except asyncio.CancelledError:
+        code = grpc.StatusCode.CANCELLED
+        raise
+    except BaseException:
+        code = grpc.StatusCode.UNKNOWN
+        raise
+    finally:
+        # A code set by the handler (context.abort / set_code) takes precedence
+        code = context.code() or code
+        RPCS_IN_FLIGHT.labels(method).dec()
+        RPC_SECONDS.labels(method, code.name).observe(time.perf_counter() - start_time)
+
+
+def _wrap_handler(handler: grpc.RpcMethodHandler, method: str) -> grpc.RpcMethodHandler:
+    """The same handler, with its behavior run under _observe_rpc()."""
+    behavior: Callable
+    if handler.unary_unary or handler.stream_unary:
+        inner = handler.unary_unary or handler.stream_unary
+
+        async def behavior(request_or_iterator, context):
+            with _observe_rpc(method, context):
+                return await inner(request_or_iterator, context)
+
+        factory = (
+            grpc.unary_unary_rpc_method_handler
+            if handler.unary_unary
+            else grpc.stream_unary_rpc_method_handler
+        )
+    else:
+        inner = handler.unary_stream or handler.stream_stream
+
+        async def behavior(request_or_iterator, context):
+            with _observe_rpc(method, context):
+                async for response in inner(request_or_iterator, context):
+                    yield response
+
+        factory = (
+            grpc.unary_stream_rpc_method_handler
+            if handler.unary_stream
+            else grpc.stream_stream_rpc_method_handler
+        )
+
+    return factory(
+        behavior,
+        request_deserializer=handler.request_deserializer,
+        response_serializer=handler.response_serializer,
+    )
+
+
+class TelemetryInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Wraps every RPC in a server span and records the in-flight gauge and
+    handling-time histogram, labelled by method name (e.g. "Chat").
+    """
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        return _wrap_handler(handler, method)
+
+
+async def init_telemetry(settings: Settings) -> AsyncIterator[None]:
+    """Container resource: the /metrics endpoint and the trace exporter, while serving."""
+    server = None
+    if settings.metrics_port > 0:
+        server, _ = start_http_server(settings.metrics_port, addr=settings.metrics_host)
+        logger.info(
+            "Metrics endpoint started",
+            extra={"url": f"http://{settings.metrics_host}:{settings.metrics_port}/metrics"},
+        )
+
+    tracer_provider = configure_tracing(settings)
+    if tracer_provider is not None:
+        logger.info(
+            "Exporting traces", extra={"otlp_endpoint": settings.otel_exporter_otlp_endpoint}
+        )
+
+    try:
+        yield
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if tracer_provider is not None:
+            tracer_provider.shutdown()
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11rag_service.proto\x12\x03rag\"R\n\x0b\x43hatRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12 \n\x06\x63onfig\x18\x03 \x01(\x0b\x32\x10.rag.QueryConfig\";\n\x0bQueryConfig\x12\x17\n\x0f\x63ollection_name\x18\x01 \x01(\t\x12\x13\n\x0bmax_results\x18\x02 \x01(\x05\"a\n\x0c\x43hatResponse\x12\x0e\n\x06\x61nswer\x18\x01 \x01(\t\x12%\n\x10source_documents\x18\x02 \x03(\x0b\x32\x0b.rag.Source\x12\x1a\n\x12processing_time_ms\x18\x03 \x01(\x01\"O\n\x06Source\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x13\n\x0bpage_number\x18\x02 \x01(\x05\x12\x0f\n\x07snippet\x18\x03 \x01(\t\x12\r\n\x05score\x18\x04 \x01(\x02\"Q\n\rUploadRequest\x12\'\n\x08metadata\x18\x01 \x01(\x0b\x32\x13.rag.UploadMetadataH\x00\x12\x0f\n\x05\x63hunk\x18\x02 \x01(\x0cH\x00\x42\x06\n\x04\x64\x61ta\"8\n\x0eUploadMetadata\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x14\n\x0c\x63ontent_type\x18\x02 \x01(\t\"G\n\x0eUploadResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x14\n\x0c\x63hunks_count\x18\x02 \x01(\x05\x12\x0f\n\x07message\x18\x03 \x01(\t2x\n\nRagService\x12-\n\x04\x43hat\x12\x10.rag.ChatRequest\x1a\x11.rag.ChatResponse0\x01\x12;\n\x0eUploadDocument\x12\x12.rag.UploadRequest\x1a\x13.rag.UploadResponse(\x01\x42\x06Z\x04./pbb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x11rag_service.proto\x12\x03rag\"R\n\x0b\x43hatRequest\x12\r\n\x05query\x18\x01 \x01(\t\x12\x12\n\nsession_id\x18\x02 \x01(\t\x12 \n\x06\x63onfig\x18\x03 \x01(\x0b\x32\x10.rag.QueryConfig\"^\n\x0bQueryConfig\x12\x17\n\x0f\x63ollection_name\x18\x01 \x01(\t\x12\x13\n\x0bmax_results\x18\x02 \x01(\x05\x12!\n\x06\x66ilter\x18\x03 \x01(\x0b\x32\x11.rag.SearchFilter\"v\n\x0cSearchFilter\x12\x11\n\tfilenames\x18\x01 \x03(\t\x12\x11\n\tpage_from\x18\x02 \x01(\x05\x12\x0f\n\x07page_to\x18\x03 \x01(\x05\x12\x16\n\x0euploaded_after\x18\x04 \x01(\x03\x12\x17\n\x0fuploaded_before\x18\x05 \x01(\x03\"\x85\x01\n\x0c\x43hatResponse\x12\x0e\n\x06\x61nswer\x18\x01 \x01(\t\x12%\n\x10source_documents\x18\x02 \x03(\x0b\x32\x0b.rag.Source\x12\x1a\n\x12processing_time_ms\x18\x03 \x01(\x01\x12\"\n\x07timings\x18\x04 \x01(\x0b\x32\x11.rag.StageTimings\"m\n\x0cStageTimings\x12\x10\n\x08\x65mbed_ms\x18\x01 \x01(\x01\x12\x11\n\tsearch_ms\x18\x02 \x01(\x01\x12\x11\n\trerank_ms\x18\x03 \x01(\x01\x12\x13\n\x0bllm_ttft_ms\x18\x04 \x01(\x01\x12\x10\n\x08total_ms\x18\x05 \x01(\x01\"O\n\x06Source\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x13\n\x0bpage_number\x18\x02 \x01(\x05\x12\x0f\n\x07snippet\x18\x03 \x01(\t\x12\r\n\x05score\x18\x04 \x01(\x02\"Q\n\rUploadRequest\x12\'\n\x08metadata\x18\x01 \x01(\x0b\x32\x13.rag.UploadMetadataH\x00\x12\x0f\n\x05\x63hunk\x18\x02 \x01(\x0cH\x00\x42\x06\n\x04\x64\x61ta\"e\n\x0eUploadMetadata\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x14\n\x0c\x63ontent_type\x18\x02 \x01(\t\x12\x17\n\x0f\x63ollection_name\x18\x03 \x01(\t\x12\x12\n\nbackground\x18\x04 \x01(\x08\"W\n\x0eUploadResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x14\n\x0c\x63hunks_count\x18\x02 \x01(\x05\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x0e\n\x06job_id\x18\x04 \x01(\t\"\x93\x02\n\x12\x42ulkUploadResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x13\n\x0b\x66iles_count\x18\x02 \x01(\x05\x12\x13\n\x0bpages_count\x18\x03 \x01(\x05\x12\x14\n\x0c\x63hunks_count\x18\x04 \x01(\x05\x12\x17\n\x0fpoints_upserted\x18\x05 \x01(\x05\x12\x16\n\x0e\x63hunks_skipped\x18\x06 \x01(\x05\x12\x16\n\x0epoints_deleted\x18\x07 \x01(\x05\x12\x18\n\x10pages_per_second\x18\x08 \x01(\x01\x12\x19\n\x11\x63hunks_per_second\x18\t \x01(\x01\x12\x1e\n\x06\x65rrors\x18\n \x03(\x0b\x32\x0e.rag.FileError\x12\x0f\n\x07message\x18\x0b \x01(\t\".\n\tFileError\x12\x10\n\x08\x66ilename\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\"%\n\x13IngestionJobRequest\x12\x0e\n\x06job_id\x18\x01 \x01(\t\"\x8f\x02\n\x12IngestionJobStatus\x12\x0e\n\x06job_id\x18\x01 \x01(\t\x12\r\n\x05state\x18\x02 \x01(\t\x12\x10\n\x08\x66ilename\x18\x03 \x01(\t\x12\x17\n\x0f\x63ollection_name\x18\x04 \x01(\t\x12\x14\n\x0cpages_parsed\x18\x05 \x01(\x05\x12\x14\n\x0c\x63hunks_count\x18\x06 \x01(\x05\x12\x17\n\x0f\x63hunks_embedded\x18\x07 \x01(\x05\x12\x17\n\x0fpoints_upserted\x18\x08 \x01(\x05\x12\x16\n\x0e\x63hunks_skipped\x18\t \x01(\x05\x12\x16\n\x0epoints_deleted\x18\n \x01(\x05\x12\x10\n\x08\x61ttempts\x18\x0b \x01(\x05\x12\x0f\n\x07message\x18\x0c \x01(\t2\x88\x02\n\nRagService\x12-\n\x04\x43hat\x12\x10.rag.ChatRequest\x1a\x11.rag.ChatResponse0\x01\x12;\n\x0eUploadDocument\x12\x12.rag.UploadRequest\x1a\x13.rag.UploadResponse(\x01\x12H\n\x11WatchIngestionJob\x12\x18.rag.IngestionJobRequest\x1a\x17.rag.IngestionJobStatus0\x01\x12\x44\n\x13\x42ulkUploadDocuments\x12\x12.rag.UploadRequest\x1a\x17.rag.BulkUploadResponse(\x01\x42\x06Z\x04./pbb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,17 +35,29 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_CHATREQUEST']._serialized_start=26
   _globals['_CHATREQUEST']._serialized_end=108
   _globals['_QUERYCONFIG']._serialized_start=110
-  _globals['_QUERYCONFIG']._serialized_end=169
-  _globals['_CHATRESPONSE']._serialized_start=171
-  _globals['_CHATRESPONSE']._serialized_end=268
-  _globals['_SOURCE']._serialized_start=270
-  _globals['_SOURCE']._serialized_end=349
-  _globals['_UPLOADREQUEST']._serialized_start=351
-  _globals['_UPLOADREQUEST']._serialized_end=432
-  _globals['_UPLOADMETADATA']._serialized_start=434
-  _globals['_UPLOADMETADATA']._serialized_end=490
-  _globals['_UPLOADRESPONSE']._serialized_start=492
-  _globals['_UPLOADRESPONSE']._serialized_end=563
-  _globals['_RAGSERVICE']._serialized_start=565
-  _globals['_RAGSERVICE']._serialized_end=685
+  _globals['_QUERYCONFIG']._serialized_end=204
+  _globals['_SEARCHFILTER']._serialized_start=206
+  _globals['_SEARCHFILTER']._serialized_end=324
+  _globals['_CHATRESPONSE']._serialized_start=327
+  _globals['_CHATRESPONSE']._serialized_end=460
+  _globals['_STAGETIMINGS']._serialized_start=462
+  _globals['_STAGETIMINGS']._serialized_end=571
+  _globals['_SOURCE']._serialized_start=573
+  _globals['_SOURCE']._serialized_end=652
+  _globals['_UPLOADREQUEST']._serialized_start=654
+  _globals['_UPLOADREQUEST']._serialized_end=735
+  _globals['_UPLOADMETADATA']._serialized_start=737
+  _globals['_UPLOADMETADATA']._serialized_end=838
+  _globals['_UPLOADRESPONSE']._serialized_start=840
+  _globals['_UPLOADRESPONSE']._serialized_end=927
+  _globals['_BULKUPLOADRESPONSE']._serialized_start=930
+  _globals['_BULKUPLOADRESPONSE']._serialized_end=1205
+  _globals['_FILEERROR']._serialized_start=1207
+  _globals['_FILEERROR']._serialized_end=1253
+  _globals['_INGESTIONJOBREQUEST']._serialized_start=1255
+  _globals['_INGESTIONJOBREQUEST']._serialized_end=1292
+  _globals['_INGESTIONJOBSTATUS']._serialized_start=1295
+  _globals['_INGESTIONJOBSTATUS']._serialized_end=1566
+  _globals['_RAGSERVICE']._serialized_start=1569
+  _globals['_RAGSERVICE']._serialized_end=1833
 # @@protoc_insertion_point(module_scope)
@@ -56,20 +56,63 @@ class QueryConfig(google.protobuf.message.Message):
 
     COLLECTION_NAME_FIELD_NUMBER: builtins.int
     MAX_RESULTS_FIELD_NUMBER: builtins.int
+    FILTER_FIELD_NUMBER: builtins.int
     collection_name: builtins.str
-    """Name of the document collection"""
+    """Name of the document collection (empty = server default)"""
     max_results: builtins.int
-    """Maximum number of source documents to retrieve"""
+    """Maximum number of source documents to retrieve (0 = server default)"""
+    @property
+    def filter(self) -> Global___SearchFilter:
+        """Restrict retrieval to matching chunks (unset = whole collection)"""
+
     def __init__(
         self,
         *,
         collection_name: builtins.str = ...,
         max_results: builtins.int = ...,
+        filter: Global___SearchFilter | None = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["collection_name", b"collection_name", "max_results", b"max_results"]) -> None: ...
+    def HasField(self, field_name: typing.Literal["filter", b"filter"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["collection_name", b"collection_name", "filter", b"filter", "max_results", b"max_results"]) -> None: ...
 
 Global___QueryConfig: typing_extensions.TypeAlias = QueryConfig
 
+@typing.final
+class SearchFilter(google.protobuf.message.Message):
+    """All set criteria must match; zero / empty fields are ignored"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    FILENAMES_FIELD_NUMBER: builtins.int
+    PAGE_FROM_FIELD_NUMBER: builtins.int
+    PAGE_TO_FIELD_NUMBER: builtins.int
+    UPLOADED_AFTER_FIELD_NUMBER: builtins.int
+    UPLOADED_BEFORE_FIELD_NUMBER: builtins.int
+    page_from: builtins.int
+    """First page, inclusive"""
+    page_to: builtins.int
+    """Last page, inclusive"""
+    uploaded_after: builtins.int
+    """Unix seconds, inclusive"""
+    uploaded_before: builtins.int
+    """Unix seconds, exclusive"""
+    @property
+    def filenames(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.str]:
+        """Any of these documents"""
+
+    def __init__(
+        self,
+        *,
+        filenames: collections.abc.Iterable[builtins.str] | None = ...,
+        page_from: builtins.int = ...,
+        page_to: builtins.int = ...,
+        uploaded_after: builtins.int = ...,
+        uploaded_before: builtins.int = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["filenames", b"filenames", "page_from", b"page_from", "page_to", b"page_to", "uploaded_after", b"uploaded_after", "uploaded_before", b"uploaded_before"]) -> None: ...
+
+Global___SearchFilter: typing_extensions.TypeAlias = SearchFilter
+
 @typing.final
 class ChatResponse(google.protobuf.message.Message):
     """--------------------------------------------------------
@@ -82,13 +125,18 @@ class ChatResponse(google.protobuf.message.Message):
     ANSWER_FIELD_NUMBER: builtins.int
     SOURCE_DOCUMENTS_FIELD_NUMBER: builtins.int
     PROCESSING_TIME_MS_FIELD_NUMBER: builtins.int
+    TIMINGS_FIELD_NUMBER: builtins.int
     answer: builtins.str
     """Generated answer"""
     processing_time_ms: builtins.float
-    """Processing time in milliseconds"""
+    """Total processing time in milliseconds (final message)"""
     @property
     def source_documents(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[Global___Source]:
-        """Retrieved source documents"""
+        """Retrieved source documents (first message, right after retrieval)"""
+
+    @property
+    def timings(self) -> Global___StageTimings:
+        """Per-stage latency breakdown (final message)"""
 
     def __init__(
         self,
@@ -96,11 +144,45 @@ class ChatResponse(google.protobuf.message.Message):
         answer: builtins.str = ...,
         source_documents: collections.abc.Iterable[Global___Source] | None = ...,
         processing_time_ms: builtins.float = ...,
+        timings: Global___StageTimings | None = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["answer", b"answer", "processing_time_ms", b"processing_time_ms", "source_documents", b"source_documents"]) -> None: ...
+    def HasField(self, field_name: typing.Literal["timings", b"timings"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["answer", b"answer", "processing_time_ms", b"processing_time_ms", "source_documents", b"source_documents", "timings", b"timings"]) -> None: ...
 
 Global___ChatResponse: typing_extensions.TypeAlias = ChatResponse
 
+@typing.final
+class StageTimings(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    EMBED_MS_FIELD_NUMBER: builtins.int
+    SEARCH_MS_FIELD_NUMBER: builtins.int
+    RERANK_MS_FIELD_NUMBER: builtins.int
+    LLM_TTFT_MS_FIELD_NUMBER: builtins.int
+    TOTAL_MS_FIELD_NUMBER: builtins.int
+    embed_ms: builtins.float
+    """Query embedding (0 when cached)"""
+    search_ms: builtins.float
+    """Vector search"""
+    rerank_ms: builtins.float
+    """Cross-encoder reranking (0 when disabled)"""
+    llm_ttft_ms: builtins.float
+    """LLM time to first token"""
+    total_ms: builtins.float
+    """End-to-end processing time"""
+    def __init__(
+        self,
+        *,
+        embed_ms: builtins.float = ...,
+        search_ms: builtins.float = ...,
+        rerank_ms: builtins.float = ...,
+        llm_ttft_ms: builtins.float = ...,
+        total_ms: builtins.float = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["embed_ms", b"embed_ms", "llm_ttft_ms", b"llm_ttft_ms", "rerank_ms", b"rerank_ms", "search_ms", b"search_ms", "total_ms", b"total_ms"]) -> None: ...
+
+Global___StageTimings: typing_extensions.TypeAlias = StageTimings
+
 @typing.final
 class Source(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
@@ -164,17 +246,25 @@ class UploadMetadata(google.protobuf.message.Message):
 
     FILENAME_FIELD_NUMBER: builtins.int
     CONTENT_TYPE_FIELD_NUMBER: builtins.int
+    COLLECTION_NAME_FIELD_NUMBER: builtins.int
+    BACKGROUND_FIELD_NUMBER: builtins.int
     filename: builtins.str
     """Name of the file"""
     content_type: builtins.str
     """MIME type of the file (e.g., application/pdf)"""
+    collection_name: builtins.str
+    """Target document collection (empty = server default)"""
+    background: builtins.bool
+    """Respond once the file is received, ingest it in a background job"""
     def __init__(
         self,
         *,
         filename: builtins.str = ...,
         content_type: builtins.str = ...,
+        collection_name: builtins.str = ...,
+        background: builtins.bool = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["content_type", b"content_type", "filename", b"filename"]) -> None: ...
+    def ClearField(self, field_name: typing.Literal["background", b"background", "collection_name", b"collection_name", "content_type", b"content_type", "filename", b"filename"]) -> None: ...
 
 Global___UploadMetadata: typing_extensions.TypeAlias = UploadMetadata
 
@@ -185,19 +275,176 @@ class UploadResponse(google.protobuf.message.Message):
     STATUS_FIELD_NUMBER: builtins.int
     CHUNKS_COUNT_FIELD_NUMBER: builtins.int
     MESSAGE_FIELD_NUMBER: builtins.int
+    JOB_ID_FIELD_NUMBER: builtins.int
     status: builtins.str
     """Status message"""
     chunks_count: builtins.int
     """Number of chunks created from the file"""
     message: builtins.str
     """Additional information or error message"""
+    job_id: builtins.str
+    """Background job ingesting the file (status "queued")"""
     def __init__(
         self,
         *,
         status: builtins.str = ...,
         chunks_count: builtins.int = ...,
         message: builtins.str = ...,
+        job_id: builtins.str = ...,
     ) -> None: ...
-    def ClearField(self, field_name: typing.Literal["chunks_count", b"chunks_count", "message", b"message", "status", b"status"]) -> None: ...
+    def ClearField(self, field_name: typing.Literal["chunks_count", b"chunks_count", "job_id", b"job_id", "message", b"message", "status", b"status"]) -> None: ...
 
 Global___UploadResponse: typing_extensions.TypeAlias = UploadResponse
+
+@typing.final
+class BulkUploadResponse(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    STATUS_FIELD_NUMBER: builtins.int
+    FILES_COUNT_FIELD_NUMBER: builtins.int
+    PAGES_COUNT_FIELD_NUMBER: builtins.int
+    CHUNKS_COUNT_FIELD_NUMBER: builtins.int
+    POINTS_UPSERTED_FIELD_NUMBER: builtins.int
+    CHUNKS_SKIPPED_FIELD_NUMBER: builtins.int
+    POINTS_DELETED_FIELD_NUMBER: builtins.int
+    PAGES_PER_SECOND_FIELD_NUMBER: builtins.int
+    CHUNKS_PER_SECOND_FIELD_NUMBER: builtins.int
+    ERRORS_FIELD_NUMBER: builtins.int
+    MESSAGE_FIELD_NUMBER: builtins.int
+    status: builtins.str
+    """success, partial (some files failed) or error"""
+    files_count: builtins.int
+    """Files ingested"""
+    pages_count: builtins.int
+    """Pages that produced chunks"""
+    chunks_count: builtins.int
+    """Chunks created from all files"""
+    points_upserted: builtins.int
+    """New or changed chunks stored"""
+    chunks_skipped: builtins.int
+    """Unchanged chunks already stored"""
+    points_deleted: builtins.int
+    """Stale chunks of previous versions removed"""
+    pages_per_second: builtins.float
+    """From the first byte received to the last chunk stored"""
+    chunks_per_second: builtins.float
+    message: builtins.str
+    """Summary or error message"""
+    @property
+    def errors(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[Global___FileError]:
+        """Files that were rejected or could not be parsed"""
+
+    def __init__(
+        self,
+        *,
+        status: builtins.str = ...,
+        files_count: builtins.int = ...,
+        pages_count: builtins.int = ...,
+        chunks_count: builtins.int = ...,
+        points_upserted: builtins.int = ...,
+        chunks_skipped: builtins.int = ...,
+        points_deleted: builtins.int = ...,
+        pages_per_second: builtins.float = ...,
+        chunks_per_second: builtins.float = ...,
+        errors: collections.abc.Iterable[Global___FileError] | None = ...,
+        message: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["chunks_count", b"chunks_count", "chunks_per_second", b"chunks_per_second", "chunks_skipped", b"chunks_skipped", "errors", b"errors", "files_count", b"files_count", "message", b"message", "pages_count", b"pages_count", "pages_per_second", b"pages_per_second", "points_deleted", b"points_deleted", "points_upserted", b"points_upserted", "status", b"status"]) -> None: ...
+
+Global___BulkUploadResponse: typing_extensions.TypeAlias = BulkUploadResponse
+
+@typing.final
+class FileError(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    FILENAME_FIELD_NUMBER: builtins.int
+    MESSAGE_FIELD_NUMBER: builtins.int
+    filename: builtins.str
+    message: builtins.str
+    def __init__(
+        self,
+        *,
+        filename: builtins.str = ...,
+        message: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["filename", b"filename", "message", b"message"]) -> None: ...
+
+Global___FileError: typing_extensions.TypeAlias = FileError
+
+@typing.final
+class IngestionJobRequest(google.protobuf.message.Message):
+    """--------------------------------------------------------
+    Ingestion Job Message Definitions
+    --------------------------------------------------------
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    JOB_ID_FIELD_NUMBER: builtins.int
+    job_id: builtins.str
+    """ID returned by UploadDocument"""
+    def __init__(
+        self,
+        *,
+        job_id: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["job_id", b"job_id"]) -> None: ...
+
+Global___IngestionJobRequest: typing_extensions.TypeAlias = IngestionJobRequest
+
+@typing.final
+class IngestionJobStatus(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    JOB_ID_FIELD_NUMBER: builtins.int
+    STATE_FIELD_NUMBER: builtins.int
+    FILENAME_FIELD_NUMBER: builtins.int
+    COLLECTION_NAME_FIELD_NUMBER: builtins.int
+    PAGES_PARSED_FIELD_NUMBER: builtins.int
+    CHUNKS_COUNT_FIELD_NUMBER: builtins.int
+    CHUNKS_EMBEDDED_FIELD_NUMBER: builtins.int
+    POINTS_UPSERTED_FIELD_NUMBER: builtins.int
+    CHUNKS_SKIPPED_FIELD_NUMBER: builtins.int
+    POINTS_DELETED_FIELD_NUMBER: builtins.int
+    ATTEMPTS_FIELD_NUMBER: builtins.int
+    MESSAGE_FIELD_NUMBER: builtins.int
+    job_id: builtins.str
+    state: builtins.str
+    """queued, running, succeeded or failed"""
+    filename: builtins.str
+    collection_name: builtins.str
+    pages_parsed: builtins.int
+    """Pages that produced chunks"""
+    chunks_count: builtins.int
+    """Chunks produced by the parser"""
+    chunks_embedded: builtins.int
+    """New or changed chunks embedded"""
+    points_upserted: builtins.int
+    """Chunks stored in the collection"""
+    chunks_skipped: builtins.int
+    """Unchanged chunks already stored (e.g. before a restart)"""
+    points_deleted: builtins.int
+    """Stale chunks of a previous version removed"""
+    attempts: builtins.int
+    """Runs started, > 1 once a restart has resumed the job"""
+    message: builtins.str
+    """Result or error message (final status)"""
+    def __init__(
+        self,
+        *,
+        job_id: builtins.str = ...,
+        state: builtins.str = ...,
+        filename: builtins.str = ...,
+        collection_name: builtins.str = ...,
+        pages_parsed: builtins.int = ...,
+        chunks_count: builtins.int = ...,
+        chunks_embedded: builtins.int = ...,
+        points_upserted: builtins.int = ...,
+        chunks_skipped: builtins.int = ...,
+        points_deleted: builtins.int = ...,
+        attempts: builtins.int = ...,
+        message: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["attempts", b"attempts", "chunks_count", b"chunks_count", "chunks_embedded", b"chunks_embedded", "chunks_skipped", b"chunks_skipped", "collection_name", b"collection_name", "filename", b"filename", "job_id", b"job_id", "message", b"message", "pages_parsed", b"pages_parsed", "points_deleted", b"points_deleted", "points_upserted", b"points_upserted", "state", b"state"]) -> None: ...
+
+Global___IngestionJobStatus: typing_extensions.TypeAlias = IngestionJobStatus
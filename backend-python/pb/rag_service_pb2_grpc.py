@@ -51,6 +51,18 @@ class RagServiceStub(object):
             response_deserializer=rag__service__pb2.UploadResponse.FromString,
             _registered_method=True,
         )
+        self.WatchIngestionJob = channel.unary_stream(
+            "/rag.RagService/WatchIngestionJob",
+            request_serializer=rag__service__pb2.IngestionJobRequest.SerializeToString,
+            response_deserializer=rag__service__pb2.IngestionJobStatus.FromString,
+            _registered_method=True,
+        )
+        self.BulkUploadDocuments = channel.stream_unary(
+            "/rag.RagService/BulkUploadDocuments",
+            request_serializer=rag__service__pb2.UploadRequest.SerializeToString,
+            response_deserializer=rag__service__pb2.BulkUploadResponse.FromString,
+            _registered_method=True,
+        )
 
 
 class RagServiceServicer(object):
@@ -77,6 +89,23 @@ class RagServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def WatchIngestionJob(self, request, context):
+        """/ WatchIngestionJob streams the progress of a background upload's ingestion job.
+        / It sends the job's current status, then every change until the job has finished.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def BulkUploadDocuments(self, request_iterator, context):
+        """/ BulkUploadDocuments ingests many files sent on one stream, each as an UploadMetadata
+        / message followed by its chunks, into the first file's collection. Files are parsed
+        / concurrently and their chunks share embedding batches.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_RagServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -90,6 +119,16 @@ def add_RagServiceServicer_to_server(servicer, server):
             request_deserializer=rag__service__pb2.UploadRequest.FromString,
             response_serializer=rag__service__pb2.UploadResponse.SerializeToString,
         ),
+        "WatchIngestionJob": grpc.unary_stream_rpc_method_handler(
+            servicer.WatchIngestionJob,
+            request_deserializer=rag__service__pb2.IngestionJobRequest.FromString,
+            response_serializer=rag__service__pb2.IngestionJobStatus.SerializeToString,
+        ),
+        "BulkUploadDocuments": grpc.stream_unary_rpc_method_handler(
+            servicer.BulkUploadDocuments,
+            request_deserializer=rag__service__pb2.UploadRequest.FromString,
+            response_serializer=rag__service__pb2.BulkUploadResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler("rag.RagService", rpc_method_handlers)
     server.add_generic_rpc_handlers((generic_handler,))
@@ -162,3 +201,63 @@ class RagService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def WatchIngestionJob(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/rag.RagService/WatchIngestionJob",
+            rag__service__pb2.IngestionJobRequest.SerializeToString,
+            rag__service__pb2.IngestionJobStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def BulkUploadDocuments(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/rag.RagService/BulkUploadDocuments",
+            rag__service__pb2.UploadRequest.SerializeToString,
+            rag__service__pb2.BulkUploadResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
@@ -57,7 +57,39 @@ _RagServiceUploadDocumentType = typing_extensions.TypeVar(
     ],
 )
 
-class RagServiceStub(typing.Generic[_RagServiceChatType, _RagServiceUploadDocumentType]):
+_RagServiceWatchIngestionJobType = typing_extensions.TypeVar(
+    '_RagServiceWatchIngestionJobType',
+    grpc.UnaryStreamMultiCallable[
+        rag_service_pb2.IngestionJobRequest,
+        rag_service_pb2.IngestionJobStatus,
+    ],
+    grpc.aio.UnaryStreamMultiCallable[
+        rag_service_pb2.IngestionJobRequest,
+        rag_service_pb2.IngestionJobStatus,
+    ],
+    default=grpc.UnaryStreamMultiCallable[
+        rag_service_pb2.IngestionJobRequest,
+        rag_service_pb2.IngestionJobStatus,
+    ],
+)
+
+_RagServiceBulkUploadDocumentsType = typing_extensions.TypeVar(
+    '_RagServiceBulkUploadDocumentsType',
+    grpc.StreamUnaryMultiCallable[
+        rag_service_pb2.UploadRequest,
+        rag_service_pb2.BulkUploadResponse,
+    ],
+    grpc.aio.StreamUnaryMultiCallable[
+        rag_service_pb2.UploadRequest,
+        rag_service_pb2.BulkUploadResponse,
+    ],
+    default=grpc.StreamUnaryMultiCallable[
+        rag_service_pb2.UploadRequest,
+        rag_service_pb2.BulkUploadResponse,
+    ],
+)
+
+class RagServiceStub(typing.Generic[_RagServiceChatType, _RagServiceUploadDocumentType, _RagServiceWatchIngestionJobType, _RagServiceBulkUploadDocumentsType]):
     """--------------------------------------------------------
     RAG Service Definition
     --------------------------------------------------------
@@ -73,6 +105,14 @@ class RagServiceStub(typing.Generic[_RagServiceChatType, _RagServiceUploadDocume
             rag_service_pb2.UploadRequest,
             rag_service_pb2.UploadResponse,
         ],
+        grpc.UnaryStreamMultiCallable[
+            rag_service_pb2.IngestionJobRequest,
+            rag_service_pb2.IngestionJobStatus,
+        ],
+        grpc.StreamUnaryMultiCallable[
+            rag_service_pb2.UploadRequest,
+            rag_service_pb2.BulkUploadResponse,
+        ],
     ], channel: grpc.Channel) -> None: ...
 
     @typing.overload
@@ -85,6 +125,14 @@ class RagServiceStub(typing.Generic[_RagServiceChatType, _RagServiceUploadDocume
             rag_service_pb2.UploadRequest,
             rag_service_pb2.UploadResponse,
         ],
+        grpc.aio.UnaryStreamMultiCallable[
+            rag_service_pb2.IngestionJobRequest,
+            rag_service_pb2.IngestionJobStatus,
+        ],
+        grpc.aio.StreamUnaryMultiCallable[
+            rag_service_pb2.UploadRequest,
+            rag_service_pb2.BulkUploadResponse,
+        ],
     ], channel: grpc.aio.Channel) -> None: ...
 
     Chat: _RagServiceChatType
@@ -99,6 +147,17 @@ class RagServiceStub(typing.Generic[_RagServiceChatType, _RagServiceUploadDocume
     / and returns an UploadResponse indicating the status of the upload.
     """
 
+    WatchIngestionJob: _RagServiceWatchIngestionJobType
+    """/ WatchIngestionJob streams the progress of a background upload's ingestion job.
+    / It sends the job's current status, then every change until the job has finished.
+    """
+
+    BulkUploadDocuments: _RagServiceBulkUploadDocumentsType
+    """/ BulkUploadDocuments ingests many files sent on one stream, each as an UploadMetadata
+    / message followed by its chunks, into the first file's collection. Files are parsed
+    / concurrently and their chunks share embedding batches.
+    """
+
 RagServiceAsyncStub: typing_extensions.TypeAlias = RagServiceStub[
     grpc.aio.UnaryStreamMultiCallable[
         rag_service_pb2.ChatRequest,
@@ -108,6 +167,14 @@ RagServiceAsyncStub: typing_extensions.TypeAlias = RagServiceStub[
         rag_service_pb2.UploadRequest,
         rag_service_pb2.UploadResponse,
     ],
+    grpc.aio.UnaryStreamMultiCallable[
+        rag_service_pb2.IngestionJobRequest,
+        rag_service_pb2.IngestionJobStatus,
+    ],
+    grpc.aio.StreamUnaryMultiCallable[
+        rag_service_pb2.UploadRequest,
+        rag_service_pb2.BulkUploadResponse,
+    ],
 ]
 
 class RagServiceServicer(metaclass=abc.ABCMeta):
@@ -138,4 +205,25 @@ class RagServiceServicer(metaclass=abc.ABCMeta):
         / and returns an UploadResponse indicating the status of the upload.
         """
 
+    @abc.abstractmethod
+    def WatchIngestionJob(
+        self,
+        request: rag_service_pb2.IngestionJobRequest,
+        context: _ServicerContext,
+    ) -> typing.Union[collections.abc.Iterator[rag_service_pb2.IngestionJobStatus], collections.abc.AsyncIterator[rag_service_pb2.IngestionJobStatus]]:
+        """/ WatchIngestionJob streams the progress of a background upload's ingestion job.
+        / It sends the job's current status, then every change until the job has finished.
+        """
+
+    @abc.abstractmethod
+    def BulkUploadDocuments(
+        self,
+        request_iterator: _MaybeAsyncIterator[rag_service_pb2.UploadRequest],
+        context: _ServicerContext,
+    ) -> typing.Union[rag_service_pb2.BulkUploadResponse, collections.abc.Awaitable[rag_service_pb2.BulkUploadResponse]]:
+        """/ BulkUploadDocuments ingests many files sent on one stream, each as an UploadMetadata
+        / message followed by its chunks, into the first file's collection. Files are parsed
+        / concurrently and their chunks share embedding batches.
+        """
+
 def add_RagServiceServicer_to_server(servicer: RagServiceServicer, server: typing.Union[grpc.Server, grpc.aio.Server]) -> None: ...
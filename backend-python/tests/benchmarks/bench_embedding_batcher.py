@@ -0,0 +1,72 @@
+"""
+Benchmark: per-request query embedding vs. the micro-batching EmbeddingBatcher.
+
+Runs the real FastEmbed BGE model and measures query embeddings/sec at different
+numbers of concurrent callers.
+
+Usage (from backend-python/):
+    python -m tests.benchmarks.bench_embedding_batcher --requests 512 --concurrency 1 8 64
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+import numpy as np
+from fastembed import TextEmbedding
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+def embed_sync(model: TextEmbedding, texts: List[str]) -> List[np.ndarray]:
+    return [np.asarray(e, dtype=np.float32) for e in model.embed(texts, batch_size=len(texts))]
+
+
+async def run_load(
+    embed: Callable[[str], Awaitable[np.ndarray]], requests: int, concurrency: int
+) -> float:
+    """Fire `requests` unique queries from `concurrency` callers, return queries/sec."""
+    counter = iter(range(requests))
+
+    async def caller():
+        for i in counter:
+            await embed(f"What does section {i} of the student handbook say about exams?")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(args: argparse.Namespace):
+    model = TextEmbedding(model_name="BAAI/bge-small-en-v1.5")
+    embed_sync(model, ["warm-up"])
+
+    async def per_request(text: str) -> np.ndarray:
+        return (await asyncio.to_thread(embed_sync, model, [text]))[0]
+
+    print(f"{'concurrency':>11} | {'per-request q/s':>15} | {'batched q/s':>11} | {'avg batch':>9}")
+    print("-" * 56)
+
+    for concurrency in args.concurrency:
+        baseline = await run_load(per_request, args.requests, concurrency)
+
+        batcher = EmbeddingBatcher(
+            lambda texts: embed_sync(model, texts),
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms,
+        )
+        batched = await run_load(batcher.embed, args.requests, concurrency)
+        avg_batch = batcher.items / max(batcher.batches, 1)
+        await batcher.close()
+
+        print(f"{concurrency:>11} | {baseline:>15.1f} | {batched:>11.1f} | {avg_batch:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,248 @@
+"""
+Benchmark: recall@k and latency of Qdrant quantization / HNSW settings vs. exact search.
+
+Loads the same vectors into one temporary collection per quantization mode (built with
+the service's quantization_config() and hnsw_config()), waits for indexing, then runs the
+same held-out queries with every search configuration (search_params()). Recall@k is
+measured against exact full-precision search. Vectors are copied from an existing
+collection (--source, realistic) or generated as clustered unit vectors.
+
+Needs a Qdrant server: embedded mode searches exhaustively and ignores these settings.
+The RAM column estimates what each mode keeps in memory (vectors + quantized copies +
+HNSW links), payloads excluded.
+
+Usage (from backend-python/):
+    python -m tests.benchmarks.bench_qdrant_recall --source school_docs --k 10
+    python -m tests.benchmarks.bench_qdrant_recall --points 50000 --oversampling 1,2,4 --hnsw-ef 64,128
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from itertools import product
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, models
+
+from app.config import Settings
+from app.services.embedding_service import (
+    DENSE_VECTOR,
+    hnsw_config,
+    quantization_config,
+    search_params,
+)
+
+UPSERT_BATCH = 512
+
+
+def csv(cast):
+    return lambda value: [cast(v) for v in value.split(",") if v.strip()]
+
+
+def optional_int(value: str) -> Optional[int]:
+    return None if value == "default" else int(value)
+
+
+def percentile(values: List[float], q: float) -> float:
+    samples = sorted(values)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def synthetic_vectors(count: int, dim: int, seed: int) -> np.ndarray:
+    """Unit vectors around random topic centroids, a rough stand-in for text embeddings."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.standard_normal((max(1, count // 200), dim))
+    vectors = centroids[rng.integers(len(centroids), size=count)]
+    vectors += 0.6 * rng.standard_normal((count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+async def source_vectors(client: AsyncQdrantClient, collection: str, count: int) -> np.ndarray:
+    """Dense vectors of up to `count` points of an existing (hybrid or legacy) collection."""
+    vectors = []
+    offset = None
+    while len(vectors) < count:
+        points, offset = await client.scroll(
+            collection, limit=min(1000, count - len(vectors)), offset=offset, with_vectors=True
+        )
+        for point in points:
+            vector = point.vector
+            vectors.append(vector[DENSE_VECTOR] if isinstance(vector, dict) else vector)
+        if offset is None:
+            break
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def estimated_ram_mb(settings: Settings, count: int, dim: int) -> float:
+    original = 0 if settings.qdrant_on_disk_vectors else count * dim * 4
+    quantized = {"none": 0, "scalar": count * dim, "binary": count * dim / 8}
+    links = count * (settings.qdrant_hnsw_m or 16) * 2 * 4  # level 0 has 2*m links
+    return (original + quantized[settings.qdrant_quantization] + links) / 1e6
+
+
+async def create_and_load(
+    client: AsyncQdrantClient, name: str, settings: Settings, vectors: np.ndarray
+):
+    if await client.collection_exists(name):
+        await client.delete_collection(name)
+    await client.create_collection(
+        collection_name=name,
+        vectors_config=models.VectorParams(
+            size=vectors.shape[1],
+            distance=models.Distance.COSINE,
+            on_disk=settings.qdrant_on_disk_vectors,
+        ),
+        on_disk_payload=settings.qdrant_on_disk_payload,
+        hnsw_config=hnsw_config(settings),
+        quantization_config=quantization_config(settings),
+    )
+    for start in range(0, len(vectors), UPSERT_BATCH):
+        batch = vectors[start : start + UPSERT_BATCH]
+        await client.upsert(
+            name,
+            points=models.Batch(ids=list(range(start, start + len(batch))), vectors=batch.tolist()),
+        )
+
+    # Searches only use HNSW (and quantization) once the optimizer has built the index
+    while (await client.get_collection(name)).status != models.CollectionStatus.GREEN:
+        await asyncio.sleep(0.5)
+
+
+async def run_queries(
+    client: AsyncQdrantClient,
+    name: str,
+    queries: np.ndarray,
+    k: int,
+    params: Optional[models.SearchParams],
+) -> tuple:
+    """Top-k IDs per query and per-query latencies (ms)."""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        response = await client.query_points(
+            name, query=query.tolist(), limit=k, search_params=params, with_payload=False
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([point.id for point in response.points])
+    return results, latencies
+
+
+async def main(args: argparse.Namespace) -> List[Dict]:
+    client = AsyncQdrantClient(host=args.host, port=args.port)
+    try:
+        if args.source:
+            vectors = await source_vectors(client, args.source, args.points + args.queries)
+            np.random.default_rng(args.seed).shuffle(vectors)
+        else:
+            vectors = synthetic_vectors(args.points + args.queries, args.dim, args.seed)
+        if len(vectors) <= args.queries:
+            raise SystemExit(f"Need more than {args.queries} vectors, got {len(vectors)}")
+        points, queries = vectors[: -args.queries], vectors[-args.queries :]
+        print(f"{len(points)} points x {points.shape[1]} dims, {len(queries)} queries, k={args.k}")
+
+        rows = []
+        truth = None
+        for quantization in args.quantization:
+            base = dict(
+                _env_file=None,
+                qdrant_quantization=quantization,
+                qdrant_on_disk_vectors=args.on_disk,
+                qdrant_on_disk_payload=args.on_disk,
+                qdrant_hnsw_m=args.hnsw_m,
+                qdrant_hnsw_ef_construct=args.ef_construct,
+            )
+            name = f"{args.prefix}_{quantization}"
+            load_start = time.perf_counter()
+            await create_and_load(client, name, Settings(**base), points)
+            load_seconds = time.perf_counter() - load_start
+
+            if truth is None:
+                exact = models.SearchParams(
+                    exact=True, quantization=models.QuantizationSearchParams(ignore=True)
+                )
+                truth, _ = await run_queries(client, name, queries, args.k, exact)
+
+            oversampling = args.oversampling if quantization != "none" else [None]
+            for ef, factor in product(args.hnsw_ef, oversampling):
+                settings = Settings(
+                    **base,
+                    qdrant_search_hnsw_ef=ef,
+                    qdrant_search_rescore=not args.no_rescore,
+                    qdrant_search_oversampling=factor,
+                )
+                await run_queries(
+                    client, name, queries[: args.warmup], args.k, search_params(settings)
+                )
+                found, latencies = await run_queries(
+                    client, name, queries, args.k, search_params(settings)
+                )
+                recall = np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth)])
+                rows.append(
+                    {
+                        "quantization": quantization,
+                        "on_disk": args.on_disk,
+                        "hnsw_m": args.hnsw_m,
+                        "ef_construct": args.ef_construct,
+                        "hnsw_ef": ef,
+                        "oversampling": factor,
+                        "rescore": not args.no_rescore,
+                        "recall_at_k": float(recall),
+                        "p50_ms": percentile(latencies, 0.5),
+                        "p99_ms": percentile(latencies, 0.99),
+                        "ram_mb": estimated_ram_mb(settings, len(points), points.shape[1]),
+                        "load_seconds": load_seconds,
+                    }
+                )
+
+            if not args.keep:
+                await client.delete_collection(name)
+    finally:
+        await client.close()
+    return rows
+
+
+def report(rows: List[Dict], k: int):
+    print(
+        f"{'quantization':>12} | {'hnsw_ef':>7} | {'oversample':>10} | {f'recall@{k}':>9} | "
+        f"{'p50 ms':>7} | {'p99 ms':>7} | {'RAM MB':>7}"
+    )
+    print("-" * 81)
+    for row in rows:
+        print(
+            f"{row['quantization']:>12} | {str(row['hnsw_ef'] or 'default'):>7} | "
+            f"{str(row['oversampling'] or 'default'):>10} | {row['recall_at_k']:>9.3f} | "
+            f"{row['p50_ms']:>7.2f} | {row['p99_ms']:>7.2f} | {row['ram_mb']:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    defaults = Settings(_env_file=None)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=defaults.qdrant_host)
+    parser.add_argument("--port", type=int, default=defaults.qdrant_port)
+    parser.add_argument("--source", help="copy vectors from this collection (default: synthetic)")
+    parser.add_argument("--points", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200, help="held out from the points")
+    parser.add_argument("--dim", type=int, default=defaults.embedding_vector_size)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--quantization", type=csv(str), default=["none", "scalar", "binary"])
+    parser.add_argument("--on-disk", action="store_true", help="original vectors and payloads")
+    parser.add_argument("--hnsw-m", type=int, default=None)
+    parser.add_argument("--ef-construct", type=int, default=None)
+    parser.add_argument("--hnsw-ef", type=csv(optional_int), default=[None, 128])
+    parser.add_argument("--oversampling", type=csv(float), default=[1.0, 2.0, 4.0])
+    parser.add_argument("--no-rescore", action="store_true")
+    parser.add_argument("--prefix", default="bench_recall", help="temporary collection names")
+    parser.add_argument("--keep", action="store_true", help="keep the collections")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args()
+
+    rows = asyncio.run(main(args))
+    report(rows, args.k)
+    if args.output:
+        args.output.write_text(json.dumps(rows, indent=2) + "\n")
@@ -0,0 +1,362 @@
+"""
+Benchmark: end-to-end ingestion and chat load against the real RagService over gRPC.
+
+Wires the service through the DI container like app/main.py does, with local
+stand-ins for the external systems: embedded Qdrant (":memory:") and a fake LLM
+that streams tokens with a configurable time-to-first-token and decode delay (or
+the DummyProvider). Synthetic PDF and TXT corpora are generated from a seed and
+uploaded first, then concurrent clients ask questions.
+
+Reports ingestion pages/sec and chunks/sec, chat QPS, time-to-first-token and
+p50/p99 latency, and the process memory high-water mark. Results can be written
+as JSON and compared with an earlier run. Embedded Qdrant searches on the event
+loop, so compare runs with each other rather than with a Qdrant server.
+
+Usage (from backend-python/):
+    python -m tests.benchmarks.bench_rag_service --requests 200 --concurrency 8 --output base.json
+    python -m tests.benchmarks.bench_rag_service --requests 200 --concurrency 8 --compare base.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncGenerator, Dict, Iterator, List, Optional, Tuple
+
+import fitz
+import grpc
+from dependency_injector import providers
+from pb import rag_service_pb2 as rs
+from pb import rag_service_pb2_grpc as rs_grpc
+
+from app.config import Settings
+from app.containers import Container
+from app.llm import LLMProvider
+from app.llm.provider import DummyProvider
+from app.telemetry import TelemetryInterceptor
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class FakeStreamingProvider(LLMProvider):
+    """Streams `tokens` tokens: the first after `ttft_ms`, then one every `token_delay_ms`."""
+
+    def __init__(self, tokens: int, ttft_ms: float, token_delay_ms: float):
+        super().__init__()
+        self.tokens = tokens
+        self.ttft = ttft_ms / 1000
+        self.token_delay = token_delay_ms / 1000
+
+    async def generate_response(
+        self, query: str, context_docs: List[str], history: List[Dict[str, str]]
+    ) -> AsyncGenerator[str, None]:
+        async with self._generation_slot():
+            await asyncio.sleep(self.ttft)
+            for i in range(self.tokens):
+                if i:
+                    await asyncio.sleep(self.token_delay)
+                yield f" tok{i % 100}"
+
+    @property
+    def provider_name(self) -> str:
+        return "fake"
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    samples = sorted(values)
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class Corpus:
+    """Seeded synthetic text with a Zipf-like word distribution, and questions about it."""
+
+    def __init__(self, seed: int, vocabulary_size: int = 5000):
+        self.rng = random.Random(seed)
+        syllables = ["ka", "lo", "mi", "ren", "tas", "vo", "pel", "dru", "shi", "ne", "gor", "ul"]
+        self.words = [
+            "".join(self.rng.choices(syllables, k=self.rng.randint(2, 4)))
+            for _ in range(vocabulary_size)
+        ]
+        self.weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+
+    def text(self, words: int) -> str:
+        chosen = self.rng.choices(self.words, weights=self.weights, k=words)
+        sentences = [" ".join(chosen[i : i + 12]) + "." for i in range(0, words, 12)]
+        return "\n".join(" ".join(sentences[i : i + 6]) for i in range(0, len(sentences), 6))
+
+    def question(self) -> str:
+        # Mid-frequency words, so questions hit a few chunks rather than every one
+        topic = self.rng.sample(self.words[50:1000], 3)
+        return f"What does the document say about {topic[0]} and {topic[1]} {topic[2]}?"
+
+    def write_pdf(self, path: Path, pages: int, words_per_page: int):
+        with fitz.open() as doc:
+            for _ in range(pages):
+                page = doc.new_page()
+                page.insert_textbox(
+                    page.rect + (36, 36, -36, -36), self.text(words_per_page), fontsize=9
+                )
+            doc.save(path)
+
+    def write_txt(self, path: Path, words: int):
+        path.write_text(self.text(words), encoding="utf-8")
+
+
+def upload_requests(path: Path) -> Iterator[rs.UploadRequest]:
+    yield rs.UploadRequest(metadata=rs.UploadMetadata(filename=path.name))
+    with open(path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_BYTES):
+            yield rs.UploadRequest(chunk=chunk)
+
+
+async def run_ingestion(
+    stub: rs_grpc.RagServiceStub, files: List[Tuple[Path, int]], concurrency: int
+) -> dict:
+    """Upload `files` ((path, pages) pairs) with `concurrency` parallel uploads."""
+    queue = list(files)
+    chunks = 0
+    errors = 0
+
+    async def uploader():
+        nonlocal chunks, errors
+        while queue:
+            path, _ = queue.pop(0)
+            response = await stub.UploadDocument(upload_requests(path))
+            if response.status == "success":
+                chunks += response.chunks_count
+            else:
+                errors += 1
+                print(f"Upload of {path.name} failed: {response.message}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(uploader() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    pages = sum(pages for _, pages in files)
+    size = sum(path.stat().st_size for path, _ in files)
+    return {
+        "documents": len(files),
+        "errors": errors,
+        "pages": pages,
+        "chunks": chunks,
+        "megabytes": size / 1e6,
+        "seconds": seconds,
+        "pages_per_sec": pages / seconds,
+        "chunks_per_sec": chunks / seconds,
+        "megabytes_per_sec": size / 1e6 / seconds,
+    }
+
+
+async def run_chat(
+    stub: rs_grpc.RagServiceStub, questions: List[str], requests: int, concurrency: int
+) -> dict:
+    """Ask `requests` questions (cycling through `questions`) from `concurrency` clients."""
+    pending = iter(range(requests))
+    ttft_ms: List[float] = []
+    latency_ms: List[float] = []
+    server: Dict[str, List[float]] = {"embed_ms": [], "search_ms": [], "llm_ttft_ms": []}
+    errors = 0
+
+    async def client(worker: int):
+        nonlocal errors
+        for i in pending:
+            request = rs.ChatRequest(query=questions[i % len(questions)], session_id=f"w{worker}")
+            start = time.perf_counter()
+            first = None
+            final = None
+            try:
+                async for response in stub.Chat(request):
+                    if first is None and response.answer:
+                        first = time.perf_counter()
+                    if response.HasField("timings"):
+                        final = response.timings
+            except grpc.aio.AioRpcError:
+                pass
+            if first is None or final is None:
+                errors += 1
+                continue
+
+            ttft_ms.append((first - start) * 1000)
+            latency_ms.append((time.perf_counter() - start) * 1000)
+            for stage, samples in server.items():
+                samples.append(getattr(final, stage))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(worker) for worker in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": seconds,
+        "qps": len(latency_ms) / seconds,
+        "ttft_ms": {"p50": percentile(ttft_ms, 0.5), "p99": percentile(ttft_ms, 0.99)},
+        "latency_ms": {
+            "p50": percentile(latency_ms, 0.5),
+            "p90": percentile(latency_ms, 0.9),
+            "p99": percentile(latency_ms, 0.99),
+            "max": max(latency_ms, default=0.0),
+        },
+        "server_p50_ms": {stage: percentile(samples, 0.5) for stage, samples in server.items()},
+    }
+
+
+def flatten(result: dict, prefix: str = "") -> Dict[str, float]:
+    values = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f"{prefix}{key}"] = value
+    return values
+
+
+def print_comparison(baseline: dict, current: dict):
+    before = flatten({k: baseline[k] for k in ("ingestion", "chat", "memory") if k in baseline})
+    after = flatten({k: current[k] for k in ("ingestion", "chat", "memory")})
+
+    print(f"{'metric':<36} | {'baseline':>12} | {'current':>12} | {'change':>8}")
+    print("-" * 78)
+    for name, value in after.items():
+        if name not in before:
+            continue
+        change = f"{(value - before[name]) / before[name] * 100:+.1f}%" if before[name] else "n/a"
+        print(f"{name:<36} | {before[name]:>12.2f} | {value:>12.2f} | {change:>8}")
+
+
+async def main(args: argparse.Namespace) -> dict:
+    settings = Settings(
+        _env_file=None,
+        qdrant_path=":memory:",
+        retrieval_mode=args.retrieval_mode,
+        document_parser_workers=args.parser_workers,
+        answer_cache_enabled=args.answer_cache,
+        session_store="none",
+        reranker_enabled=False,
+        metrics_port=0,
+        log_level="WARNING",
+    )
+    llm: LLMProvider = DummyProvider()
+    if args.llm == "fake":
+        llm = FakeStreamingProvider(args.tokens, args.ttft_ms, args.token_delay_ms)
+
+    container = Container()
+    container.config.override(providers.Object(settings))
+    container.llm_client.override(providers.Object(llm))
+    await container.init_resources()
+
+    corpus = Corpus(args.seed)
+    server = grpc.aio.server(interceptors=[TelemetryInterceptor()])
+    try:
+        rs_grpc.add_RagServiceServicer_to_server(await container.rag_service(), server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+
+        with tempfile.TemporaryDirectory() as directory:
+            pdfs, txts = [], []
+            for i in range(args.pdf_docs):
+                path = Path(directory, f"report_{i}.pdf")
+                corpus.write_pdf(path, args.pdf_pages, args.words_per_page)
+                pdfs.append((path, args.pdf_pages))
+            for i in range(args.txt_docs):
+                path = Path(directory, f"notes_{i}.txt")
+                corpus.write_txt(path, args.txt_words)
+                txts.append((path, 1))
+
+            async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                stub = rs_grpc.RagServiceStub(channel)
+                ingestion = {
+                    "pdf": await run_ingestion(stub, pdfs, args.upload_concurrency),
+                    "txt": await run_ingestion(stub, txts, args.upload_concurrency),
+                }
+                rss_after_ingestion = peak_rss_mb()
+
+                questions = [corpus.question() for _ in range(args.unique_questions)]
+                await run_chat(stub, questions, args.warmup, args.concurrency)
+                chat = await run_chat(stub, questions, args.requests, args.concurrency)
+    finally:
+        await server.stop(None)
+        await container.shutdown_resources()
+
+    config = {k: v for k, v in vars(args).items() if k not in ("output", "compare")}
+    return {
+        "benchmark": "rag_service",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": config,
+        "ingestion": ingestion,
+        "chat": chat,
+        "memory": {"rss_peak_mb_ingestion": rss_after_ingestion, "rss_peak_mb": peak_rss_mb()},
+    }
+
+
+def report(result: dict, baseline: Optional[dict]):
+    for kind, stats in result["ingestion"].items():
+        print(
+            f"ingest {kind}: {stats['documents']} docs, {stats['pages']} pages, "
+            f"{stats['megabytes']:.1f} MB in {stats['seconds']:.2f} s -> "
+            f"{stats['pages_per_sec']:.1f} pages/s, {stats['megabytes_per_sec']:.2f} MB/s, "
+            f"{stats['chunks_per_sec']:.1f} chunks/s, {stats['errors']} errors"
+        )
+    chat = result["chat"]
+    print(
+        f"chat: {chat['qps']:.1f} QPS, TTFT p50 {chat['ttft_ms']['p50']:.1f} ms "
+        f"p99 {chat['ttft_ms']['p99']:.1f} ms, latency p50 {chat['latency_ms']['p50']:.1f} ms "
+        f"p99 {chat['latency_ms']['p99']:.1f} ms, {chat['errors']} errors"
+    )
+    print(f"memory: peak RSS {result['memory']['rss_peak_mb']:.0f} MB")
+
+    if baseline is not None:
+        print()
+        print_comparison(baseline, result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pdf-docs", type=int, default=4)
+    parser.add_argument("--pdf-pages", type=int, default=40)
+    parser.add_argument("--words-per-page", type=int, default=300)
+    parser.add_argument("--txt-docs", type=int, default=4)
+    parser.add_argument("--txt-words", type=int, default=10000)
+    parser.add_argument("--upload-concurrency", type=int, default=1)
+    parser.add_argument("--parser-workers", type=int, default=2, help="0 parses on a thread")
+    parser.add_argument("--retrieval-mode", choices=["hybrid", "dense"], default="hybrid")
+    parser.add_argument("--answer-cache", action="store_true", help="enable the answer cache")
+    parser.add_argument("--llm", choices=["fake", "dummy"], default="fake")
+    parser.add_argument("--tokens", type=int, default=64, help="tokens per fake answer")
+    parser.add_argument("--ttft-ms", type=float, default=50.0)
+    parser.add_argument("--token-delay-ms", type=float, default=5.0)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--unique-questions", type=int, default=200)
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON results of an earlier run")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    result = asyncio.run(main(args))
+    report(result, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
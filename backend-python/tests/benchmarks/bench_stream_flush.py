@@ -0,0 +1,110 @@
+"""
+Benchmark: one ChatResponse per LLM token vs. the StreamCoalescer flush policy.
+
+Streams synthetic token-by-token answers through a real in-process gRPC server
+and client, and reports messages per answer, time-to-first-message and the
+process CPU time spent on both ends.
+
+Usage (from backend-python/):
+    python -m tests.benchmarks.bench_stream_flush --answers 32 --tokens 400 --tokens-per-sec 200
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional
+
+import grpc
+from pb import rag_service_pb2 as rs
+from pb import rag_service_pb2_grpc as rs_grpc
+
+from app.services.stream_coalescer import StreamCoalescer
+
+
+async def fake_llm(tokens: int, tokens_per_sec: float) -> AsyncIterator[str]:
+    """Token-sized chunks at a steady decode rate (0 = as fast as possible)."""
+    for i in range(tokens):
+        if tokens_per_sec > 0:
+            await asyncio.sleep(1 / tokens_per_sec)
+        yield f" tok{i % 100}"
+
+
+class BenchServicer(rs_grpc.RagServiceServicer):
+    def __init__(self, args: argparse.Namespace, coalescer: Optional[StreamCoalescer]):
+        self.args = args
+        self.coalescer = coalescer
+
+    async def Chat(self, request, context):
+        stream = fake_llm(self.args.tokens, self.args.tokens_per_sec)
+        if self.coalescer is not None:
+            stream = self.coalescer.coalesce(stream)
+        async for chunk in stream:
+            yield rs.ChatResponse(answer=chunk, source_documents=[], processing_time_ms=0.0)
+
+
+async def run_mode(args: argparse.Namespace, coalescer: Optional[StreamCoalescer]) -> List[float]:
+    server = grpc.aio.server()
+    rs_grpc.add_RagServiceServicer_to_server(BenchServicer(args, coalescer), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    messages = 0
+    first_message_ms: List[float] = []
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = rs_grpc.RagServiceStub(channel)
+
+            async def ask():
+                nonlocal messages
+                start = time.perf_counter()
+                first = True
+                async for _ in stub.Chat(rs.ChatRequest(query="bench", session_id="bench")):
+                    if first:
+                        first_message_ms.append((time.perf_counter() - start) * 1000)
+                        first = False
+                    messages += 1
+
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            await asyncio.gather(*(ask() for _ in range(args.answers)))
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+    finally:
+        await server.stop(None)
+
+    first_message_ms.sort()
+    return [
+        messages / args.answers,
+        first_message_ms[len(first_message_ms) // 2],
+        cpu * 1000,
+        wall * 1000,
+    ]
+
+
+async def main(args: argparse.Namespace):
+    modes = [
+        ("per-token", None),
+        (
+            f"coalesced {args.flush_interval_ms:g} ms",
+            StreamCoalescer(max_chars=args.max_chars, flush_interval_ms=args.flush_interval_ms),
+        ),
+    ]
+
+    print(
+        f"{'mode':>16} | {'msgs/answer':>11} | {'p50 first ms':>12} | {'CPU ms':>8} | {'wall ms':>8}"
+    )
+    print("-" * 70)
+    for name, coalescer in modes:
+        per_answer, first_ms, cpu_ms, wall_ms = await run_mode(args, coalescer)
+        print(
+            f"{name:>16} | {per_answer:>11.1f} | {first_ms:>12.1f} | {cpu_ms:>8.0f} | {wall_ms:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--answers", type=int, default=32, help="concurrent Chat streams")
+    parser.add_argument("--tokens", type=int, default=400, help="tokens per answer")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--flush-interval-ms", type=float, default=30.0)
+    parser.add_argument("--max-chars", type=int, default=256)
+    asyncio.run(main(parser.parse_args()))
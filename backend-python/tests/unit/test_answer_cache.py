@@ -0,0 +1,96 @@
+from unittest.mock import patch
+
+import numpy as np
+from app.services.answer_cache import CachedAnswer, SemanticAnswerCache
+
+
+def make_answer(text="Cached answer"):
+    return CachedAnswer(
+        chunks=[text],
+        search_results=[{"content": "Context", "metadata": {"filename": "doc.pdf"}, "score": 0.9}],
+    )
+
+
+def test_lookup_hits_similar_query():
+    """A near-identical query vector in the same collection returns the cached answer."""
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    cache.store([1.0, 0.0, 0.0], "docs", make_answer())
+
+    result = cache.lookup([0.99, 0.05, 0.0], "docs")
+
+    assert result is not None
+    assert result.chunks == ["Cached answer"]
+    assert cache.hits == 1
+
+
+def test_lookup_misses_dissimilar_query_and_other_collection():
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    cache.store([1.0, 0.0, 0.0], "docs", make_answer())
+
+    assert cache.lookup([0.0, 1.0, 0.0], "docs") is None
+    assert cache.lookup([1.0, 0.0, 0.0], "other") is None
+    assert cache.misses == 2
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = SemanticAnswerCache(similarity_threshold=0.99, max_entries=2, ttl_seconds=60)
+    cache.store([1.0, 0.0, 0.0], "docs", make_answer("a"))
+    cache.store([0.0, 1.0, 0.0], "docs", make_answer("b"))
+
+    # Touch "a" so that "b" becomes the least recently used entry
+    assert cache.lookup([1.0, 0.0, 0.0], "docs") is not None
+    cache.store([0.0, 0.0, 1.0], "docs", make_answer("c"))
+
+    assert len(cache) == 2
+    assert cache.lookup([0.0, 1.0, 0.0], "docs") is None
+    assert cache.lookup([1.0, 0.0, 0.0], "docs").chunks == ["a"]
+
+
+def test_expired_entries_are_not_returned():
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=5)
+
+    with patch("app.services.answer_cache.time.monotonic", return_value=100.0):
+        cache.store(np.array([1.0, 0.0]), "docs", make_answer())
+
+    with patch("app.services.answer_cache.time.monotonic", return_value=106.0):
+        assert cache.lookup(np.array([1.0, 0.0]), "docs") is None
+
+    assert len(cache) == 0
+
+
+def test_invalidate_only_clears_given_collection():
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    cache.store([1.0, 0.0], "docs", make_answer())
+    cache.store([1.0, 0.0], "other", make_answer())
+
+    cache.invalidate("docs")
+
+    assert cache.lookup([1.0, 0.0], "docs") is None
+    assert cache.lookup([1.0, 0.0], "other") is not None
+
+
+def test_near_identical_questions_with_different_codes_do_not_collide():
+    """Test that questions differing only in a course code or number get their own answers."""
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    cache.store([1.0, 0.0, 0.0], "docs", make_answer("CS101"), query="When is the CS101 exam?")
+
+    # Embeddings of such questions are nearly identical, only the codes tell them apart
+    assert cache.lookup([0.99, 0.05, 0.0], "docs", query="When is the CS102 exam?") is None
+    assert cache.lookup([0.99, 0.05, 0.0], "docs", query="When is the exam?") is None
+
+    cache.store([0.99, 0.05, 0.0], "docs", make_answer("CS102"), query="When is the CS102 exam?")
+    result = cache.lookup([1.0, 0.0, 0.0], "docs", query="when is the cs102 exam")
+    assert result.chunks == ["CS102"]
+    assert cache.lookup([1.0, 0.0, 0.0], "docs", query="CS101 exam date?").chunks == ["CS101"]
+
+
+def test_answer_retrieved_before_invalidation_is_not_stored():
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    generation = cache.generation("docs")
+
+    cache.invalidate("docs")  # an upload finished while the answer was generated
+    cache.store([1.0, 0.0], "docs", make_answer("stale"), generation=generation)
+    assert cache.lookup([1.0, 0.0], "docs") is None
+
+    cache.store([1.0, 0.0], "docs", make_answer("fresh"), generation=cache.generation("docs"))
+    assert cache.lookup([1.0, 0.0], "docs").chunks == ["fresh"]
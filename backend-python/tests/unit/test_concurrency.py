@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from app.llm.concurrency import ConcurrencyLimiter, ProviderOverloadedError
+from prometheus_client import REGISTRY
+
+
+def sample(metric: str, backend: str) -> float:
+    return REGISTRY.get_sample_value(metric, {"backend": backend}) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_in_flight_generations():
+    limiter = ConcurrencyLimiter(max_in_flight=2, max_queue=10, queue_timeout=1.0)
+    peak = 0
+
+    async def generate():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(generate() for _ in range(6)))
+
+    assert peak == 2
+    assert limiter.stats() == {"in_flight": 0, "waiting": 0, "rejected": 0, "max_in_flight": 2}
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_is_full():
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queue=1, queue_timeout=1.0)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert limiter.stats()["waiting"] == 1
+
+    with pytest.raises(ProviderOverloadedError, match="queue is full"):
+        async with limiter.slot():
+            pass
+
+    release.set()
+    await asyncio.gather(holder, waiter)
+    assert limiter.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_after_queue_timeout():
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queue=10, queue_timeout=0.02)
+
+    async with limiter.slot():
+        with pytest.raises(ProviderOverloadedError, match="No LLM slot"):
+            async with limiter.slot():
+                pass
+
+    assert limiter.stats() == {"in_flight": 0, "waiting": 0, "rejected": 1, "max_in_flight": 1}
+
+
+@pytest.mark.asyncio
+async def test_limiter_exports_queue_depth_and_rejections():
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queue=1, queue_timeout=1.0, name="local:m")
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.slot():
+            await release.wait()
+
+    tasks = [asyncio.create_task(hold()) for _ in range(2)]
+    await asyncio.sleep(0)
+    in_flight, depth = (
+        sample("rag_llm_slots_in_flight", "local:m"),
+        sample("rag_llm_queue_depth", "local:m"),
+    )
+    with pytest.raises(ProviderOverloadedError):
+        async with limiter.slot():
+            pass
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert (in_flight, depth) == (1, 1)
+    assert sample("rag_llm_rejected_total", "local:m") == 1
+    assert (
+        sample("rag_llm_slots_in_flight", "local:m")
+        == sample("rag_llm_queue_depth", "local:m")
+        == 0
+    )
@@ -0,0 +1,108 @@
+from unittest.mock import Mock
+
+from app.services.context_packer import ContextPacker, get_context_packer
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import WhitespaceSplit
+
+
+def hit(content, score, filename="doc.pdf", page=1):
+    return {"content": content, "metadata": {"filename": filename, "page": page}, "score": score}
+
+
+def test_merges_overlapping_chunks_of_the_same_page():
+    packer = ContextPacker(token_budget=1000, max_overlap_chars=50)
+    first = "The exam takes place on Monday in room 101, bring a pencil."
+    second = "in room 101, bring a pencil. Calculators are not allowed."
+
+    packed = packer.pack([hit(second, 0.8), hit(first, 0.6), hit(second, 0.5, page=2)])
+
+    assert [h["content"] for h in packed] == [
+        "The exam takes place on Monday in room 101, bring a pencil. Calculators are not allowed.",
+        second,
+    ]
+    assert packed[0]["score"] == 0.8
+    assert packed[1]["metadata"]["page"] == 2
+
+
+def test_drops_near_duplicates_and_keeps_the_most_relevant():
+    packer = ContextPacker(token_budget=1000, max_overlap_chars=50, duplicate_threshold=0.8)
+    text = "students must register for the final exam before the end of march"
+
+    packed = packer.pack(
+        [hit(text, 0.5, filename="a.pdf"), hit(text + " please", 0.9, filename="b.pdf")]
+    )
+
+    assert [h["metadata"]["filename"] for h in packed] == ["b.pdf"]
+
+
+def test_fills_budget_by_relevance():
+    packer = ContextPacker(token_budget=5, max_overlap_chars=50)
+    results = [
+        hit("alpha beta gamma", 0.9, page=1),  # 4 tokens (~4 chars per token)
+        hit("delta epsilon zeta eta", 0.8, page=2),  # 5 tokens, no longer fits
+        hit("iota", 0.1, page=3),  # 1 token
+    ]
+
+    packed = packer.pack(results)
+
+    assert [h["content"] for h in packed] == ["alpha beta gamma", "iota"]
+
+
+def test_prefers_rerank_score_when_present():
+    packer = ContextPacker(token_budget=1000, max_overlap_chars=50)
+    results = [
+        {**hit("first by vector", 0.9, page=1), "rerank_score": -2.0},
+        {**hit("first by cross-encoder", 0.1, page=2), "rerank_score": 3.0},
+    ]
+
+    assert [h["content"] for h in packer.pack(results)][0] == "first by cross-encoder"
+
+
+def save_tokenizer(path):
+    vocab = {"[UNK]": 0, "hello": 1, "world": 2}
+    tokenizer = Tokenizer(WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = WhitespaceSplit()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tokenizer.save(str(path))
+
+
+def packer_settings(tokenizer_path=None):
+    settings = Mock()
+    settings.context_tokenizer_path = tokenizer_path
+    settings.context_token_budget = None
+    settings.embedding_chunk_overlap = 50
+    settings.context_duplicate_threshold = 0.9
+    return settings
+
+
+def test_counts_tokens_with_tokenizer_file(tmp_path):
+    path = tmp_path / "tokenizer.json"
+    save_tokenizer(path)
+    llm = Mock()
+    llm.CONTEXT_TOKEN_BUDGET = 1500
+
+    packer = get_context_packer(packer_settings(str(path)), llm)
+
+    assert packer.token_budget == 1500
+    assert packer.count_tokens("hello world something else") == 4
+
+
+def test_defaults_to_the_embedding_model_tokenizer(tmp_path, monkeypatch):
+    """Test that the tokenizer.json fastembed downloaded with the model is used when cached."""
+    monkeypatch.setenv("FASTEMBED_CACHE_PATH", str(tmp_path))
+    llm = Mock()
+    llm.CONTEXT_TOKEN_BUDGET = 1500
+
+    # Not downloaded yet: fall back to ~4 characters per token
+    packer = get_context_packer(packer_settings(), llm)
+    assert packer.tokenizer is None
+    assert packer.count_tokens("hello world something else") == 6
+
+    repo = tmp_path / "models--qdrant--bge-small-en-v1.5-onnx-q"
+    save_tokenizer(repo / "snapshots" / "abc123" / "tokenizer.json")
+    (repo / "refs").mkdir()
+    (repo / "refs" / "main").write_text("abc123")
+
+    packer = get_context_packer(packer_settings(), llm)
+    assert packer.count_tokens("hello world something else") == 4
@@ -0,0 +1,105 @@
+import os
+from unittest.mock import Mock
+
+import fitz
+import pytest
+from app.services.document_parser import DocumentParser
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """A 40-page PDF with a few empty pages in between."""
+    path = tmp_path / "handbook.pdf"
+    with fitz.open() as doc:
+        for i in range(40):
+            page = doc.new_page()
+            if i % 9 != 4:
+                page.insert_text((72, 72), f"Page {i} covers exam rules and deadlines. " * 3)
+                page.insert_text((72, 200), f"Section {i}.2 lists the grading policy. " * 3)
+        doc.save(str(path))
+    return str(path)
+
+
+async def collect(parser, file_path, filename):
+    texts, metas = [], []
+    async for page_texts, page_metas in parser.iter_chunks(file_path, filename):
+        texts.extend(page_texts)
+        metas.extend(page_metas)
+    return texts, metas
+
+
+@pytest.mark.asyncio
+async def test_thread_parser_matches_reference(sample_pdf):
+    parser = DocumentParser(chunk_size=100, chunk_overlap=10)
+
+    texts, metas = await collect(parser, sample_pdf, "handbook.pdf")
+
+    assert (texts, metas) == parser.parse_sync(sample_pdf, "handbook.pdf")
+    assert metas[0] == {"filename": "handbook.pdf", "page": 1}
+    assert all(m["page"] != 5 for m in metas)  # empty pages produce no chunks
+
+
+@pytest.mark.asyncio
+async def test_process_pool_output_is_deterministic(sample_pdf):
+    """Test that page ranges parsed in parallel keep the single-threaded chunk order."""
+    reference = DocumentParser(chunk_size=100, chunk_overlap=10).parse_sync(
+        sample_pdf, "handbook.pdf"
+    )
+    parser = DocumentParser(
+        chunk_size=100, chunk_overlap=10, workers=2, pages_per_task=7, min_pages_for_pool=1
+    )
+    parser.start()
+    try:
+        result = await collect(parser, sample_pdf, "handbook.pdf")
+    finally:
+        parser.shutdown()
+
+    assert result == reference
+
+
+@pytest.mark.asyncio
+async def test_text_files_bypass_the_pool(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("Line one.\n\nLine two.", encoding="utf-8")
+    parser = DocumentParser(chunk_size=100, chunk_overlap=10, workers=1)
+
+    texts, metas = await collect(parser, str(path), "notes.txt")
+
+    assert texts == ["Line one.\n\nLine two."]
+    assert metas == [{"filename": "notes.txt", "page": 1}]
+
+
+@pytest.mark.asyncio
+async def test_parses_documents_from_memory(sample_pdf):
+    parser = DocumentParser(chunk_size=100, chunk_overlap=10)
+    with open(sample_pdf, "rb") as f:
+        data = memoryview(f.read())
+
+    pdf = await collect(parser, data, "handbook.pdf")
+    text = await collect(parser, memoryview("Grüße aus der Schule.".encode()), "notes.md")
+
+    assert pdf == parser.parse_sync(sample_pdf, "handbook.pdf")
+    assert text == (["Grüße aus der Schule."], [{"filename": "notes.md", "page": 1}])
+
+
+@pytest.mark.asyncio
+async def test_pool_tasks_get_a_path_for_in_memory_documents(sample_pdf):
+    """Test that an in-memory PDF is written to disk once instead of copied into each task."""
+    with open(sample_pdf, "rb") as f:
+        data = memoryview(f.read())
+    parser = DocumentParser(
+        chunk_size=100, chunk_overlap=10, workers=2, pages_per_task=7, min_pages_for_pool=1
+    )
+    parser.start()
+    submit = parser._pool.submit = Mock(side_effect=parser._pool.submit)
+    try:
+        result = await collect(parser, data, "handbook.pdf")
+    finally:
+        parser.shutdown()
+
+    assert result == parser.parse_sync(sample_pdf, "handbook.pdf")
+    paths = {call.args[1] for call in submit.call_args_list}
+    assert len(paths) == 1
+    [path] = paths
+    assert isinstance(path, str) and path != sample_pdf
+    assert not os.path.exists(path)  # removed once parsed
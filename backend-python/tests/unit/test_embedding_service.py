@@ -0,0 +1,479 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+from fastembed import SparseEmbedding
+from prometheus_client import REGISTRY
+from qdrant_client import AsyncQdrantClient, models
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_cache import QueryEmbeddingCache
+from app.services.embedding_service import (
+    EmbeddingService,
+    document_point_id,
+    init_embedding_service,
+    metadata_filter,
+)
+
+
+@pytest.fixture
+def mock_settings():
+    """Settings mock for the embedding service."""
+    settings = Mock()
+    settings.qdrant_host = "localhost"
+    settings.qdrant_port = 6333
+    settings.qdrant_path = None
+    settings.qdrant_collection = "test_docs"
+    settings.qdrant_missing_collection_ttl = 30.0
+    settings.qdrant_quantization = "none"
+    settings.qdrant_quantization_always_ram = True
+    settings.qdrant_on_disk_vectors = False
+    settings.qdrant_on_disk_payload = False
+    settings.qdrant_hnsw_m = None
+    settings.qdrant_hnsw_ef_construct = None
+    settings.qdrant_update_existing_collections = False
+    settings.qdrant_search_hnsw_ef = None
+    settings.qdrant_search_rescore = True
+    settings.qdrant_search_oversampling = None
+    settings.embedding_vector_size = 3
+    settings.retrieval_mode = "dense"
+    settings.sparse_embedding_model = "Qdrant/bm25"
+    settings.hybrid_prefetch_limit = 20
+    settings.query_embedding_cache_size = 16
+    settings.embedding_batching_enabled = True
+    settings.embedding_batch_max_size = 8
+    settings.embedding_batch_max_wait_ms = 5.0
+    return settings
+
+
+@pytest.fixture
+def embedding_service(mock_settings):
+    """EmbeddingService with the ONNX model and Qdrant clients mocked out."""
+    with (
+        patch("app.services.embedding_service.TextEmbedding") as mock_model_cls,
+        patch("app.services.embedding_service.AsyncQdrantClient") as mock_client_cls,
+    ):
+        mock_model_cls.return_value.embed = MagicMock(
+            side_effect=lambda docs, **kwargs: iter([np.array([1.0, 0.0, 0.0]) for _ in docs])
+        )
+        mock_client_cls.return_value.query_points = AsyncMock(return_value=Mock(points=[]))
+        mock_client_cls.return_value.collection_exists = AsyncMock(return_value=True)
+        mock_client_cls.return_value.get_collection = AsyncMock(
+            return_value=Mock(config=Mock(params=Mock(sparse_vectors=None)), payload_schema={})
+        )
+        mock_client_cls.return_value.create_payload_index = AsyncMock()
+        mock_client_cls.return_value.close = AsyncMock()
+        yield EmbeddingService(mock_settings)
+
+
+def test_query_cache_normalizes_and_counts():
+    cache = QueryEmbeddingCache(max_entries=4)
+    cache.put("What is  RAG?", np.array([0.5, 0.5]))
+    hits_before = REGISTRY.get_sample_value("rag_query_embedding_cache_total", {"result": "hit"})
+
+    assert cache.get("what is rag?") is not None
+    assert cache.get("something else") is None
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+    hits = REGISTRY.get_sample_value("rag_query_embedding_cache_total", {"result": "hit"})
+    assert hits - hits_before == 1
+
+
+def test_query_cache_is_bounded_and_read_only():
+    cache = QueryEmbeddingCache(max_entries=2)
+    for i in range(3):
+        cache.put(f"q{i}", np.array([float(i)]))
+
+    assert len(cache) == 2
+    assert cache.get("q0") is None
+
+    vector = cache.get("q2")
+    assert vector.dtype == np.float32
+    assert not vector.flags.writeable
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_skips_embedding_model(embedding_service):
+    """Test that exact repeats are served from the query embedding cache."""
+    await embedding_service.search("What is RAG?")
+    await embedding_service.search("what is rag?")
+
+    embedding_service.embedding_model.embed.assert_called_once()
+    assert embedding_service.client.query_points.await_count == 2
+    assert embedding_service.query_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_requests():
+    """Test that concurrent submissions share a single embedding call."""
+    calls = []
+
+    def embed_fn(texts):
+        calls.append(list(texts))
+        return [np.array([float(len(t))]) for t in texts]
+
+    batcher = EmbeddingBatcher(embed_fn, max_batch_size=16, max_wait_ms=20)
+    vectors = await asyncio.gather(*(batcher.embed("x" * n) for n in range(1, 6)))
+    await batcher.close()
+
+    assert [float(v[0]) for v in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert len(calls) == 1
+    assert batcher.batches == 1 and batcher.items == 5
+
+
+@pytest.mark.asyncio
+async def test_batcher_respects_max_batch_size_and_propagates_errors():
+    calls = []
+
+    def embed_fn(texts):
+        calls.append(len(texts))
+        if "boom" in texts:
+            raise RuntimeError("model failure")
+        return [np.zeros(1) for _ in texts]
+
+    batcher = EmbeddingBatcher(embed_fn, max_batch_size=2, max_wait_ms=20)
+    await asyncio.gather(*(batcher.embed(str(i)) for i in range(5)))
+
+    with pytest.raises(RuntimeError, match="model failure"):
+        await batcher.embed("boom")
+    await batcher.close()
+
+    assert calls[:3] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_one_model_call(embedding_service):
+    """Test that the service routes query embeddings through the batcher."""
+    await asyncio.gather(*(embedding_service.embed_query(f"question {i}") for i in range(4)))
+
+    embedding_service.embedding_model.embed.assert_called_once()
+    assert embedding_service.query_batcher.items == 4
+
+
+@pytest.mark.asyncio
+async def test_collection_existence_is_cached(embedding_service):
+    """Test that per-collection existence checks hit Qdrant once per collection."""
+    embedding_service.client.collection_exists = AsyncMock(
+        side_effect=lambda name: name in ("a", "test_docs")
+    )
+
+    for _ in range(3):
+        await embedding_service.search("q", collection_name="a")
+        assert await embedding_service.search("q", collection_name="missing") == []
+    await embedding_service.search("q")
+
+    checked = [c.args[0] for c in embedding_service.client.collection_exists.call_args_list]
+    assert sorted(checked) == ["a", "missing", "test_docs"]
+    assert embedding_service.client.query_points.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_existence_checks_adopt_collection_once(embedding_service):
+    """Test that first uses racing on an existing collection adopt it only once."""
+    checked = asyncio.Event()
+
+    async def collection_exists(name):
+        await checked.wait()
+        return True
+
+    embedding_service.client.collection_exists = AsyncMock(side_effect=collection_exists)
+    checks = [asyncio.create_task(embedding_service.collection_exists("shared")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    checked.set()
+
+    assert await asyncio.gather(*checks) == [True, True, True]
+    embedding_service.client.collection_exists.assert_awaited_once()
+    embedding_service.client.get_collection.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_upsert_creates_missing_collection_once(embedding_service):
+    embedding_service.client.collection_exists = AsyncMock(return_value=False)
+    embedding_service.client.create_collection = AsyncMock()
+    embedding_service.client.upsert = AsyncMock()
+    meta = {"filename": "doc.txt", "page": 1}
+
+    await asyncio.gather(
+        *(
+            embedding_service.upsert_documents(["text"], [[1.0, 0.0, 0.0]], [meta], "tenant")
+            for _ in range(3)
+        )
+    )
+
+    embedding_service.client.create_collection.assert_awaited_once()
+    assert await embedding_service.collection_exists("tenant")
+
+
+@pytest.mark.asyncio
+async def test_start_creates_collection_and_warms_up_model(embedding_service):
+    """Test that the startup hook ensures the default collection and runs the model once."""
+    embedding_service.client.collection_exists = AsyncMock(return_value=False)
+    embedding_service.client.create_collection = AsyncMock()
+
+    await embedding_service.start()
+    await embedding_service.search("first question")
+
+    embedding_service.client.create_collection.assert_awaited_once()
+    assert embedding_service.client.create_collection.call_args.kwargs["collection_name"] == (
+        "test_docs"
+    )
+    # Warm-up (query + document) ran before the first request, which needs no existence check
+    assert embedding_service.embedding_model.embed.call_count == 3
+    embedding_service.client.collection_exists.assert_awaited_once()
+
+
+@pytest.fixture
+def tuned_settings(mock_settings):
+    mock_settings.qdrant_quantization = "scalar"
+    mock_settings.qdrant_on_disk_vectors = True
+    mock_settings.qdrant_hnsw_m = 32
+    mock_settings.qdrant_search_hnsw_ef = 128
+    mock_settings.qdrant_search_oversampling = 2.0
+    return mock_settings
+
+
+@pytest.mark.asyncio
+async def test_collection_is_created_with_quantization_and_on_disk_vectors(
+    tuned_settings, embedding_service
+):
+    embedding_service.client.collection_exists = AsyncMock(return_value=False)
+    embedding_service.client.create_collection = AsyncMock()
+
+    await embedding_service.ensure_collection("test_docs")
+    await embedding_service.search("q")
+
+    kwargs = embedding_service.client.create_collection.call_args.kwargs
+    assert kwargs["vectors_config"].on_disk is True
+    assert kwargs["quantization_config"].scalar.type == models.ScalarType.INT8
+    assert kwargs["hnsw_config"].m == 32
+    assert kwargs["hnsw_config"].ef_construct is None
+    params = embedding_service.client.query_points.call_args.kwargs["search_params"]
+    assert params.hnsw_ef == 128
+    assert params.quantization.rescore is True
+    assert params.quantization.oversampling == 2.0
+
+
+@pytest.mark.asyncio
+async def test_default_settings_leave_qdrant_defaults(embedding_service):
+    await embedding_service.search("q")
+
+    assert embedding_service.client.query_points.call_args.kwargs["search_params"] is None
+
+
+def collection_info(quantization=None, m=16, on_disk=False) -> Mock:
+    return Mock(
+        config=Mock(
+            quantization_config=quantization,
+            hnsw_config=models.HnswConfig(m=m, ef_construct=100, full_scan_threshold=10000),
+            params=Mock(
+                vectors=models.VectorParams(
+                    size=3, distance=models.Distance.COSINE, on_disk=on_disk
+                ),
+                sparse_vectors=None,
+                on_disk_payload=False,
+            ),
+        ),
+        payload_schema={},
+    )
+
+
+@pytest.mark.asyncio
+async def test_existing_collection_is_updated_to_the_configuration(
+    tuned_settings, embedding_service
+):
+    embedding_service.update_existing_collections = True
+    embedding_service.client.get_collection = AsyncMock(return_value=collection_info())
+    embedding_service.client.update_collection = AsyncMock()
+
+    await embedding_service.ensure_collection("test_docs")
+
+    kwargs = embedding_service.client.update_collection.call_args.kwargs
+    assert set(kwargs) == {
+        "collection_name",
+        "quantization_config",
+        "hnsw_config",
+        "vectors_config",
+    }
+    assert kwargs["quantization_config"] == embedding_service.quantization_config
+    assert kwargs["vectors_config"] == {"": models.VectorParamsDiff(on_disk=True)}
+
+
+@pytest.mark.asyncio
+async def test_new_collection_gets_payload_indexes(embedding_service):
+    embedding_service.client.collection_exists = AsyncMock(return_value=False)
+    embedding_service.client.create_collection = AsyncMock()
+
+    await embedding_service.ensure_collection("tenant")
+
+    indexed = {
+        c.kwargs["field_name"]: c.kwargs["field_schema"]
+        for c in embedding_service.client.create_payload_index.call_args_list
+    }
+    assert indexed == {
+        "filename": models.PayloadSchemaType.KEYWORD,
+        "page": models.PayloadSchemaType.INTEGER,
+        "uploaded_at": models.PayloadSchemaType.INTEGER,
+    }
+
+
+@pytest.mark.asyncio
+async def test_existing_collection_gets_missing_payload_indexes(embedding_service):
+    info = collection_info()
+    info.payload_schema = {"filename": Mock(), "page": Mock()}
+    embedding_service.client.get_collection = AsyncMock(return_value=info)
+
+    await embedding_service.search("q", collection_name="legacy")
+
+    calls = embedding_service.client.create_payload_index.call_args_list
+    assert [c.kwargs["field_name"] for c in calls] == ["uploaded_at"]
+
+
+@pytest.mark.asyncio
+async def test_matching_collection_is_not_updated(tuned_settings, embedding_service):
+    embedding_service.update_existing_collections = True
+    info = collection_info(embedding_service.quantization_config, m=32, on_disk=True)
+    embedding_service.client.get_collection = AsyncMock(return_value=info)
+    embedding_service.client.update_collection = AsyncMock()
+
+    await embedding_service.ensure_collection("test_docs")
+
+    embedding_service.client.update_collection.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_resource_closes_service_on_shutdown(mock_settings):
+    with (
+        patch("app.services.embedding_service.TextEmbedding") as mock_model_cls,
+        patch("app.services.embedding_service.AsyncQdrantClient") as mock_client_cls,
+    ):
+        mock_model_cls.return_value.embed = MagicMock(
+            side_effect=lambda docs, **kwargs: iter([np.zeros(3) for _ in docs])
+        )
+        mock_client_cls.return_value.collection_exists = AsyncMock(return_value=False)
+        mock_client_cls.return_value.create_collection = AsyncMock()
+        mock_client_cls.return_value.create_payload_index = AsyncMock()
+        mock_client_cls.return_value.close = AsyncMock()
+
+        resource = init_embedding_service(mock_settings)
+        service = await resource.__anext__()
+        mock_client_cls.return_value.close.assert_not_awaited()
+
+        with pytest.raises(StopAsyncIteration):
+            await resource.__anext__()
+
+    assert isinstance(service, EmbeddingService)
+    mock_client_cls.return_value.close.assert_awaited_once()
+
+
+class FakeSparseModel:
+    """Bag-of-words stand-in for the BM25 model (one dimension per distinct token)."""
+
+    vocabulary: dict = {}
+
+    def _embed(self, text):
+        tokens = sorted({t for t in text.lower().split()})
+        indices = [self.vocabulary.setdefault(t, len(self.vocabulary)) for t in tokens]
+        return SparseEmbedding(values=np.ones(len(indices)), indices=np.array(indices))
+
+    def embed(self, documents, **kwargs):
+        return iter([self._embed(d) for d in documents])
+
+    def query_embed(self, query, **kwargs):
+        return iter([self._embed(query)])
+
+
+@pytest.fixture
+def hybrid_service(mock_settings):
+    """EmbeddingService in hybrid mode against an in-memory Qdrant, with fake models."""
+    mock_settings.retrieval_mode = "hybrid"
+    mock_settings.qdrant_path = ":memory:"
+    with (
+        patch("app.services.embedding_service.TextEmbedding") as mock_model_cls,
+        patch("app.services.embedding_service.SparseTextEmbedding", return_value=FakeSparseModel()),
+        patch(
+            "app.services.embedding_service.AsyncQdrantClient",
+            side_effect=lambda **kwargs: AsyncQdrantClient(location=":memory:"),
+        ),
+    ):
+        # Dense vectors carry no signal, so ranking differences come from the sparse leg
+        mock_model_cls.return_value.embed = MagicMock(
+            side_effect=lambda docs, **kwargs: iter([np.array([1.0, 0.0, 0.0]) for _ in docs])
+        )
+        yield EmbeddingService(mock_settings)
+
+
+DOCUMENTS = [
+    "General information about the exam period",
+    "Course CS-101 syllabus and grading",
+    "Library opening hours during holidays",
+]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_sparse_and_dense_legs(hybrid_service):
+    """Test that exact-term queries are ranked by the sparse leg in hybrid mode."""
+    metas = [{"filename": f"doc{i}.txt", "page": 1} for i in range(len(DOCUMENTS))]
+    await hybrid_service.start()
+    embeddings = await hybrid_service.embed_documents(DOCUMENTS)
+    await hybrid_service.upsert_documents(DOCUMENTS, embeddings, metas)
+
+    results = await hybrid_service.search("cs-101", limit=2)
+
+    assert results[0]["content"] == DOCUMENTS[1]
+    info = await hybrid_service.client.get_collection("test_docs")
+    assert set(info.config.params.vectors) == {"dense"}
+    assert set(info.config.params.sparse_vectors) == {"sparse"}
+    await hybrid_service.close()
+
+
+@pytest.mark.asyncio
+async def test_legacy_dense_collection_is_searched_dense_only(hybrid_service):
+    """Test that collections without sparse vectors keep working in hybrid mode."""
+    await hybrid_service.client.create_collection(
+        collection_name="legacy",
+        vectors_config=models.VectorParams(size=3, distance=models.Distance.COSINE),
+    )
+
+    await hybrid_service.upsert_documents(
+        DOCUMENTS[:1], [[1.0, 0.0, 0.0]], [{"filename": "a.txt", "page": 1}], "legacy"
+    )
+    results = await hybrid_service.search("exam", collection_name="legacy")
+
+    assert [r["content"] for r in results] == DOCUMENTS[:1]
+    await hybrid_service.close()
+
+
+@pytest.mark.asyncio
+async def test_search_filters_by_document_page_and_upload_time(hybrid_service):
+    """Test that metadata filters restrict both hybrid legs to matching chunks."""
+    metas = [{"filename": f"doc{i}.txt", "page": i + 1} for i in range(len(DOCUMENTS))]
+    await hybrid_service.start()
+    embeddings = await hybrid_service.embed_documents(DOCUMENTS)
+    # doc2 is uploaded with its time, doc1 is an unchanged chunk re-dated by ID
+    await hybrid_service.upsert_documents(DOCUMENTS[:2], embeddings[:2], metas[:2])
+    await hybrid_service.upsert_documents(
+        DOCUMENTS[2:], embeddings[2:], metas[2:], uploaded_at=1_700_000_000
+    )
+    await hybrid_service.set_upload_time([document_point_id(DOCUMENTS[1], metas[1])], 1_650_000_000)
+
+    by_file = await hybrid_service.search(
+        "cs-101", query_filter=metadata_filter(filenames=["doc0.txt", "doc2.txt"])
+    )
+    by_page = await hybrid_service.search("exam", query_filter=metadata_filter(page_from=2))
+    by_time = await hybrid_service.search(
+        "exam", query_filter=metadata_filter(uploaded_after=1_660_000_000)
+    )
+
+    assert {r["metadata"]["filename"] for r in by_file} == {"doc0.txt", "doc2.txt"}
+    assert {r["metadata"]["page"] for r in by_page} == {2, 3}
+    assert [r["metadata"]["filename"] for r in by_time] == ["doc2.txt"]
+    redated = await hybrid_service.search(
+        "exam",
+        query_filter=metadata_filter(uploaded_after=1_600_000_000, uploaded_before=1_660_000_000),
+    )
+    assert [r["metadata"]["filename"] for r in redated] == ["doc1.txt"]
+    await hybrid_service.close()
+
+
+def test_empty_metadata_filter_is_none():
+    assert metadata_filter() is None
+    assert metadata_filter(filenames=[], page_from=0, uploaded_before=0) is None
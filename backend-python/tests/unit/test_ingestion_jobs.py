@@ -0,0 +1,133 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from app.services.document_parser import DocumentParser
+from app.services.embedding_service import document_point_id
+from app.services.ingestion_jobs import (
+    FAILED,
+    RUNNING,
+    SUCCEEDED,
+    IngestionJob,
+    IngestionJobManager,
+    IngestionJobStore,
+    IngestionQueueFullError,
+)
+from app.services.ingestion_pipeline import IngestionPipeline
+
+TEXT = "\n\n".join(f"Paragraph {i} explains the exam registration rules." for i in range(20))
+
+
+@pytest.fixture
+def mock_embedding_service():
+    service = Mock()
+    service.embed_documents = AsyncMock(side_effect=lambda docs: [[0.0]] * len(docs))
+    service.upsert_documents = AsyncMock(side_effect=lambda docs, embs, metas, **kwargs: len(docs))
+    service.existing_point_ids = AsyncMock(return_value=set())
+    service.delete_stale_points = AsyncMock(return_value=0)
+    service.set_upload_time = AsyncMock()
+    return service
+
+
+def make_manager(tmp_path, embedding_service, **kwargs) -> IngestionJobManager:
+    return IngestionJobManager(
+        store=IngestionJobStore(str(tmp_path / "jobs.db")),
+        pipeline=IngestionPipeline(embedding_service, batch_size=4),
+        document_parser=DocumentParser(chunk_size=60, chunk_overlap=0),
+        spool_dir=str(tmp_path),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_job_progress_is_streamed_until_it_succeeds(tmp_path, mock_embedding_service):
+    manager = make_manager(tmp_path, mock_embedding_service)
+    await manager.start(ttl_seconds=60)
+    try:
+        job = await manager.submit(TEXT.encode(), "rules.txt", "school_docs")
+        updates = [update async for update in manager.watch(job.id)]
+    finally:
+        await manager.close()
+
+    final = updates[-1]
+    assert final.state == SUCCEEDED
+    assert final.result.chunks == final.result.upserted == 20
+    assert RUNNING in [u.state for u in updates]
+    # Counts only grow while the job runs
+    upserted = [u.result.upserted for u in updates]
+    assert upserted == sorted(upserted)
+    assert not Path(job.path).exists()
+
+    stored = IngestionJobStore(str(tmp_path / "jobs.db"))
+    assert (await stored.get(job.id)).state == SUCCEEDED
+    stored.close()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_job_resumes_from_committed_batches(tmp_path, mock_embedding_service):
+    """Test that a job left running by a restart is queued again and skips stored chunks."""
+    spooled = tmp_path / "abc.txt"
+    spooled.write_text(TEXT, encoding="utf-8")
+    store = IngestionJobStore(str(tmp_path / "jobs.db"))
+    await store.save(
+        IngestionJob(
+            id="a" * 32,
+            filename="rules.txt",
+            collection_name="docs",
+            path=str(spooled),
+            state=RUNNING,
+            attempts=1,
+        )
+    )
+    store.close()
+
+    # The first 8 of the 20 chunks were upserted before the restart
+    [(texts, metas)] = DocumentParser(chunk_size=60, chunk_overlap=0).iter_chunks_sync(
+        str(spooled), "rules.txt"
+    )
+    committed = {document_point_id(text, meta) for text, meta in zip(texts[:8], metas[:8])}
+    mock_embedding_service.existing_point_ids = AsyncMock(
+        side_effect=lambda ids, **kwargs: set(ids) & committed
+    )
+
+    manager = make_manager(tmp_path, mock_embedding_service)
+    await manager.start(ttl_seconds=60)
+    try:
+        final = [update async for update in manager.watch("a" * 32)][-1]
+    finally:
+        await manager.close()
+
+    assert final.state == SUCCEEDED
+    assert final.attempts == 2
+    assert (final.result.skipped, final.result.upserted) == (8, 12)
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_report_the_error(tmp_path, mock_embedding_service):
+    mock_embedding_service.embed_documents = AsyncMock(side_effect=RuntimeError("model crashed"))
+    manager = make_manager(tmp_path, mock_embedding_service)
+    await manager.start(ttl_seconds=60)
+    try:
+        job = await manager.submit(TEXT.encode(), "rules.txt", "docs")
+        final = [update async for update in manager.watch(job.id)][-1]
+    finally:
+        await manager.close()
+
+    assert final.state == FAILED
+    assert final.message == "model crashed"
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_jobs_beyond_max_pending(tmp_path, mock_embedding_service):
+    blocked = asyncio.Event()
+    mock_embedding_service.embed_documents = AsyncMock(side_effect=lambda docs: blocked.wait())
+    manager = make_manager(tmp_path, mock_embedding_service, workers=1, max_pending=2)
+    await manager.start(ttl_seconds=60)
+    try:
+        await manager.submit(TEXT.encode(), "a.txt", "docs")
+        await manager.submit(TEXT.encode(), "b.txt", "docs")
+        with pytest.raises(IngestionQueueFullError):
+            await manager.submit(TEXT.encode(), "c.txt", "docs")
+    finally:
+        await manager.close()
@@ -0,0 +1,187 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from app.services.embedding_service import document_point_id
+from app.services.ingestion_pipeline import IngestionPipeline, iterate_in_thread
+
+
+def make_pages(pages, chunks_per_page):
+    for page in range(1, pages + 1):
+        texts = [f"p{page}c{i}" for i in range(chunks_per_page)]
+        yield texts, [{"filename": "doc.pdf", "page": page} for _ in texts]
+
+
+@pytest.fixture
+def mock_embedding_service():
+    service = Mock()
+    service.embed_documents = AsyncMock(side_effect=lambda docs: [[0.0]] * len(docs))
+    service.upsert_documents = AsyncMock(side_effect=lambda docs, embs, metas, **kwargs: len(docs))
+    service.existing_point_ids = AsyncMock(return_value=set())
+    service.delete_stale_points = AsyncMock(return_value=0)
+    service.set_upload_time = AsyncMock()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_pipeline_regroups_pages_into_full_batches(mock_embedding_service):
+    """Test that page chunks are packed into fixed-size embedding batches in order."""
+    pipeline = IngestionPipeline(mock_embedding_service, batch_size=4, queue_size=2)
+
+    result = await pipeline.run(iterate_in_thread(make_pages, 3, 5))
+
+    assert result.chunks == result.upserted == 15
+    batches = [c.args[0] for c in mock_embedding_service.embed_documents.call_args_list]
+    assert [len(b) for b in batches] == [4, 4, 4, 3]
+    assert [t for b in batches for t in b] == [t for texts, _ in make_pages(3, 5) for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_overlaps_embedding_and_upserts(mock_embedding_service):
+    """Test that the next batch is embedded while the previous one is still upserting."""
+    events = []
+
+    async def embed(docs):
+        events.append(("embed", docs[0]))
+        return [[0.0]] * len(docs)
+
+    async def upsert(docs, embs, metas, **kwargs):
+        events.append(("upsert-start", docs[0]))
+        await asyncio.sleep(0.01)
+        events.append(("upsert-end", docs[0]))
+        return len(docs)
+
+    mock_embedding_service.embed_documents = AsyncMock(side_effect=embed)
+    mock_embedding_service.upsert_documents = AsyncMock(side_effect=upsert)
+    pipeline = IngestionPipeline(mock_embedding_service, batch_size=1, queue_size=2)
+
+    await pipeline.run(iterate_in_thread(make_pages, 2, 1))
+
+    assert events.index(("embed", "p2c0")) < events.index(("upsert-end", "p1c0"))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_propagates_parser_errors(mock_embedding_service):
+    def broken_parser():
+        yield ["chunk"], [{"filename": "doc.pdf", "page": 1}]
+        raise ValueError("corrupt page")
+
+    pipeline = IngestionPipeline(mock_embedding_service, batch_size=32)
+
+    with pytest.raises(ValueError, match="corrupt page"):
+        await pipeline.run(iterate_in_thread(broken_parser))
+
+
+def test_point_ids_are_deterministic():
+    meta = {"filename": "doc.pdf", "page": 2}
+
+    assert document_point_id("chunk", meta) == document_point_id("chunk", dict(meta))
+    assert document_point_id("chunk", meta) != document_point_id("chunk!", meta)
+    assert document_point_id("chunk", meta) != document_point_id("chunk", {**meta, "page": 3})
+
+
+@pytest.mark.asyncio
+async def test_reingest_only_embeds_changed_chunks_and_prunes_stale(mock_embedding_service):
+    """Test that unchanged chunks skip embedding and removed chunks are deleted."""
+    old_pages = list(make_pages(2, 3))
+    stored = {document_point_id(t, m) for texts, metas in old_pages for t, m in zip(texts, metas)}
+    mock_embedding_service.existing_point_ids = AsyncMock(
+        side_effect=lambda ids, **kwargs: {i for i in ids if i in stored}
+    )
+    mock_embedding_service.delete_stale_points = AsyncMock(return_value=1)
+
+    # The new version edits one chunk of page 2
+    new_pages = [old_pages[0], (["p2c0", "p2c1", "p2c2 (edited)"], old_pages[1][1])]
+
+    async def source():
+        for page in new_pages:
+            yield page
+
+    pipeline = IngestionPipeline(mock_embedding_service, batch_size=32)
+    result = await pipeline.run(source())
+
+    mock_embedding_service.embed_documents.assert_called_once_with(["p2c2 (edited)"])
+    assert (result.chunks, result.upserted, result.skipped, result.deleted) == (6, 1, 5, 1)
+    filename, keep_ids = mock_embedding_service.delete_stale_points.call_args.args
+    assert filename == "doc.pdf" and len(keep_ids) == 6
+    # The new chunk is stored with the upload time, unchanged ones are re-dated with it
+    uploaded_at = mock_embedding_service.upsert_documents.call_args.kwargs["uploaded_at"]
+    redated = set()
+    for call in mock_embedding_service.set_upload_time.call_args_list:
+        assert call.args[1] == uploaded_at
+        redated.update(call.args[0])
+    assert redated == stored - {document_point_id("p2c2", old_pages[1][1][2])}
+
+
+@pytest.mark.asyncio
+async def test_reupload_without_chunks_prunes_previous_version(mock_embedding_service):
+    """Test that a new version yielding no chunks (e.g. a scan) removes the old points."""
+    mock_embedding_service.delete_stale_points = AsyncMock(return_value=6)
+
+    async def no_pages():
+        return
+        yield
+
+    pipeline = IngestionPipeline(mock_embedding_service, batch_size=32)
+    result = await pipeline.run(no_pages(), filename="doc.pdf")
+
+    mock_embedding_service.delete_stale_points.assert_awaited_once_with(
+        "doc.pdf", set(), collection_name=None
+    )
+    assert (result.chunks, result.deleted, result.changed) == (0, 6, True)
+
+
+async def documents(*names, pages=2, chunks_per_page=3):
+    for name in names:
+
+        async def parse(name=name):
+            for page in range(1, pages + 1):
+                texts = [f"{name}p{page}c{i}" for i in range(chunks_per_page)]
+                yield texts, [{"filename": name, "page": page} for _ in texts]
+
+        yield name, parse
+
+
+@pytest.mark.asyncio
+async def test_run_many_packs_chunks_of_all_documents_into_full_batches(mock_embedding_service):
+    pipeline = IngestionPipeline(mock_embedding_service, batch_size=4)
+
+    async def with_empty_document():
+        async for document in documents("a.txt", "b.txt", "c.txt"):
+            yield document
+        async for document in documents("empty.txt", pages=0):
+            yield document
+
+    result = await pipeline.run_many(with_empty_document(), concurrency=2)
+
+    assert (result.pages, result.chunks, result.upserted) == (6, 18, 18)
+    batches = [c.args[0] for c in mock_embedding_service.embed_documents.call_args_list]
+    assert [len(b) for b in batches] == [4, 4, 4, 4, 2]
+    # The document without chunks loses its previous points too
+    pruned = {c.args[0] for c in mock_embedding_service.delete_stale_points.call_args_list}
+    assert pruned == {"a.txt", "b.txt", "c.txt", "empty.txt"}
+
+
+@pytest.mark.asyncio
+async def test_run_many_skips_documents_that_fail_to_parse(mock_embedding_service):
+    async def with_broken_document():
+        async for document in documents("a.txt"):
+            yield document
+
+        async def broken():
+            yield ["chunk"], [{"filename": "broken.pdf", "page": 1}]
+            raise ValueError("corrupt page")
+
+        yield "broken.pdf", broken
+        async for document in documents("b.txt"):
+            yield document
+
+    pipeline = IngestionPipeline(mock_embedding_service, batch_size=4)
+
+    result = await pipeline.run_many(with_broken_document(), concurrency=2)
+
+    assert result.failed == {"broken.pdf": "corrupt page"}
+    assert result.chunks == 13
+    # The broken document's previous version is kept
+    pruned = {c.args[0] for c in mock_embedding_service.delete_stale_points.call_args_list}
+    assert pruned == {"a.txt", "b.txt"}
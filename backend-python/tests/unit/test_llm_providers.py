@@ -1,6 +1,10 @@
-from unittest.mock import AsyncMock, MagicMock, Mock, PropertyMock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, PropertyMock
 
+import numpy as np
 import pytest
+from prometheus_client import REGISTRY
+from app.llm import ConcurrencyLimiter, ProviderOverloadedError
+from app.llm.provider import GeminiProvider, LocalProvider, OpenAIProvider
 from app.services.rag_service import RagService
 from pb import rag_service_pb2 as rs
 
@@ -15,8 +19,18 @@ def mock_settings():
     """Common settings mock for all tests."""
     settings = Mock()
     settings.maximum_file_size = 1024 * 1024
+    settings.upload_memory_limit = 64 * 1024
+    settings.upload_flush_size = 16 * 1024
     settings.embedding_chunk_size = 500
     settings.embedding_chunk_overlap = 50
+    settings.ingestion_batch_size = 32
+    settings.ingestion_queue_size = 4
+    settings.ingestion_parse_concurrency = 2
+    settings.default_max_results = 3
+    settings.max_results_limit = 20
+    settings.session_history_token_budget = 1024
+    settings.session_max_turn_chars = 4000
+    settings.stream_flush_interval_ms = 0
     return settings
 
 
@@ -33,8 +47,14 @@ def mock_llm():
 def mock_embedding_service():
     """Common embedding service mock for all tests."""
     service = Mock()
+    service.embed_query = AsyncMock(return_value=np.array([1.0, 0.0]))
     service.search = AsyncMock(return_value=[])
     service.add_documents = AsyncMock(return_value=5)
+    service.embed_documents = AsyncMock(side_effect=lambda docs: [[0.0]] * len(docs))
+    service.upsert_documents = AsyncMock(side_effect=lambda docs, embs, metas, **kwargs: len(docs))
+    service.existing_point_ids = AsyncMock(return_value=set())
+    service.delete_stale_points = AsyncMock(return_value=0)
+    service.set_upload_time = AsyncMock()
     return service
 
 
@@ -68,17 +88,23 @@ async def test_chat_success_scenario(rag_service, mock_llm, mock_embedding_servi
     responses = [res async for res in rag_service.Chat(request=mock_request, context=mock_context)]
 
     # 3. ASSERT
-    # LLM parts (3 parts) + Source info (1 part) = Total 4 responses expected
-    assert len(responses) == 4
+    # Sources (1 part) + LLM parts (3 parts) + Timings (1 part) = Total 5 responses expected
+    assert len(responses) == 5
 
     # Is the combined answer correct?
     full_answer = "".join([r.answer for r in responses])
     assert "Hello from Python!" in full_answer
 
-    # Does the last message contain sources?
+    # Does the first message contain sources, ahead of the answer?
+    first_response = responses[0]
+    assert len(first_response.source_documents) == 1
+    assert first_response.source_documents[0].filename == "doc.pdf"
+    assert first_response.answer == ""
+
+    # Does the last message carry the stage timings?
     last_response = responses[-1]
-    assert len(last_response.source_documents) == 1
-    assert last_response.source_documents[0].filename == "doc.pdf"
+    assert last_response.HasField("timings")
+    assert last_response.timings.total_ms == last_response.processing_time_ms
 
 
 @pytest.mark.asyncio
@@ -100,27 +126,27 @@ async def test_upload_document_success(mock_settings, mock_embedding_service):
         yield rs.UploadRequest(chunk=content)
 
     # 2. ACT
-    # Mock the _parse_document_sync to return expected chunks
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_to_thread:
-        # First call is for file write (we don't care about return)
-        # Subsequent calls are for parse_document_sync
-        mock_to_thread.side_effect = [
-            None,  # temp_file.write
-            (  # _parse_document_sync
-                ["chunk1", "chunk2", "chunk3", "chunk4", "chunk5"],
-                [{"filename": "test_notes.txt", "page": 1}] * 5,
-            ),
-            None,  # Path.unlink
-        ]
-
-        response = await service.UploadDocument(
-            request_iterator=mock_request_iterator(), context=Mock()
+    # Mock the page parser to return expected chunks
+    service.document_parser.iter_chunks_sync = Mock(
+        return_value=iter(
+            [
+                (
+                    ["chunk1", "chunk2", "chunk3", "chunk4", "chunk5"],
+                    [{"filename": "test_notes.txt", "page": 1}] * 5,
+                )
+            ]
         )
+    )
+
+    response = await service.UploadDocument(
+        request_iterator=mock_request_iterator(), context=Mock()
+    )
 
     # 3. ASSERT
     assert response.status == "success"
     assert response.chunks_count == 5
-    mock_embedding_service.add_documents.assert_called_once()
+    mock_embedding_service.embed_documents.assert_called_once()
+    mock_embedding_service.upsert_documents.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -201,7 +227,7 @@ async def test_chat_passes_context_docs_to_llm(rag_service, mock_llm, mock_embed
     )
     mock_request = rs.ChatRequest(query="test", session_id="123")
 
-    await rag_service.Chat(request=mock_request, context=Mock()).__anext__()
+    [res async for res in rag_service.Chat(request=mock_request, context=Mock())]
 
     mock_llm.generate_response.assert_called_once()
     call_args = mock_llm.generate_response.call_args
@@ -213,8 +239,125 @@ async def test_chat_passes_empty_history(rag_service, mock_llm):
     """Test that empty history is passed to LLM."""
     mock_request = rs.ChatRequest(query="test", session_id="123")
 
-    await rag_service.Chat(request=mock_request, context=Mock()).__anext__()
+    [res async for res in rag_service.Chat(request=mock_request, context=Mock())]
 
     mock_llm.generate_response.assert_called_once()
     call_args = mock_llm.generate_response.call_args
     assert call_args[1]["history"] == []
+
+
+def make_chunk(content=None, usage=None, **extra):
+    """OpenAI-style stream chunk; a usage-only chunk has no choices."""
+    chunk = Mock()
+    chunk.choices = [Mock(delta=Mock(content=content))] if content is not None else []
+    chunk.usage = usage
+    chunk.model_extra = extra
+    return chunk
+
+
+def test_messages_put_stable_prefix_first():
+    """Test that the same documents give the same prefix, in their relevance order."""
+    provider = OpenAIProvider(api_key="sk-test", model="gpt", timeout=1.0)
+    history = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}]
+
+    first = provider._build_messages("Q1", ["doc B", "doc A"], history)
+    second = provider._build_messages("Q2", ["doc B", "doc A"], [])
+
+    assert first[0] == second[0]
+    assert first[0]["role"] == "system"
+    # The best chunk stays first, context is not re-sorted by text
+    assert first[0]["content"].index("doc B") < first[0]["content"].index("doc A")
+    assert [m["role"] for m in first] == ["system", "user", "assistant", "user"]
+    assert first[-1]["content"] == "QUESTION: Q1"
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_records_cached_prompt_tokens():
+    provider = OpenAIProvider(api_key="sk-test", model="gpt", timeout=1.0)
+    usage = Mock(prompt_tokens=2000, prompt_tokens_details=Mock(cached_tokens=1536))
+    provider.client = Mock()
+    provider.client.chat.completions.create = AsyncMock(
+        return_value=async_iter([make_chunk("Hello"), make_chunk(usage=usage)])
+    )
+
+    labels = {"backend": "openai:gpt"}
+    cached_before = REGISTRY.get_sample_value("rag_llm_cached_prompt_tokens_total", labels) or 0
+
+    answer = [c async for c in provider.generate_response("Q", ["doc"], [])]
+
+    assert answer == ["Hello"]
+    assert provider.client.chat.completions.create.call_args.kwargs["stream_options"] == {
+        "include_usage": True
+    }
+    assert (provider.prompt_tokens, provider.cached_prompt_tokens) == (2000, 1536)
+    cached = REGISTRY.get_sample_value("rag_llm_cached_prompt_tokens_total", labels)
+    assert cached - cached_before == 1536
+
+
+@pytest.mark.asyncio
+async def test_local_provider_requests_prompt_cache_and_reads_timings():
+    provider = LocalProvider(base_url="http://llm", model="local", timeout=1.0)
+    provider.client = Mock()
+    provider.client.chat.completions.create = AsyncMock(
+        return_value=async_iter(
+            [make_chunk("Hi"), make_chunk(timings={"cache_n": 300, "prompt_n": 12})]
+        )
+    )
+
+    answer = [c async for c in provider.generate_response("Q", ["doc"], [])]
+
+    assert answer == ["Hi"]
+    call_kwargs = provider.client.chat.completions.create.call_args.kwargs
+    assert call_kwargs["extra_body"] == {"cache_prompt": True}
+    assert provider.cached_prompt_tokens == 300
+    assert provider.prompt_tokens == 312
+
+
+@pytest.mark.asyncio
+async def test_gemini_provider_caches_context_on_follow_up():
+    """Test that an explicit context cache is created once the same prefix repeats."""
+    provider = GeminiProvider(api_key="key", model="gemini", timeout=1.0, cache_ttl_seconds=300)
+    provider.client = Mock()
+    provider.client.caches.create = AsyncMock(return_value=Mock(name="cache"))
+    provider.client.caches.create.return_value.name = "cachedContents/123"
+    usage = Mock(prompt_token_count=1200, cached_content_token_count=1100)
+    provider.client.models.generate_content_stream = AsyncMock(
+        side_effect=lambda **kwargs: async_iter([Mock(text="Answer", usage_metadata=usage)])
+    )
+    long_doc = "word " * 1000
+
+    for query in ("First question", "Follow-up", "Another follow-up"):
+        [c async for c in provider.generate_response(query, [long_doc], [])]
+
+    provider.client.caches.create.assert_awaited_once()
+    configs = [
+        call.kwargs["config"]
+        for call in provider.client.models.generate_content_stream.call_args_list
+    ]
+    assert configs[0].cached_content is None
+    assert configs[0].system_instruction.endswith(long_doc)
+    assert [c.cached_content for c in configs[1:]] == ["cachedContents/123"] * 2
+    assert configs[1].system_instruction is None
+    assert provider.cached_prompt_tokens == 3300
+
+
+@pytest.mark.asyncio
+async def test_provider_holds_a_slot_while_streaming():
+    """Test that generations beyond the limit are rejected instead of sent to the server."""
+    limiter = ConcurrencyLimiter(max_in_flight=1, max_queue=0, queue_timeout=1.0)
+    provider = LocalProvider(base_url="http://llm", model="local", timeout=1.0, limiter=limiter)
+    provider.client = Mock()
+    provider.client.chat.completions.create = AsyncMock(
+        side_effect=lambda **kwargs: async_iter([make_chunk("Hi"), make_chunk("!")])
+    )
+
+    first = provider.generate_response("Q1", ["doc"], [])
+    assert await first.__anext__() == "Hi"
+    assert limiter.in_flight == 1
+
+    with pytest.raises(ProviderOverloadedError):
+        [c async for c in provider.generate_response("Q2", ["doc"], [])]
+
+    assert [c async for c in first] == ["!"]
+    assert limiter.in_flight == 0
+    provider.client.chat.completions.create.assert_awaited_once()
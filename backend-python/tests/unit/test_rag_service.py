@@ -1,8 +1,18 @@
-from unittest.mock import AsyncMock, MagicMock, Mock, PropertyMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock, PropertyMock
 
+import grpc
+import numpy as np
 import pytest
+from app.llm import ProviderOverloadedError
+from app.services.answer_cache import SemanticAnswerCache
+from app.services.context_packer import ContextPacker
+from app.services.ingestion_jobs import SUCCEEDED, IngestionJob
 from app.services.rag_service import RagService
+from app.services.session_store import InMemorySessionStore
+from app.services.single_flight import SingleFlight
 from pb import rag_service_pb2 as rs
+from prometheus_client import REGISTRY
 
 
 async def async_iter(items):
@@ -15,8 +25,18 @@ def mock_settings():
     """Common settings mock for all tests."""
     settings = Mock()
     settings.maximum_file_size = 1024 * 1024
+    settings.upload_memory_limit = 64 * 1024
+    settings.upload_flush_size = 16 * 1024
     settings.embedding_chunk_size = 500
     settings.embedding_chunk_overlap = 50
+    settings.ingestion_batch_size = 32
+    settings.ingestion_queue_size = 4
+    settings.ingestion_parse_concurrency = 2
+    settings.default_max_results = 3
+    settings.max_results_limit = 20
+    settings.session_history_token_budget = 1024
+    settings.session_max_turn_chars = 4000
+    settings.stream_flush_interval_ms = 0
     return settings
 
 
@@ -33,8 +53,14 @@ def mock_llm():
 def mock_embedding_service():
     """Common embedding service mock for all tests."""
     service = Mock()
+    service.embed_query = AsyncMock(return_value=np.array([1.0, 0.0]))
     service.search = AsyncMock(return_value=[])
     service.add_documents = AsyncMock(return_value=5)
+    service.embed_documents = AsyncMock(side_effect=lambda docs: [[0.0]] * len(docs))
+    service.upsert_documents = AsyncMock(side_effect=lambda docs, embs, metas, **kwargs: len(docs))
+    service.existing_point_ids = AsyncMock(return_value=set())
+    service.delete_stale_points = AsyncMock(return_value=0)
+    service.set_upload_time = AsyncMock()
     return service
 
 
@@ -68,17 +94,23 @@ async def test_chat_success_scenario(rag_service, mock_llm, mock_embedding_servi
     responses = [res async for res in rag_service.Chat(request=mock_request, context=mock_context)]
 
     # 3. ASSERT
-    # LLM parts (3 parts) + Source info (1 part) = Total 4 responses expected
-    assert len(responses) == 4
+    # Sources (1 part) + LLM parts (3 parts) + Timings (1 part) = Total 5 responses expected
+    assert len(responses) == 5
 
     # Is the combined answer correct?
     full_answer = "".join([r.answer for r in responses])
     assert "Hello from Python!" in full_answer
 
-    # Does the last message contain sources?
+    # Does the first message contain sources, ahead of the answer?
+    first_response = responses[0]
+    assert len(first_response.source_documents) == 1
+    assert first_response.source_documents[0].filename == "doc.pdf"
+    assert first_response.answer == ""
+
+    # Does the last message carry the stage timings?
     last_response = responses[-1]
-    assert len(last_response.source_documents) == 1
-    assert last_response.source_documents[0].filename == "doc.pdf"
+    assert last_response.HasField("timings")
+    assert last_response.timings.total_ms == last_response.processing_time_ms
 
 
 @pytest.mark.asyncio
@@ -100,27 +132,27 @@ async def test_upload_document_success(mock_settings, mock_embedding_service):
         yield rs.UploadRequest(chunk=content)
 
     # 2. ACT
-    # Mock the _parse_document_sync to return expected chunks
-    with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_to_thread:
-        # First call is for file write (we don't care about return)
-        # Subsequent calls are for parse_document_sync
-        mock_to_thread.side_effect = [
-            None,  # temp_file.write
-            (  # _parse_document_sync
-                ["chunk1", "chunk2", "chunk3", "chunk4", "chunk5"],
-                [{"filename": "test_notes.txt", "page": 1}] * 5,
-            ),
-            None,  # Path.unlink
-        ]
-
-        response = await service.UploadDocument(
-            request_iterator=mock_request_iterator(), context=Mock()
+    # Mock the page parser to return expected chunks
+    service.document_parser.iter_chunks_sync = Mock(
+        return_value=iter(
+            [
+                (
+                    ["chunk1", "chunk2", "chunk3", "chunk4", "chunk5"],
+                    [{"filename": "test_notes.txt", "page": 1}] * 5,
+                )
+            ]
         )
+    )
+
+    response = await service.UploadDocument(
+        request_iterator=mock_request_iterator(), context=Mock()
+    )
 
     # 3. ASSERT
     assert response.status == "success"
     assert response.chunks_count == 5
-    mock_embedding_service.add_documents.assert_called_once()
+    mock_embedding_service.embed_documents.assert_called_once()
+    mock_embedding_service.upsert_documents.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -201,7 +233,7 @@ async def test_chat_passes_context_docs_to_llm(rag_service, mock_llm, mock_embed
     )
     mock_request = rs.ChatRequest(query="test", session_id="123")
 
-    await rag_service.Chat(request=mock_request, context=Mock()).__anext__()
+    [res async for res in rag_service.Chat(request=mock_request, context=Mock())]
 
     mock_llm.generate_response.assert_called_once()
     call_args = mock_llm.generate_response.call_args
@@ -213,8 +245,485 @@ async def test_chat_passes_empty_history(rag_service, mock_llm):
     """Test that empty history is passed to LLM."""
     mock_request = rs.ChatRequest(query="test", session_id="123")
 
-    await rag_service.Chat(request=mock_request, context=Mock()).__anext__()
+    [res async for res in rag_service.Chat(request=mock_request, context=Mock())]
 
     mock_llm.generate_response.assert_called_once()
     call_args = mock_llm.generate_response.call_args
     assert call_args[1]["history"] == []
+
+
+@pytest.mark.asyncio
+async def test_chat_answer_cache_hit_skips_retrieval_and_llm(
+    mock_settings, mock_llm, mock_embedding_service
+):
+    """Test that a repeated question is answered from the semantic answer cache."""
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    service = RagService(mock_settings, mock_llm, mock_embedding_service, answer_cache=cache)
+    mock_embedding_service.embed_query = AsyncMock(return_value=np.array([1.0, 0.0]))
+    mock_embedding_service.search = AsyncMock(
+        return_value=[{"content": "Doc1", "metadata": {"filename": "doc.pdf"}, "score": 0.9}]
+    )
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    first = [res async for res in service.Chat(request=mock_request, context=Mock())]
+    second = [res async for res in service.Chat(request=mock_request, context=Mock())]
+
+    assert [r.answer for r in second] == [r.answer for r in first]
+    assert second[0].source_documents[0].filename == "doc.pdf"
+    mock_embedding_service.search.assert_called_once()
+    mock_llm.generate_response.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_chat_does_not_cache_answer_when_upload_finishes_meanwhile(
+    mock_settings, mock_llm, mock_embedding_service
+):
+    """Test that an answer whose context predates an upload's invalidation isn't cached."""
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    service = RagService(mock_settings, mock_llm, mock_embedding_service, answer_cache=cache)
+    mock_embedding_service.embed_query = AsyncMock(return_value=np.array([1.0, 0.0]))
+    results = [{"content": "Doc1", "metadata": {"filename": "doc.pdf"}, "score": 0.9}]
+
+    async def search_during_upload(*args, **kwargs):
+        cache.invalidate(kwargs["collection_name"])  # the upload commits after retrieval
+        return results
+
+    mock_embedding_service.search = AsyncMock(side_effect=search_during_upload)
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    [res async for res in service.Chat(request=mock_request, context=Mock())]
+
+    assert len(cache) == 0
+    mock_embedding_service.search = AsyncMock(return_value=results)
+    [res async for res in service.Chat(request=mock_request, context=Mock())]
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_invalidates_answer_cache(mock_settings, mock_embedding_service):
+    """Test that a successful upload drops cached answers of the collection."""
+    cache = Mock()
+    service = RagService(mock_settings, Mock(), mock_embedding_service, answer_cache=cache)
+
+    async def mock_request_iterator():
+        yield rs.UploadRequest(metadata=rs.UploadMetadata(filename="notes.txt"))
+        yield rs.UploadRequest(chunk=b"Some content")
+
+    service.document_parser.iter_chunks_sync = Mock(
+        return_value=iter([(["chunk1"], [{"filename": "notes.txt", "page": 1}])])
+    )
+    response = await service.UploadDocument(mock_request_iterator(), context=Mock())
+
+    assert response.status == "success"
+    cache.invalidate.assert_called_once_with(mock_settings.qdrant_collection)
+
+
+@pytest.mark.asyncio
+async def test_chat_routes_query_config(rag_service, mock_embedding_service):
+    """Test that collection_name and max_results are honored (and clamped)."""
+    config = rs.QueryConfig(collection_name="tenant_a", max_results=500)
+    mock_request = rs.ChatRequest(query="test", session_id="123", config=config)
+
+    [res async for res in rag_service.Chat(request=mock_request, context=Mock())]
+
+    call_kwargs = mock_embedding_service.search.call_args.kwargs
+    assert call_kwargs["collection_name"] == "tenant_a"
+    assert call_kwargs["limit"] == 20
+
+
+@pytest.mark.asyncio
+async def test_chat_rejects_invalid_collection_name(rag_service, mock_embedding_service):
+    """Test that an invalid collection name aborts the call before any retrieval."""
+    context = Mock()
+    context.abort = AsyncMock(side_effect=Exception("aborted"))
+    mock_request = rs.ChatRequest(
+        query="test", session_id="123", config=rs.QueryConfig(collection_name="../etc")
+    )
+
+    with pytest.raises(Exception, match="aborted"):
+        [res async for res in rag_service.Chat(request=mock_request, context=context)]
+
+    assert context.abort.call_args.args[0] == grpc.StatusCode.INVALID_ARGUMENT
+    mock_embedding_service.search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_chat_scoped_query_filters_search_and_skips_answer_cache(
+    mock_settings, mock_llm, mock_embedding_service
+):
+    """Test that a SearchFilter reaches the vector search and bypasses the answer cache."""
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    service = RagService(mock_settings, mock_llm, mock_embedding_service, answer_cache=cache)
+    search_filter = rs.SearchFilter(filenames=["handbook.pdf"], page_from=3)
+    mock_request = rs.ChatRequest(
+        query="test", session_id="123", config=rs.QueryConfig(filter=search_filter)
+    )
+
+    for _ in range(2):
+        [res async for res in service.Chat(request=mock_request, context=Mock())]
+
+    query_filter = mock_embedding_service.search.call_args.kwargs["query_filter"]
+    assert [c.key for c in query_filter.must] == ["filename", "page"]
+    assert query_filter.must[0].match.any == ["handbook.pdf"]
+    assert query_filter.must[1].range.gte == 3 and query_filter.must[1].range.lte is None
+    assert mock_embedding_service.search.call_count == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_chat_without_filter_searches_whole_collection(rag_service, mock_embedding_service):
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    [res async for res in rag_service.Chat(request=mock_request, context=Mock())]
+
+    assert mock_embedding_service.search.call_args.kwargs["query_filter"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "search_filter",
+    [
+        rs.SearchFilter(filenames=["../secret.pdf"]),
+        rs.SearchFilter(page_from=5, page_to=2),
+        rs.SearchFilter(uploaded_after=200, uploaded_before=100),
+        rs.SearchFilter(page_to=-1),
+    ],
+)
+async def test_chat_rejects_invalid_filter(rag_service, mock_embedding_service, search_filter):
+    context = Mock()
+    context.abort = AsyncMock(side_effect=Exception("aborted"))
+    mock_request = rs.ChatRequest(
+        query="test", session_id="123", config=rs.QueryConfig(filter=search_filter)
+    )
+
+    with pytest.raises(Exception, match="aborted"):
+        [res async for res in rag_service.Chat(request=mock_request, context=context)]
+
+    assert context.abort.call_args.args[0] == grpc.StatusCode.INVALID_ARGUMENT
+    mock_embedding_service.search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upload_routes_to_requested_collection(mock_settings, mock_embedding_service):
+    """Test that UploadMetadata.collection_name selects the target collection."""
+    cache = Mock()
+    service = RagService(mock_settings, Mock(), mock_embedding_service, answer_cache=cache)
+
+    async def mock_request_iterator():
+        yield rs.UploadRequest(
+            metadata=rs.UploadMetadata(filename="notes.txt", collection_name="tenant_a")
+        )
+        yield rs.UploadRequest(chunk=b"Some content")
+
+    service.document_parser.iter_chunks_sync = Mock(
+        return_value=iter([(["chunk1"], [{"filename": "notes.txt", "page": 1}])])
+    )
+    response = await service.UploadDocument(mock_request_iterator(), context=Mock())
+
+    assert response.status == "success"
+    upsert_kwargs = mock_embedding_service.upsert_documents.call_args.kwargs
+    assert upsert_kwargs["collection_name"] == "tenant_a"
+    cache.invalidate.assert_called_once_with("tenant_a")
+
+
+@pytest.mark.asyncio
+async def test_background_upload_returns_a_job_id(mock_settings, mock_embedding_service):
+    """Test that a background upload is handed to the job manager once received."""
+    submitted = []
+
+    async def submit(data, filename, collection_name):
+        submitted.append((bytes(data), filename, collection_name))  # released after the call
+        return IngestionJob("f" * 32, filename, collection_name, "/x")
+
+    jobs = Mock()
+    jobs.submit = AsyncMock(side_effect=submit)
+    service = RagService(mock_settings, Mock(), mock_embedding_service, ingestion_jobs=jobs)
+
+    async def mock_request_iterator():
+        yield rs.UploadRequest(
+            metadata=rs.UploadMetadata(
+                filename="notes.txt", collection_name="tenant_a", background=True
+            )
+        )
+        yield rs.UploadRequest(chunk=b"Some ")
+        yield rs.UploadRequest(chunk=b"content")
+
+    response = await service.UploadDocument(mock_request_iterator(), context=Mock())
+
+    assert (response.status, response.job_id) == ("queued", "f" * 32)
+    assert submitted == [(b"Some content", "notes.txt", "tenant_a")]
+    mock_embedding_service.upsert_documents.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upload_packs_files_into_shared_batches(mock_settings, mock_embedding_service):
+    """Test that valid files are ingested together and rejected ones are reported."""
+    mock_settings.ingestion_batch_size = 8
+    cache = Mock()
+    service = RagService(mock_settings, Mock(), mock_embedding_service, answer_cache=cache)
+    # Three paragraphs, one chunk each (chunk size 500)
+    paragraphs = "\n\n".join(f"Rule {i}: " + "enrollment closes in May. " * 12 for i in range(3))
+
+    def upload(filename, *chunks, collection_name=""):
+        metadata = rs.UploadMetadata(filename=filename, collection_name=collection_name)
+        return [rs.UploadRequest(metadata=metadata)] + [rs.UploadRequest(chunk=c) for c in chunks]
+
+    requests = (
+        upload("a.txt", paragraphs.encode(), collection_name="tenant_a")
+        + upload("bad name?.txt", b"content")
+        + upload("b.md", paragraphs[:200].encode(), paragraphs[200:].encode())
+        + upload("a.txt", b"again")
+        + upload("empty.txt")
+    )
+
+    response = await service.BulkUploadDocuments(async_iter(requests), context=Mock())
+
+    assert response.status == "partial"
+    assert response.files_count == 2
+    assert {e.filename: e.message for e in response.errors} == {
+        "bad name?.txt": "Invalid filename characters",
+        "a.txt": "Duplicate filename",
+        "empty.txt": "Received empty file.",
+    }
+    assert response.chunks_count == 6
+    assert response.pages_per_second > 0
+    # 6 chunks of two files share one embedding batch
+    assert [len(c.args[0]) for c in mock_embedding_service.embed_documents.call_args_list] == [6]
+    upsert_kwargs = mock_embedding_service.upsert_documents.call_args.kwargs
+    assert upsert_kwargs["collection_name"] == "tenant_a"
+    cache.invalidate.assert_called_once_with("tenant_a")
+
+
+@pytest.mark.asyncio
+async def test_watch_ingestion_job_streams_status(mock_settings, mock_embedding_service):
+    job = IngestionJob("f" * 32, "notes.txt", "docs", "/x", state=SUCCEEDED, message="Done")
+    job.result.chunks = job.result.upserted = 7
+    jobs = Mock()
+    jobs.watch = Mock(side_effect=lambda job_id: async_iter([job] if job_id == job.id else []))
+    service = RagService(mock_settings, Mock(), mock_embedding_service, ingestion_jobs=jobs)
+    context = Mock()
+    context.abort = AsyncMock(side_effect=Exception("aborted"))
+
+    statuses = [
+        s async for s in service.WatchIngestionJob(rs.IngestionJobRequest(job_id=job.id), context)
+    ]
+    with pytest.raises(Exception, match="aborted"):
+        request = rs.IngestionJobRequest(job_id="0" * 32)
+        [s async for s in service.WatchIngestionJob(request, context)]
+
+    assert [(s.state, s.chunks_count, s.points_upserted) for s in statuses] == [("succeeded", 7, 7)]
+    assert context.abort.call_args.args[0] == grpc.StatusCode.NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_chat_reranks_over_fetched_candidates(
+    mock_settings, mock_llm, mock_embedding_service
+):
+    """Test that the reranker receives the over-fetched candidates and picks the top-k."""
+    mock_settings.reranker_candidates = 20
+    candidates = [
+        {"content": f"Doc{i}", "metadata": {"filename": f"doc{i}.pdf"}, "score": 0.5}
+        for i in range(20)
+    ]
+    mock_embedding_service.search = AsyncMock(return_value=candidates)
+    reranker = Mock()
+    reranker.rerank = AsyncMock(return_value=candidates[-3:])
+    service = RagService(mock_settings, mock_llm, mock_embedding_service, reranker=reranker)
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    responses = [res async for res in service.Chat(request=mock_request, context=Mock())]
+
+    assert mock_embedding_service.search.call_args.kwargs["limit"] == 20
+    reranker.rerank.assert_awaited_once_with("test", candidates, top_k=3)
+    assert mock_llm.generate_response.call_args.kwargs["context_docs"] == [
+        "Doc17",
+        "Doc18",
+        "Doc19",
+    ]
+    assert [s.filename for s in responses[0].source_documents] == [
+        "doc17.pdf",
+        "doc18.pdf",
+        "doc19.pdf",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_chat_passes_session_history_to_llm(mock_settings, mock_llm, mock_embedding_service):
+    """Test that follow-up questions see earlier turns and bypass the answer cache."""
+    store = InMemorySessionStore(max_sessions=10, ttl_seconds=60, max_turns=20)
+    cache = SemanticAnswerCache(similarity_threshold=0.95, max_entries=10, ttl_seconds=60)
+    service = RagService(
+        mock_settings, mock_llm, mock_embedding_service, answer_cache=cache, session_store=store
+    )
+    mock_embedding_service.embed_query = AsyncMock(return_value=np.array([1.0, 0.0]))
+    mock_llm.generate_response = MagicMock(
+        side_effect=[async_iter(["First ", "answer"]), async_iter(["Second answer"])]
+    )
+    mock_request = rs.ChatRequest(query="test", session_id="abc")
+
+    [res async for res in service.Chat(request=mock_request, context=Mock())]
+    [res async for res in service.Chat(request=mock_request, context=Mock())]
+
+    assert mock_llm.generate_response.call_count == 2
+    assert mock_llm.generate_response.call_args.kwargs["history"] == [
+        {"role": "user", "content": "test"},
+        {"role": "assistant", "content": "First answer"},
+    ]
+    assert len(await store.get_history("abc")) == 4
+    assert await store.get_history("other") == []
+
+
+@pytest.mark.asyncio
+async def test_chat_packs_context_before_prompting(mock_settings, mock_llm, mock_embedding_service):
+    """Test that overlapping chunks are stitched and duplicates dropped before the LLM call."""
+    mock_embedding_service.search = AsyncMock(
+        return_value=[
+            {
+                "content": "Exams start on Monday at nine sharp.",
+                "metadata": {"filename": "a.pdf"},
+                "score": 0.9,
+            },
+            {
+                "content": "Monday at nine sharp. Bring your ID.",
+                "metadata": {"filename": "a.pdf"},
+                "score": 0.8,
+            },
+            {
+                "content": "Exams start on Monday at nine sharp.",
+                "metadata": {"filename": "b.pdf"},
+                "score": 0.7,
+            },
+        ]
+    )
+    packer = ContextPacker(token_budget=100, max_overlap_chars=50, duplicate_threshold=0.6)
+    service = RagService(mock_settings, mock_llm, mock_embedding_service, context_packer=packer)
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    responses = [res async for res in service.Chat(request=mock_request, context=Mock())]
+
+    assert mock_llm.generate_response.call_args.kwargs["context_docs"] == [
+        "Exams start on Monday at nine sharp. Bring your ID."
+    ]
+    assert [s.filename for s in responses[0].source_documents] == ["a.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_chat_rejects_when_llm_is_overloaded(rag_service, mock_llm):
+    """Test that an overloaded LLM backend fails the call fast with RESOURCE_EXHAUSTED."""
+
+    async def overloaded(**kwargs):
+        raise ProviderOverloadedError("LLM queue is full")
+        yield  # pragma: no cover
+
+    mock_llm.generate_response = MagicMock(side_effect=overloaded)
+    context = Mock()
+    context.abort = AsyncMock(side_effect=Exception("aborted"))
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    with pytest.raises(Exception, match="aborted"):
+        [res async for res in rag_service.Chat(request=mock_request, context=context)]
+
+    assert context.abort.call_args.args[0] == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+
+@pytest.mark.asyncio
+async def test_chat_coalesces_identical_concurrent_questions(
+    mock_settings, mock_llm, mock_embedding_service
+):
+    """Test that N identical questions in flight at once cost one retrieval and LLM call."""
+
+    async def slow_answer(**kwargs):
+        for chunk in ["Shared ", "answer"]:
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    mock_llm.generate_response = MagicMock(side_effect=slow_answer)
+    mock_embedding_service.search = AsyncMock(
+        return_value=[{"content": "Doc1", "metadata": {"filename": "doc.pdf"}, "score": 0.9}]
+    )
+    service = RagService(
+        mock_settings, mock_llm, mock_embedding_service, single_flight=SingleFlight()
+    )
+
+    async def ask(query):
+        request = rs.ChatRequest(query=query, session_id="123")
+        return [res async for res in service.Chat(request=request, context=Mock())]
+
+    results = await asyncio.gather(
+        ask("When is the exam?"), ask("when is  the EXAM?"), ask("When is the exam?")
+    )
+
+    mock_llm.generate_response.assert_called_once()
+    mock_embedding_service.search.assert_called_once()
+    for responses in results:
+        assert "".join(r.answer for r in responses) == "Shared answer"
+        assert responses[0].source_documents[0].filename == "doc.pdf"
+
+
+@pytest.mark.asyncio
+async def test_chat_coalesces_token_chunks_into_fewer_messages(
+    mock_settings, mock_llm, mock_embedding_service
+):
+    """Test that token-by-token output is batched, with the first token sent right away."""
+    mock_settings.stream_flush_interval_ms = 1000
+    mock_settings.stream_flush_max_chars = 10
+    mock_llm.generate_response = MagicMock(return_value=async_iter(list("Hello there, student!")))
+    service = RagService(mock_settings, mock_llm, mock_embedding_service)
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    responses = [res async for res in service.Chat(request=mock_request, context=Mock())]
+
+    assert [r.answer for r in responses[1:-1]] == ["H", "ello there", ", student!"]
+    assert responses[-1].processing_time_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_chat_reports_stage_timings(mock_settings, mock_llm, mock_embedding_service):
+    """Test that sources come before the first token and the final message times each stage."""
+    reranker = Mock()
+    reranker.rerank = AsyncMock(side_effect=lambda query, results, top_k: results[:top_k])
+    mock_settings.reranker_candidates = 10
+    mock_embedding_service.search = AsyncMock(
+        return_value=[{"content": "Doc1", "metadata": {"filename": "doc.pdf"}, "score": 0.9}]
+    )
+
+    async def slow_first_token(**kwargs):
+        await asyncio.sleep(0.02)
+        yield "Answer"
+
+    mock_llm.generate_response = MagicMock(side_effect=slow_first_token)
+    service = RagService(mock_settings, mock_llm, mock_embedding_service, reranker=reranker)
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    responses = [res async for res in service.Chat(request=mock_request, context=Mock())]
+
+    assert [s.filename for s in responses[0].source_documents] == ["doc.pdf"]
+    assert [r.answer for r in responses[1:]] == ["Answer", ""]
+    timings = responses[-1].timings
+    assert timings.embed_ms > 0
+    assert timings.search_ms > 0
+    assert timings.rerank_ms > 0
+    assert timings.llm_ttft_ms >= 20
+    assert timings.total_ms >= timings.llm_ttft_ms
+    assert responses[-1].processing_time_ms == timings.total_ms
+
+
+@pytest.mark.asyncio
+async def test_chat_records_llm_latency_metrics(rag_service, mock_llm):
+    """Test that time-to-first-token and decode rate are exported per provider."""
+    labels = {"provider": "dummy"}
+    ttft_before = REGISTRY.get_sample_value("rag_llm_ttft_seconds_count", labels) or 0.0
+    rate_before = REGISTRY.get_sample_value("rag_llm_tokens_per_second_count", labels) or 0.0
+
+    async def stream(**kwargs):
+        for chunk in ["Hello ", "there ", "student"]:
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    mock_llm.generate_response = MagicMock(side_effect=stream)
+    mock_request = rs.ChatRequest(query="test", session_id="123")
+
+    [res async for res in rag_service.Chat(request=mock_request, context=Mock())]
+
+    assert REGISTRY.get_sample_value("rag_llm_ttft_seconds_count", labels) == ttft_before + 1
+    assert REGISTRY.get_sample_value("rag_llm_tokens_per_second_count", labels) == rate_before + 1
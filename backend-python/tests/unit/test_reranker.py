@@ -0,0 +1,75 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.services.reranker import CrossEncoderReranker
+
+
+def make_results(*contents):
+    return [
+        {"content": c, "metadata": {"filename": "doc.pdf"}, "score": 1.0 - i / 10}
+        for i, c in enumerate(contents)
+    ]
+
+
+@pytest.fixture
+def make_reranker():
+    """Factory for rerankers whose cross-encoder scores documents with `score_fn`."""
+    rerankers = []
+
+    def factory(score_fn, budget_ms=1000.0):
+        with patch("app.services.reranker.TextCrossEncoder") as mock_model_cls:
+            mock_model_cls.return_value.rerank = MagicMock(
+                side_effect=lambda query, docs, **kwargs: [score_fn(query, d) for d in docs]
+            )
+            reranker = CrossEncoderReranker("test-model", budget_ms=budget_ms)
+        rerankers.append(reranker)
+        return reranker
+
+    yield factory
+    for reranker in rerankers:
+        reranker.close()
+
+
+@pytest.mark.asyncio
+async def test_rerank_orders_by_cross_encoder_score(make_reranker):
+    reranker = make_reranker(lambda query, doc: float(doc.count(query)))
+    results = make_results("no match", "exam exam", "exam")
+
+    reranked = await reranker.rerank("exam", results, top_k=2)
+
+    assert [hit["content"] for hit in reranked] == ["exam exam", "exam"]
+    assert [hit["rerank_score"] for hit in reranked] == [2.0, 1.0]
+    assert reranked[0]["score"] == results[1]["score"]  # vector score is preserved
+    assert reranker.reranked == 1
+
+
+@pytest.mark.asyncio
+async def test_rerank_falls_back_to_vector_order_over_budget(make_reranker):
+    """Test that a slow model doesn't hold the request past the budget."""
+
+    def slow_score(query, doc):
+        time.sleep(0.2)
+        return 1.0
+
+    reranker = make_reranker(slow_score, budget_ms=20)
+    results = make_results("a", "b", "c")
+
+    start = time.perf_counter()
+    reranked = await reranker.rerank("query", results, top_k=2)
+
+    assert time.perf_counter() - start < 0.15
+    assert reranked == results[:2]
+    assert reranker.fallbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_rerank_falls_back_on_model_errors(make_reranker):
+    def broken(query, doc):
+        raise RuntimeError("onnx failure")
+
+    reranker = make_reranker(broken)
+    results = make_results("a", "b")
+
+    assert await reranker.rerank("query", results, top_k=1) == results[:1]
+    assert reranker.fallbacks == 1
@@ -0,0 +1,154 @@
+import asyncio
+from typing import List
+
+import pytest
+from prometheus_client import REGISTRY
+from app.config import Settings
+from app.llm import ProviderOverloadedError, get_llm_provider
+from app.llm.base import LLMProvider
+from app.llm.provider import RouterProvider
+
+
+class FakeProvider(LLMProvider):
+    """Backend that answers after `delay` seconds, or fails with an error chunk/exception."""
+
+    def __init__(self, name, delay=0.0, error=None, exception=None, budget=3000):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.exception = exception
+        self.CONTEXT_TOKEN_BUDGET = budget
+        self.calls = 0
+        self.closed = 0
+
+    async def generate_response(self, query, context_docs, history):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+            if self.exception is not None:
+                raise self.exception
+            if self.error is not None:
+                yield f"Error generating response ({self.name}): {self.error}"
+                return
+            yield f"{self.name}: "
+            yield "answer"
+        finally:
+            self.closed += 1
+
+    @property
+    def provider_name(self) -> str:
+        return self.name
+
+
+async def collect(provider: LLMProvider) -> List[str]:
+    return [chunk async for chunk in provider.generate_response("Q", ["doc"], [])]
+
+
+@pytest.mark.asyncio
+async def test_router_prefers_fastest_backend():
+    slow, fast = FakeProvider("slow", delay=0.03), FakeProvider("fast", delay=0.0)
+    router = RouterProvider([slow, fast])
+
+    # Untried backends are measured first, then traffic follows the lower p50
+    await collect(router)
+    await collect(router)
+    assert await collect(router) == ["fast: ", "answer"]
+
+    assert slow.calls == 1
+    assert fast.calls == 2
+    assert router._stats(slow).percentile(0.5) >= 0.03
+
+
+@pytest.mark.asyncio
+async def test_router_tracks_ttft_p95_per_backend():
+    """Test that a rare slow first token shows in the backend's p95 (and histogram), not p50."""
+    tail = FakeProvider("tail")
+    router = RouterProvider([tail])
+    for i in range(20):
+        tail.delay = 0.06 if i == 0 else 0.0
+        await collect(router)
+
+    stats = router._stats(tail)
+    assert stats.percentile(0.5) < 0.03
+    assert stats.percentile(0.95) >= 0.06
+
+    labels = {"backend": "tail"}
+    assert REGISTRY.get_sample_value("rag_llm_router_ttft_seconds_count", labels) == 20
+    fast = REGISTRY.get_sample_value("rag_llm_router_ttft_seconds_bucket", {**labels, "le": "0.05"})
+    assert fast == 19
+
+
+@pytest.mark.asyncio
+async def test_router_fails_over_and_cools_down_failed_backend():
+    broken, healthy = FakeProvider("broken", error="503"), FakeProvider("healthy", delay=0.01)
+    router = RouterProvider([broken, healthy], failure_cooldown=60)
+
+    assert await collect(router) == ["healthy: ", "answer"]
+    assert await collect(router) == ["healthy: ", "answer"]
+
+    assert broken.calls == 1
+    stats = router._stats(broken)
+    assert (stats.requests, stats.failures, stats.healthy) == (1, 1, False)
+    assert REGISTRY.get_sample_value("rag_llm_router_failures_total", {"backend": "broken"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_router_hedges_slow_first_token_and_cancels_loser():
+    stuck, backup = FakeProvider("stuck", delay=5.0), FakeProvider("backup", delay=0.01)
+    router = RouterProvider([stuck, backup], hedge_after_ms=20)
+    router._stats(backup).ttft.append(1.0)  # rank "stuck" first
+
+    assert await collect(router) == ["backup: ", "answer"]
+
+    assert router.hedges == 1
+    assert router._stats(backup).hedge_wins == 1
+    assert REGISTRY.get_sample_value("rag_llm_router_hedge_wins_total", {"backend": "backup"}) == 1
+    assert stuck.closed == 1  # the losing stream was cancelled
+
+
+@pytest.mark.asyncio
+async def test_router_fails_over_overloaded_backend_without_cooldown():
+    busy = FakeProvider("busy", exception=ProviderOverloadedError("queue is full"))
+    spare = FakeProvider("spare", delay=0.01)
+    router = RouterProvider([busy, spare], failure_cooldown=60)
+
+    assert await collect(router) == ["spare: ", "answer"]
+
+    stats = router._stats(busy)
+    assert (stats.failures, stats.healthy) == (0, True)
+    assert REGISTRY.get_sample_value("rag_llm_router_failures_total", {"backend": "busy"}) is None
+
+
+@pytest.mark.asyncio
+async def test_router_returns_error_or_overload_when_all_backends_fail():
+    router = RouterProvider([FakeProvider("a", error="boom"), FakeProvider("b", error="down")])
+    chunks = await collect(router)
+    assert len(chunks) == 1 and chunks[0].startswith("Error generating response (")
+
+    overloaded = RouterProvider(
+        [FakeProvider("a", exception=ProviderOverloadedError("queue is full"))]
+    )
+    with pytest.raises(ProviderOverloadedError):
+        await collect(overloaded)
+
+
+def test_factory_builds_router_from_settings():
+    settings = Settings(
+        llm_provider="router",
+        llm_router_backends="local, dummy, local:qwen2.5",
+        model_name="llama3",
+    )
+
+    router = get_llm_provider(settings)
+
+    assert isinstance(router, RouterProvider)
+    assert router.provider_name == "router(local:llama3,dummy,local:qwen2.5)"
+    assert router.CONTEXT_TOKEN_BUDGET == 1500
+
+
+def test_router_settings_are_validated():
+    with pytest.raises(ValueError, match="LLM_ROUTER_BACKENDS"):
+        Settings(llm_provider="router", llm_router_backends="")
+    with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+        Settings(llm_provider="router", llm_router_backends="local,openai", openai_api_key=None)
@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+import pytest
+from app.services.session_store import (
+    ChatTurn,
+    InMemorySessionStore,
+    SQLiteSessionStore,
+    trim_history,
+)
+
+
+def exchange(question, answer):
+    return [ChatTurn.create("user", question, 100), ChatTurn.create("assistant", answer, 100)]
+
+
+def test_chat_turn_is_compacted():
+    turn = ChatTurn.create("assistant", "x" * 50, max_chars=20)
+
+    assert turn.content == "x" * 20
+    assert turn.tokens == 5
+
+
+def test_trim_history_keeps_newest_turns_within_budget():
+    turns = exchange("a" * 40, "b" * 40) + exchange("c" * 40, "d" * 40)
+
+    # 10 tokens per turn: the budget fits the last three, the leading answer is dropped
+    assert trim_history(turns, token_budget=35) == [
+        {"role": "user", "content": "c" * 40},
+        {"role": "assistant", "content": "d" * 40},
+    ]
+    assert trim_history(turns, token_budget=5) == []
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def test_trim_history_counts_with_the_given_tokenizer():
+    turns = exchange("a b c d e", "f") + exchange("internationalization", "ok")
+
+    # ~4 chars/token makes the long word 5 tokens, the tokenizer counts it as one
+    assert trim_history(turns, token_budget=4) == []
+    assert trim_history(turns, token_budget=4, count_tokens=count_words) == [
+        {"role": "user", "content": "internationalization"},
+        {"role": "assistant", "content": "ok"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_evicts_least_recently_used_session():
+    store = InMemorySessionStore(max_sessions=2, ttl_seconds=60, max_turns=10)
+    await store.append("a", exchange("q1", "r1"))
+    await store.append("b", exchange("q2", "r2"))
+    await store.get_history("a")  # refresh "a"
+    await store.append("c", exchange("q3", "r3"))
+
+    assert len(store) == 2
+    assert await store.get_history("b") == []
+    assert [t.content for t in await store.get_history("a")] == ["q1", "r1"]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_expires_sessions_and_caps_turns():
+    store = InMemorySessionStore(max_sessions=10, ttl_seconds=60, max_turns=3)
+    await store.append("a", exchange("q1", "r1") + exchange("q2", "r2"))
+
+    assert [t.content for t in await store.get_history("a")] == ["r1", "q2", "r2"]
+
+    with patch("app.services.session_store.time.monotonic", return_value=1e12):
+        assert await store.get_history("a") == []
+    assert len(store) == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_persists_across_instances(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = SQLiteSessionStore(path, ttl_seconds=60, max_turns=3)
+    await store.append("a", exchange("q1", "r1"))
+    await store.append("a", exchange("q2", "r2"))
+    await store.close()
+
+    reopened = SQLiteSessionStore(path, ttl_seconds=60, max_turns=3)
+    assert [t.content for t in await reopened.get_history("a")] == ["r1", "q2", "r2"]
+    assert await reopened.get_history("b") == []
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_purges_expired_sessions(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=60, max_turns=10)
+    await store.append("a", exchange("q1", "r1"))
+
+    with patch("app.services.session_store.time.time", return_value=1e12):
+        assert await store.get_history("a") == []
+        assert await store.purge_expired() == 2
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_purges_expired_sessions_while_appending(tmp_path):
+    store = SQLiteSessionStore(
+        str(tmp_path / "sessions.db"), ttl_seconds=60, max_turns=10, purge_every=2
+    )
+    await store.append("old", exchange("q1", "r1"))
+
+    with patch("app.services.session_store.time.time", return_value=1e12):
+        await store.append("new", exchange("q2", "r2"))  # second append: purge runs
+        assert await store.purge_expired() == 0
+        assert [t.content for t in await store.get_history("new")] == ["q2", "r2"]
+    await store.close()
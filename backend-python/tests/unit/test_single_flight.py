@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from app.services.single_flight import SingleFlight
+
+
+def make_source(items, gate=None, started=None):
+    """Source that publishes `items`, waiting for `gate` after the first one."""
+
+    async def source():
+        if started is not None:
+            started.append(True)
+        for i, item in enumerate(items):
+            if i == 1 and gate is not None:
+                await gate.wait()
+            yield item
+
+    return source
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_subscribers_share_one_source():
+    flights = SingleFlight()
+    gate = asyncio.Event()
+    started = []
+    source = make_source(["a", "b", "c"], gate, started)
+
+    first = asyncio.create_task(collect(flights.stream("key", source)))
+    await asyncio.sleep(0.01)  # "a" has been published, the source waits on the gate
+    late = asyncio.create_task(collect(flights.stream("key", source)))
+    await asyncio.sleep(0.01)
+    gate.set()
+
+    assert await first == ["a", "b", "c"]
+    assert await late == ["a", "b", "c"]  # the late joiner got the replay
+    assert len(started) == 1
+    assert (flights.started, flights.coalesced, len(flights)) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_finished_flight_is_not_reused():
+    flights = SingleFlight()
+    started = []
+    source = make_source(["a"], started=started)
+
+    await collect(flights.stream("key", source))
+    await collect(flights.stream("key", source))
+
+    assert len(started) == 2
+
+
+@pytest.mark.asyncio
+async def test_source_errors_reach_every_subscriber():
+    flights = SingleFlight()
+
+    async def failing():
+        yield "partial"
+        raise RuntimeError("qdrant down")
+
+    results = await asyncio.gather(
+        collect(flights.stream("key", failing)),
+        collect(flights.stream("key", failing)),
+        return_exceptions=True,
+    )
+
+    assert [str(r) for r in results] == ["qdrant down", "qdrant down"]
+
+
+@pytest.mark.asyncio
+async def test_source_is_cancelled_when_all_subscribers_leave():
+    flights = SingleFlight()
+    closed = asyncio.Event()
+
+    async def endless():
+        try:
+            while True:
+                yield "token"
+                await asyncio.sleep(0.001)
+        finally:
+            closed.set()
+
+    stream = flights.stream("key", endless)
+    assert await stream.__anext__() == "token"
+    await stream.aclose()
+
+    await asyncio.wait_for(closed.wait(), timeout=1.0)
+    assert len(flights) == 0
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+from app.services.stream_coalescer import StreamCoalescer
+
+
+async def token_stream(tokens, delay=0.0):
+    for token in tokens:
+        if delay:
+            await asyncio.sleep(delay)
+        yield token
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+@pytest.mark.asyncio
+async def test_first_chunk_is_sent_immediately_then_buffered():
+    coalescer = StreamCoalescer(max_chars=1000, flush_interval_ms=1000)
+    sent_before = REGISTRY.get_sample_value("rag_stream_messages_total")
+
+    messages = await collect(coalescer.coalesce(token_stream(["Hello", " ", "world", "!"])))
+
+    assert messages == ["Hello", " world!"]  # the rest is flushed at end-of-stream
+    assert (coalescer.chunks_in, coalescer.messages_out) == (4, 2)
+    assert REGISTRY.get_sample_value("rag_stream_messages_total") - sent_before == 2
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_size_threshold():
+    coalescer = StreamCoalescer(max_chars=4, flush_interval_ms=1000)
+
+    messages = await collect(coalescer.coalesce(token_stream(["a", "bb", "cc", "d", "eeee", "f"])))
+
+    assert messages == ["a", "bbcc", "deeee", "f"]
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_interval_while_source_stalls():
+    coalescer = StreamCoalescer(max_chars=1000, flush_interval_ms=20)
+    gate = asyncio.Event()
+
+    async def stalled():
+        yield "first"
+        yield "buffered"
+        await gate.wait()
+        yield "late"
+
+    stream = coalescer.coalesce(stalled())
+    assert await stream.__anext__() == "first"
+    # "buffered" must come out on the timer even though the source is blocked
+    assert await asyncio.wait_for(stream.__anext__(), timeout=1.0) == "buffered"
+    gate.set()
+    assert await collect(stream) == ["late"]
+
+
+@pytest.mark.asyncio
+async def test_non_text_items_flush_and_pass_through():
+    coalescer = StreamCoalescer(max_chars=1000, flush_interval_ms=1000)
+    sources = [{"content": "Doc1"}]
+
+    messages = await collect(coalescer.coalesce(token_stream(["a", "b", "c", sources])))
+
+    assert messages == ["a", "bc", sources]
+
+
+@pytest.mark.asyncio
+async def test_buffered_text_is_flushed_before_source_errors():
+    coalescer = StreamCoalescer(max_chars=1000, flush_interval_ms=1000)
+
+    async def failing():
+        yield "a"
+        yield "b"
+        raise RuntimeError("boom")
+
+    stream = coalescer.coalesce(failing())
+    assert await stream.__anext__() == "a"
+    assert await stream.__anext__() == "b"
+    with pytest.raises(RuntimeError, match="boom"):
+        await stream.__anext__()
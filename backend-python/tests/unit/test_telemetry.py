@@ -0,0 +1,98 @@
+import json
+import logging
+import socket
+from unittest.mock import Mock
+
+import grpc
+import httpx
+import pytest
+from app.telemetry import StructuredFormatter, TelemetryInterceptor, init_telemetry
+from pb import rag_service_pb2 as rs
+from pb import rag_service_pb2_grpc as rs_grpc
+from prometheus_client import REGISTRY
+
+
+def make_record(**extra) -> logging.LogRecord:
+    record = logging.LogRecord("app.test", logging.WARNING, __file__, 1, "Backend failed", (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    line = StructuredFormatter(json_output=True).format(make_record(backend="local", retries=2))
+
+    entry = json.loads(line)
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "app.test"
+    assert entry["message"] == "Backend failed"
+    assert entry["backend"] == "local"
+    assert entry["retries"] == 2
+
+
+def test_text_formatter_appends_key_value_pairs():
+    line = StructuredFormatter().format(make_record(backend="local"))
+
+    assert line.endswith("WARNING app.test: Backend failed backend=local")
+
+
+class SlowServicer(rs_grpc.RagServiceServicer):
+    def __init__(self):
+        self.in_flight_seen = None
+
+    async def Chat(self, request, context):
+        self.in_flight_seen = REGISTRY.get_sample_value("rag_rpcs_in_flight", {"method": "Chat"})
+        if request.query == "invalid":
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "bad question")
+        yield rs.ChatResponse(answer="Answer")
+
+
+def rpc_count(code: str) -> float:
+    labels = {"method": "Chat", "code": code}
+    return REGISTRY.get_sample_value("rag_rpc_seconds_count", labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_interceptor_tracks_in_flight_rpcs_and_status_codes():
+    servicer = SlowServicer()
+    server = grpc.aio.server(interceptors=[TelemetryInterceptor()])
+    rs_grpc.add_RagServiceServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    ok_before, invalid_before = rpc_count("OK"), rpc_count("INVALID_ARGUMENT")
+
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = rs_grpc.RagServiceStub(channel)
+            answers = [r.answer async for r in stub.Chat(rs.ChatRequest(query="ok"))]
+            with pytest.raises(grpc.aio.AioRpcError):
+                [r async for r in stub.Chat(rs.ChatRequest(query="invalid"))]
+    finally:
+        await server.stop(None)
+
+    assert answers == ["Answer"]
+    assert servicer.in_flight_seen == 1
+    assert REGISTRY.get_sample_value("rag_rpcs_in_flight", {"method": "Chat"}) == 0
+    assert rpc_count("OK") == ok_before + 1
+    assert rpc_count("INVALID_ARGUMENT") == invalid_before + 1
+
+
+@pytest.mark.asyncio
+async def test_init_telemetry_serves_metrics():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    settings = Mock()
+    settings.metrics_host = "127.0.0.1"
+    settings.metrics_port = port
+    settings.otel_exporter_otlp_endpoint = None
+
+    resource = init_telemetry(settings)
+    await anext(resource)
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"http://127.0.0.1:{port}/metrics")
+    finally:
+        await resource.aclose()
+
+    assert response.status_code == 200
+    assert "rag_rpcs_in_flight" in response.text
@@ -0,0 +1,37 @@
+import asyncio
+import os
+
+import pytest
+from app.services.upload_buffer import UploadBuffer
+
+
+@pytest.mark.asyncio
+async def test_small_uploads_stay_in_memory():
+    buffer = UploadBuffer(memory_limit=1024, flush_size=256)
+    for _ in range(4):
+        await buffer.write(b"x" * 100)
+
+    data = await buffer.getbuffer()
+
+    assert buffer.path is None
+    assert bytes(data) == b"x" * 400
+    buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_large_uploads_spill_to_a_mapped_file(mocker):
+    buffer = UploadBuffer(memory_limit=1024, flush_size=4096)
+    to_thread = mocker.spy(asyncio, "to_thread")
+    chunks = [bytes([i]) * 100 for i in range(100)]
+    for chunk in chunks:
+        await buffer.write(chunk)
+
+    path = buffer.path
+    data = await buffer.getbuffer()
+
+    assert path is not None and os.path.exists(path)
+    assert bytes(data) == b"".join(chunks)
+    # 100 chunks: one spill file, three 4 KiB blocks, the tail and a flush, not a write each
+    assert to_thread.call_count < 10
+    buffer.close()
+    assert not os.path.exists(path)